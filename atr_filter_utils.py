@@ -5,6 +5,8 @@ Utilities to compute ATR ratio and apply volatility-based trading regime filters
 
 import pandas as pd
 
+from indicators import primitives
+
 
 def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """
@@ -17,11 +19,7 @@ def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
     - pd.Series of ATR values
     """
-    high_low = df['High'] - df['Low']
-    high_close = (df['High'] - df['Close'].shift(1)).abs()
-    low_close = (df['Low'] - df['Close'].shift(1)).abs()
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return true_range.rolling(window=period).mean()
+    return primitives.atr(df['High'], df['Low'], df['Close'], period)
 
 
 def apply_atr_regime(df: pd.DataFrame,
@@ -7,24 +7,34 @@ from datetime import datetime, timedelta
 
 DATA_DIR = "data"
 
-def append_symbol(symbol):
-    path = os.path.join(DATA_DIR, f"{symbol}_daily.csv")
+def _read_last_date(path, chunk_size=4096):
+    """
+    Return the date of the last row in a daily CSV without reading the whole file.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - chunk_size))
+        tail = f.read().decode("utf-8", errors="ignore")
+
+    for line in reversed(tail.splitlines()):
+        first_field = line.split(",", 1)[0].strip()
+        last = pd.to_datetime(first_field, errors='coerce')
+        if not pd.isna(last):
+            return last.date()
+    return None
+
 
 def append_symbol(symbol):
     path = os.path.join(DATA_DIR, f"{symbol}_daily.csv")
 
-    # 1) Load & parse the CSV’s first column as the date
-    raw = pd.read_csv(path)
-    date_col = raw.columns[0]
-    raw[date_col] = pd.to_datetime(raw[date_col], errors='coerce')
-    raw = raw.dropna(subset=[date_col])
-    df = raw.set_index(date_col).sort_index()
-    if df.empty:
+    # 1) Watermark: date of the last stored row (tail read, no full parse)
+    last_date = _read_last_date(path)
+    if last_date is None:
         print(f"⚠️ No valid timestamped rows in {symbol}_daily.csv")
         return
 
     # 2) Determine start/end
-    last_date = df.index.max().date()
     start     = last_date + timedelta(days=1)
     end       = datetime.utcnow().date()
     if start > end:
@@ -43,10 +53,18 @@ def append_symbol(symbol):
         print(f"⚠️ No new data for {symbol}")
         return
 
-    # 3) Append, dedupe, save
-    combined = pd.concat([df, new_df])
-    combined = combined[~combined.index.duplicated(keep='first')]
-    combined.to_csv(path)
+    # 3) Keep only rows past the watermark, align to the file's columns, append in place
+    if isinstance(new_df.columns, pd.MultiIndex):
+        new_df.columns = new_df.columns.get_level_values(0)
+    new_df = new_df[new_df.index.date > last_date]
+    new_df = new_df[~new_df.index.duplicated(keep='first')]
+    if new_df.empty:
+        print(f"{symbol}: already up to date ({last_date})")
+        return
+
+    header = pd.read_csv(path, nrows=0).columns[1:]
+    new_df = new_df.reindex(columns=header)
+    new_df.to_csv(path, mode="a", header=False)
     print(f"✓ Appended {len(new_df)} rows to {path}")
 
 
@@ -3,96 +3,78 @@
 import pandas as pd
 import numpy as np
 import json
-import yfinance as yf
 import argparse
+from datetime import datetime, timedelta
 
 from indicators.strategy_base import StrategyFactory
+from indicators.bar_arrays import BarArrays
 import indicators.registry  # ensures all strategies are registered
+from core.data_loader import get_price_data
+from backtest.kernels import (
+    simulate_long_only, EXIT_REASONS,
+    TRADE_ENTRY_IDX, TRADE_EXIT_IDX, TRADE_ENTRY_PRICE, TRADE_EXIT_PRICE, TRADE_REASON,
+)
 
 PARAMS_FILE = "ensemble_tuned_params.json"
 
 
 class BacktestEngine:
-    def __init__(self, df, strategy_classes, strategy_params, strategy_weights, meta_params, debug=False):
-        self.df = df.copy()
+    def __init__(self, df, strategy_classes, strategy_params, strategy_weights, meta_params, debug=False,
+                 signal_cache=None):
+        self.df = df
         self.strategy_classes = strategy_classes
         self.strategy_params = strategy_params
         self.strategy_weights = strategy_weights
         self.sl_multiplier = meta_params.get("sl_multiplier", 2.0)
         self.tp_multiplier = meta_params.get("tp_multiplier", 3.0)
         self.debug = debug
+        # Optional SignalCache shared across runs (e.g. every trial of a study)
+        self.signal_cache = signal_cache
 
     def run(self):
-        df = self.df.copy()
-        blended_signal = np.zeros(len(df))
+        # One read-only view of the prices, shared by every strategy and the kernel
+        bars = BarArrays.from_frame(self.df)
+        blended_signal = np.zeros(len(bars))
 
         for cls, params in zip(self.strategy_classes, self.strategy_params):
-            strategy = cls(df.copy(), **params)
-            signal = strategy.generate_signals()
+            strategy = cls(bars, **params)
+            if self.signal_cache is not None:
+                signal = self.signal_cache.get(bars, strategy.name, params, strategy.signal_array)
+            else:
+                signal = strategy.signal_array()
             if signal is None:
-                raise ValueError(f"❌ Strategy '{strategy.name}' returned None from generate_signals().")
+                raise ValueError(f"❌ Strategy '{strategy.name}' returned None from signal_array().")
             weight_key = f"{strategy.name}_weight"
             weight = self.strategy_weights.get(weight_key, 1.0)
             blended_signal += signal * weight
 
-        df["signal"] = np.sign(blended_signal)
-        df["equity"] = np.nan
-
-        equity = 1.0
-        position = 0
-        entry_price = 0
-
-        for i in range(1, len(df)):
-            row = df.iloc[i]
-            prev = df.iloc[i - 1]
-            signal = prev["signal"]
-            price = row["close"]
-            high = row["high"]
-            low = row["low"]
-
-            if position == 0 and signal == 1:
-                position = equity / price
-                entry_price = price
-                if self.debug:
-                    sl = entry_price * (1 - self.sl_multiplier / 100)
-                    tp = entry_price * (1 + self.tp_multiplier / 100)
-                    print(f"[{row.name.date()}] BUY  @ {entry_price:.2f} | TP: {tp:.2f} | SL: {sl:.2f}")
-
-            elif position > 0:
-                sl_price = entry_price * (1 - self.sl_multiplier / 100)
-                tp_price = entry_price * (1 + self.tp_multiplier / 100)
-
-                if low <= sl_price:
-                    equity = position * sl_price
-                    position = 0
-                    if self.debug:
-                        print(f"[{row.name.date()}] EXIT via SL @ {sl_price:.2f}")
-                elif high >= tp_price:
-                    equity = position * tp_price
-                    position = 0
-                    if self.debug:
-                        print(f"[{row.name.date()}] EXIT via TP @ {tp_price:.2f}")
-                elif signal == -1:
-                    equity = position * price
-                    position = 0
-                    if self.debug:
-                        print(f"[{row.name.date()}] EXIT via Signal @ {price:.2f}")
+        equity_curve, trades, equity = simulate_long_only(
+            bars.close, bars.high, bars.low, np.sign(blended_signal),
+            float(self.sl_multiplier), float(self.tp_multiplier)
+        )
+
+        trade_list = [
+            {
+                "entry_date": bars.index[int(t[TRADE_ENTRY_IDX])],
+                "exit_date": bars.index[int(t[TRADE_EXIT_IDX])],
+                "entry_price": t[TRADE_ENTRY_PRICE],
+                "exit_price": t[TRADE_EXIT_PRICE],
+                "exit_reason": EXIT_REASONS[int(t[TRADE_REASON])],
+            }
+            for t in trades
+        ]
+
+        if self.debug:
+            for trade in trade_list:
+                sl = trade["entry_price"] * (1 - self.sl_multiplier / 100)
+                tp = trade["entry_price"] * (1 + self.tp_multiplier / 100)
+                print(f"[{trade['entry_date'].date()}] BUY  @ {trade['entry_price']:.2f} | TP: {tp:.2f} | SL: {sl:.2f}")
+                if trade["exit_reason"] == "End":
+                    print(f"[{trade['exit_date'].date()}] CLOSE REMAINING @ {trade['exit_price']:.2f}")
                 else:
-                    df.at[df.index[i], "equity"] = equity
-                    if self.debug:
-                        print(f"[{row.name.date()}] HOLD | Price: {price:.2f}")
-                    continue
+                    print(f"[{trade['exit_date'].date()}] EXIT via {trade['exit_reason']} @ {trade['exit_price']:.2f}")
 
-            df.at[df.index[i], "equity"] = equity
-
-        if position > 0:
-            equity = position * df.iloc[-1]["close"]
-            df.at[df.index[-1], "equity"] = equity
-            if self.debug:
-                print(f"[{df.index[-1].date()}] CLOSE REMAINING @ {df.iloc[-1]['close']:.2f}")
-
-        df["equity"] = df["equity"].ffill()
-        equity_curve = df["equity"]
+        equity_curve = pd.Series(equity_curve, index=bars.index, name="equity").ffill()
 
         returns = equity_curve.pct_change().dropna()
         sharpe = np.mean(returns) / np.std(returns) * np.sqrt(252) if np.std(returns) > 0 else 0
@@ -105,6 +87,14 @@ class BacktestEngine:
         print(f"  Sharpe Ratio    : {sharpe:.2f}")
         print(f"  Max Drawdown    : {abs(max_drawdown):.2%}")
 
+        return {
+            "final_value": equity,
+            "sharpe_ratio": sharpe,
+            "max_drawdown": max_drawdown,
+            "equity_curve": equity_curve,
+            "trades": trade_list,
+        }
+
 
 def load_params(symbol):
     with open(PARAMS_FILE, "r") as f:
@@ -117,11 +107,8 @@ if __name__ == "__main__":
     parser.add_argument("--debug", action="store_true")
     args = parser.parse_args()
 
-    df = yf.download(args.symbol.upper(), period="1y", interval="1d")
-    df.rename(columns={
-        "Open": "open", "High": "high", "Low": "low",
-        "Close": "close", "Volume": "volume"
-    }, inplace=True)
+    start_date = (datetime.utcnow() - timedelta(days=365)).strftime("%Y-%m-%d")
+    df = get_price_data(args.symbol.upper(), start_date=start_date)
     df.dropna(inplace=True)
 
     params = load_params(args.symbol.upper())
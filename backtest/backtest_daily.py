@@ -1,11 +1,12 @@
 import os
 import json
 import logging
-import yfinance as yf
 import pandas as pd
 import numpy as np
+from datetime import datetime, timedelta
 from indicators.strategy_base import StrategyFactory
 import indicators.registry  # Ensures strategies are registered
+from core.data_loader import get_price_data
 
 # === Logging Setup ===
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -47,9 +48,9 @@ def load_ensemble_params(symbol):
 
 
 def run_backtest(symbol, initial_cash=17500):
-    logger.info(f"📥 Downloading data for {symbol}...")
-    df = yf.download(symbol, period="1y", interval="1d")
-    df = df.rename(columns=str.lower)
+    logger.info(f"📥 Loading data for {symbol}...")
+    start_date = (datetime.utcnow() - timedelta(days=365)).strftime("%Y-%m-%d")
+    df = get_price_data(symbol, start_date=start_date)
     df.dropna(inplace=True)
 
     strategies, params_list, strategy_weights, sl, tp = load_ensemble_params(symbol)
@@ -60,7 +61,8 @@ def run_backtest(symbol, initial_cash=17500):
     # Generate blended signals
     blended_signal = np.zeros(len(df))
     for cls, params in zip(strategies, params_list):
-        strategy = cls(df.copy(), **params)
+        # No copy: strategies only read df (tests/test_batched.py TestSharedFrame)
+        strategy = cls(df, **params)
         signal = strategy.generate_signals()
         name = cls.__name__.replace("Strategy", "").lower()
         weight_key = f"{name}_weight"
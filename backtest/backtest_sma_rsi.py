@@ -3,12 +3,12 @@ Backtest a single symbol using SMA+RSI strategy, with slippage, commission, and
 """
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from typing import Callable, Dict, Any
 import config
 from config import SYMBOLS, START_DATE, END_DATE, STARTING_CAPITAL
 from backtest_utils import simulate_fill
 from atr_filter_utils import apply_atr_regime
+from core.data_loader import get_price_data
 
 
 def backtest_symbol(
@@ -28,7 +28,8 @@ def backtest_symbol(
     """
 
     # === 1) Historical data
-    df = yf.download(symbol, start=START_DATE, end=END_DATE, auto_adjust=True)
+    df = get_price_data(symbol, start_date=START_DATE, end_date=END_DATE)
+    df = df.rename(columns=str.capitalize)
     df.dropna(inplace=True)
 
     # === 2) ATR regime
@@ -0,0 +1,127 @@
+# backtest/batch_backtest.py
+
+import numpy as np
+import pandas as pd
+
+from indicators.strategy_base import StrategyFactory
+from indicators.bar_arrays import BarArrays
+import indicators.registry  # ensures all strategies are registered
+from backtest.kernels import simulate_long_only_batch
+from backtest.signal_cache import freeze_params
+
+
+def _as_param_sets(param_sets):
+    """Accept a list of flat param dicts or a DataFrame with one row per set."""
+    if isinstance(param_sets, pd.DataFrame):
+        return param_sets.to_dict("records")
+    return list(param_sets)
+
+
+def price_arrays(df):
+    """Contiguous float64 close/high/low arrays shared by every parameter set."""
+    bars = BarArrays.from_frame(df)
+    return bars.close, bars.high, bars.low
+
+
+def blended_signals(df, param_sets, signal_cache=None):
+    """
+    Build the K x n matrix of np.sign(weighted strategy signals).
+
+    Each parameter set uses the flat Optuna naming: `{name}_{param}` for
+    strategy params, `{name}_weight` for weights. A strategy is included
+    when its weight key is present. The distinct param dicts of each strategy
+    are computed together by its signal_arrays(), so the batched indicator
+    kernels cover every period in the batch in one pass; they are looked up
+    in `signal_cache` (a SignalCache) across batches when one is given.
+    """
+    param_sets = _as_param_sets(param_sets)
+    bars = BarArrays.from_frame(df)
+    blended = np.zeros((len(param_sets), len(bars)))
+
+    for name, entry in StrategyFactory.get_all().items():
+        cls = entry["backtest_cls"]
+        param_space = entry.get("param_space", {})
+        weight_key = f"{name}_weight"
+
+        # Distinct strategy params in the batch, and which row each set uses
+        distinct = {}
+        rows = []
+        for k, param_set in enumerate(param_sets):
+            if weight_key not in param_set:
+                continue
+            params = {
+                param_name: param_set[f"{name}_{param_name}"]
+                for param_name in param_space
+                if f"{name}_{param_name}" in param_set
+            }
+            row = distinct.setdefault(freeze_params(params), len(distinct))
+            rows.append((k, row))
+        if not distinct:
+            continue
+
+        unique_params = [dict(frozen) for frozen in distinct]
+        if signal_cache is not None:
+            signals = signal_cache.get_many(bars, name, unique_params, lambda sets: cls.signal_arrays(bars, sets))
+        else:
+            signals = cls.signal_arrays(bars, unique_params)
+        for k, row in rows:
+            blended[k] += signals[row] * param_sets[k][weight_key]
+
+    return np.sign(blended)
+
+
+def batch_stats(equity_curves, periods_per_year=252):
+    """
+    Sharpe, max drawdown and final equity for each row of a K x n equity matrix,
+    computed the same way BacktestEngine.run does for a single curve.
+    """
+    eq = equity_curves[:, 1:]  # bar 0 carries no equity
+    k_sets = equity_curves.shape[0]
+    if eq.shape[1] < 2:
+        return {
+            "sharpe_ratio": np.zeros(k_sets),
+            "max_drawdown": np.zeros(k_sets),
+            "final_value": equity_curves[:, -1] if equity_curves.shape[1] else np.ones(k_sets),
+        }
+
+    returns = eq[:, 1:] / eq[:, :-1] - 1
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1)
+    sharpe = np.zeros(k_sets)
+    nonzero = std > 0
+    sharpe[nonzero] = mean[nonzero] / std[nonzero] * np.sqrt(periods_per_year)
+
+    peak = np.maximum.accumulate(eq, axis=1)
+    max_drawdown = ((eq - peak) / peak).min(axis=1)
+
+    return {
+        "sharpe_ratio": sharpe,
+        "max_drawdown": max_drawdown,
+        "final_value": eq[:, -1],
+    }
+
+
+def run_batch_backtest(df, param_sets, default_sl=2.0, default_tp=3.0, signal_cache=None):
+    """
+    Backtest K parameter sets in one pass over a shared price array.
+
+    Args:
+        df: OHLCV frame with lowercase columns
+        param_sets: list of K flat param dicts (or a K-row DataFrame) holding
+            strategy params, `{name}_weight`, `sl_multiplier` and `tp_multiplier`
+
+    Returns:
+        dict of K-length arrays: sharpe_ratio, max_drawdown, final_value
+    """
+    param_sets = _as_param_sets(param_sets)
+    if not param_sets:
+        empty = np.empty(0)
+        return {"sharpe_ratio": empty, "max_drawdown": empty, "final_value": empty}
+
+    close, high, low = price_arrays(df)
+    signals = blended_signals(df, param_sets, signal_cache)
+    sl = np.array([p.get("sl_multiplier", default_sl) for p in param_sets], dtype=np.float64)
+    tp = np.array([p.get("tp_multiplier", default_tp) for p in param_sets], dtype=np.float64)
+
+    equity_curves, _ = simulate_long_only_batch(close, high, low, signals, sl, tp)
+    return batch_stats(equity_curves)
@@ -2,6 +2,7 @@
 import os
 import pandas as pd
 import config
+from indicators import primitives
 
 DATA_DIR     = "data"
 FEATURES_DIR = "features"
@@ -41,11 +42,7 @@ def compute_features(symbol):
     df["rsi"] = 100 - (100 / (1 + rs))
 
     # 5) Compute ATR (14-day)
-    high_low = df["High"] - df["Low"]
-    high_cp  = (df["High"] - df["Close"].shift()).abs()
-    low_cp   = (df["Low"]  - df["Close"].shift()).abs()
-    tr = pd.concat([high_low, high_cp, low_cp], axis=1).max(axis=1)
-    df["atr"] = tr.rolling(14).mean()
+    df["atr"] = primitives.atr(df["High"], df["Low"], df["Close"], 14)
 
     print("Nulls after indicator calc:")
     print(df.isna().sum())
@@ -0,0 +1,119 @@
+# backtest/kernels.py
+
+import numpy as np
+
+from core.jit import njit
+
+# === Exit reason codes stored in the trade array ===
+EXIT_SL = 0
+EXIT_TP = 1
+EXIT_SIGNAL = 2
+EXIT_END = 3
+EXIT_REASONS = {EXIT_SL: "SL", EXIT_TP: "TP", EXIT_SIGNAL: "Signal", EXIT_END: "End"}
+
+# === Trade array columns ===
+TRADE_ENTRY_IDX = 0
+TRADE_EXIT_IDX = 1
+TRADE_ENTRY_PRICE = 2
+TRADE_EXIT_PRICE = 3
+TRADE_REASON = 4
+
+
+@njit(cache=True)
+def simulate_long_only(close, high, low, signal, sl_multiplier, tp_multiplier):
+    """
+    Long-only SL/TP/signal-exit state machine over contiguous float64 arrays.
+
+    The signal on bar i-1 drives the decision on bar i. Equity is only
+    updated on exits (it is not marked to market while holding), and any
+    open position is closed at the final close.
+
+    Returns:
+        equity_curve: float64[n], NaN on bar 0
+        trades: float64[n_trades, 5] (entry_idx, exit_idx, entry_price, exit_price, reason)
+        final_equity: float
+    """
+    n = close.shape[0]
+    equity_curve = np.full(n, np.nan)
+    trades = np.empty((n, 5))
+    n_trades = 0
+
+    equity = 1.0
+    position = 0.0
+    entry_price = 0.0
+    entry_idx = -1
+
+    for i in range(1, n):
+        sig = signal[i - 1]
+        price = close[i]
+
+        if position == 0 and sig == 1:
+            position = equity / price
+            entry_price = price
+            entry_idx = i
+
+        elif position > 0:
+            sl_price = entry_price * (1 - sl_multiplier / 100)
+            tp_price = entry_price * (1 + tp_multiplier / 100)
+
+            exit_price = 0.0
+            reason = -1
+            if low[i] <= sl_price:
+                exit_price = sl_price
+                reason = EXIT_SL
+            elif high[i] >= tp_price:
+                exit_price = tp_price
+                reason = EXIT_TP
+            elif sig == -1:
+                exit_price = price
+                reason = EXIT_SIGNAL
+
+            if reason >= 0:
+                equity = position * exit_price
+                position = 0.0
+                trades[n_trades, TRADE_ENTRY_IDX] = entry_idx
+                trades[n_trades, TRADE_EXIT_IDX] = i
+                trades[n_trades, TRADE_ENTRY_PRICE] = entry_price
+                trades[n_trades, TRADE_EXIT_PRICE] = exit_price
+                trades[n_trades, TRADE_REASON] = reason
+                n_trades += 1
+
+        equity_curve[i] = equity
+
+    if position > 0:
+        equity = position * close[n - 1]
+        equity_curve[n - 1] = equity
+        trades[n_trades, TRADE_ENTRY_IDX] = entry_idx
+        trades[n_trades, TRADE_EXIT_IDX] = n - 1
+        trades[n_trades, TRADE_ENTRY_PRICE] = entry_price
+        trades[n_trades, TRADE_EXIT_PRICE] = close[n - 1]
+        trades[n_trades, TRADE_REASON] = EXIT_END
+        n_trades += 1
+
+    return equity_curve, trades[:n_trades], equity
+
+
+@njit(cache=True)
+def simulate_long_only_batch(close, high, low, signals, sl_multipliers, tp_multipliers):
+    """
+    Run simulate_long_only for K parameter sets over one shared price array.
+
+    Args:
+        signals: float64[K, n] blended signals, one row per parameter set
+        sl_multipliers, tp_multipliers: float64[K]
+
+    Returns:
+        equity_curves: float64[K, n] (NaN on bar 0)
+        final_equity: float64[K]
+    """
+    k_sets = signals.shape[0]
+    n = close.shape[0]
+    equity_curves = np.empty((k_sets, n))
+    final_equity = np.empty(k_sets)
+    for k in range(k_sets):
+        curve, _, final = simulate_long_only(
+            close, high, low, signals[k], sl_multipliers[k], tp_multipliers[k]
+        )
+        equity_curves[k] = curve
+        final_equity[k] = final
+    return equity_curves, final_equity
@@ -1,13 +1,14 @@
 # backtest/optimize.py
 
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import optuna
 import json
 import argparse
+from datetime import datetime, timedelta
 from indicators.strategy_base import StrategyFactory
 import indicators.registry  # Ensure all strategies are registered
+from core.data_loader import get_price_data
+from core.optuna_storage import create_study, optimize
 
 PARAMS_FILE = "ensemble_tuned_params.json"
 
@@ -33,11 +34,11 @@ def get_meta_param_space(symbol):
             "tp_multiplier": (1.2, 2.5)
         }
 
-def run_optimize(symbol, strategy_name, trials):
+def run_optimize(symbol, strategy_name, trials, storage=None):
     print(f"\n🔍 Optimizing {strategy_name.upper()} strategy for {symbol} using {trials} trials...")
 
-    df = yf.download(symbol, period="1y", interval="1d", auto_adjust=True)
-    df.rename(columns=str.lower, inplace=True)
+    start_date = (datetime.utcnow() - timedelta(days=365)).strftime("%Y-%m-%d")
+    df = get_price_data(symbol, start_date=start_date)
     df = df.dropna().copy()
 
     strategy_config = StrategyFactory.get_config(strategy_name)
@@ -82,8 +83,9 @@ def run_optimize(symbol, strategy_name, trials):
 
         return equity
 
-    study = optuna.create_study(direction="maximize")
-    study.optimize(objective, n_trials=trials)
+    # Named "<strategy>-<SYMBOL>-<date>" and resumable when a storage is configured
+    study = create_study(strategy_name, symbol, storage=storage)
+    optimize(study, objective, trials)
 
     best = study.best_trial
     print("\n✅ Best Params Found:")
@@ -116,5 +118,7 @@ if __name__ == "__main__":
     parser.add_argument("--symbol", type=str, required=True)
     parser.add_argument("--strategy", type=str, required=True)
     parser.add_argument("--trials", type=int, default=25)
+    parser.add_argument("--storage", default=None,
+                        help="Optuna storage URL (sqlite:///path.db or journal:path.log); defaults to $OPTUNA_STORAGE")
     args = parser.parse_args()
-    run_optimize(args.symbol, args.strategy, args.trials)
+    run_optimize(args.symbol, args.strategy, args.trials, storage=args.storage)
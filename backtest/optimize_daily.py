@@ -5,7 +5,7 @@ import shutil
 from datetime import datetime
 import subprocess
 
-from backtest.optimize_ensemble import tune_symbol_ensemble
+from backtest.tune_orchestrator import tune_symbols
 
 # === Logging Setup ===
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -39,12 +39,8 @@ def main():
     logger.info("\U0001f680 Starting Daily Optimization for All Symbols")
 
     backup_params()
-    all_results = {}
-
-    for symbol in SYMBOLS:
-        logger.info(f"⏳ Tuning {symbol}...")
-        result = tune_symbol_ensemble(symbol, initial_cash=17500.0, trials=10)
-        all_results[symbol] = result
+    # Symbols are tuned in parallel; results are merged into PARAM_FILE in one write
+    all_results = tune_symbols(SYMBOLS, trials=10)
 
     # Save final summary
     summary = "\n".join([
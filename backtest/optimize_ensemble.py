@@ -1,36 +1,132 @@
-import yfinance as yf
-import pandas as pd
 import numpy as np
 import optuna
 import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
 
 from indicators.strategy_base import StrategyFactory
 import indicators.registry  # Ensures all strategies are registered
+from indicators.bar_arrays import BarArrays
+from core.data_loader import get_price_data
+from backtest.signal_matrix import signal_matrix, evaluate_weights
+from backtest.signal_cache import SignalCache, freeze_params
+from core.optuna_storage import OPTUNA_STORAGE, create_study, fail_stale_trials, optimize, remaining_trials
+from backtest.batch_backtest import run_batch_backtest
+from backtest.walk_forward import walk_forward_windows
+from backtest.warm_start import prior_param_sets, enqueue_prior_trials, narrow_search_space
 
 PARAMS_FILE = "ensemble_tuned_params.json"
+TUNING_LOOKBACK_DAYS = 365
 
-def run_optimize_ensemble(symbol, trials):
-    print(f"\n🎯 Running ENSEMBLE optimization for {symbol} with {trials} trials...")
+META_PARAM_SPACE = {
+    "sl_multiplier": {"type": "float", "low": 0.5, "high": 3.0},
+    "tp_multiplier": {"type": "float", "low": 0.5, "high": 5.0},
+}
+WEIGHT_SPACE = {"type": "float", "low": 0.0, "high": 1.0}
 
-    # === Download and clean data ===
-    df = yf.download(symbol, period="1y", interval="1d")
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+# === Walk-forward fold scoring (mode="walk_forward") ===
+# ~250 bars of tuning data give six 120/20 folds, so weak trials can be cut after one or two
+WF_TRAIN_BARS = 120
+WF_TEST_BARS = 20
+PRUNERS = {
+    "median": lambda: optuna.pruners.MedianPruner(n_startup_trials=5),
+    "halving": lambda: optuna.pruners.SuccessiveHalvingPruner(),
+    "none": lambda: optuna.pruners.NopPruner(),
+}
 
-    df.rename(columns={
-        "Open": "open",
-        "High": "high",
-        "Low": "low",
-        "Close": "close",
-        "Volume": "volume",
-        "Adj Close": "adj_close"
-    }, inplace=True)
-    df = df.dropna().copy()
 
-    # === Collect all registered strategies ===
-    all_strategies = StrategyFactory.get_all().items()
+def suggest_strategy_params(trial, name, param_space):
+    params = {}
+    for param_name, param_info in param_space.items():
+        full_param_name = f"{name}_{param_name}"
+        if param_info["type"] == "int":
+            params[param_name] = trial.suggest_int(full_param_name, param_info["low"], param_info["high"])
+        elif param_info["type"] == "float":
+            params[param_name] = trial.suggest_float(full_param_name, param_info["low"], param_info["high"], log=param_info.get("log", False))
+        elif param_info["type"] == "categorical":
+            params[param_name] = trial.suggest_categorical(full_param_name, param_info["choices"])
+    return params
 
+
+def suggest_meta_params(trial):
+    return {
+        name: trial.suggest_float(name, info["low"], info["high"])
+        for name, info in META_PARAM_SPACE.items()
+    }
+
+
+def flat_search_space(all_strategies):
+    """Every tuned param under its flat Optuna name -> its range."""
+    space = {}
+    for name, entry in all_strategies:
+        for param_name, param_info in entry.get("param_space", {}).items():
+            space[f"{name}_{param_name}"] = param_info
+        space[f"{name}_weight"] = WEIGHT_SPACE
+    space.update(META_PARAM_SPACE)
+    return space
+
+
+def with_search_space(all_strategies, space):
+    """Registry items with each strategy's param_space replaced by its ranges in a flat space."""
+    return [
+        (name, {**entry, "param_space": {
+            param_name: space[f"{name}_{param_name}"] for param_name in entry.get("param_space", {})
+        }})
+        for name, entry in all_strategies
+    ]
+
+
+def two_level_objective(df, all_strategies, weight_trials, signal_cache, priors=()):
+    """
+    Outer objective over strategy params only.
+
+    Each distinct strategy param set is turned into a (strategies x bars)
+    int8 signal matrix once; an inner study then searches weights and SL/TP
+    against that matrix, so a weight trial is just np.sign(W @ S) plus the
+    simulation kernel. The inner best is stored on the outer trial as the
+    "weight_params" user attr.
+
+    The outer study has no weight or SL/TP params, so the weights and SL/TP
+    of the warm-start `priors` are enqueued in every inner study instead.
+    """
+    bars = BarArrays.from_frame(df)
+    matrix_cache = {}
+
+    def objective(trial):
+        strategy_params = {
+            name: suggest_strategy_params(trial, name, entry.get("param_space", {}))
+            for name, entry in all_strategies
+        }
+        key = tuple((name, freeze_params(params)) for name, params in strategy_params.items())
+        if key not in matrix_cache:
+            matrix_cache[key] = signal_matrix(bars, strategy_params, signal_cache)
+        names, matrix = matrix_cache[key]
+
+        def weight_objective(weight_trial):
+            weights = [weight_trial.suggest_float(f"{name}_weight", 0.0, 1.0) for name in names]
+            meta_params = suggest_meta_params(weight_trial)
+            stats = evaluate_weights(
+                bars, matrix, weights, meta_params["sl_multiplier"], meta_params["tp_multiplier"]
+            )
+            return float(stats["sharpe_ratio"][0])
+
+        weight_study = optuna.create_study(direction="maximize")
+        weight_names = [f"{name}_weight" for name in names] + list(META_PARAM_SPACE)
+        for params in priors:
+            prior_weights = {key: params[key] for key in weight_names if key in params}
+            if prior_weights:
+                weight_study.enqueue_trial(prior_weights, skip_if_exists=True)
+        weight_study.optimize(weight_objective, n_trials=weight_trials)
+        trial.set_user_attr("weight_params", weight_study.best_params)
+        print(f"  Trial {trial.number}: best Sharpe {weight_study.best_value:.3f} over {weight_trials} weight trials")
+        return weight_study.best_value
+
+    return objective
+
+
+def joint_objective(df, all_strategies, signal_cache):
+    """Objective sampling strategy params, weights and SL/TP together; each trial runs a full backtest."""
     def objective(trial):
         strategy_classes = []
         strategy_params = []
@@ -44,15 +140,7 @@ def run_optimize_ensemble(symbol, trials):
             if cls is None or not callable(cls):
                 raise TypeError(f"Strategy '{name}' has an invalid backtest_cls: {cls}")
 
-            params = {}
-            for param_name, param_info in param_space.items():
-                full_param_name = f"{name}_{param_name}"
-                if param_info["type"] == "int":
-                    params[param_name] = trial.suggest_int(full_param_name, param_info["low"], param_info["high"])
-                elif param_info["type"] == "float":
-                    params[param_name] = trial.suggest_float(full_param_name, param_info["low"], param_info["high"], log=param_info.get("log", False))
-                elif param_info["type"] == "categorical":
-                    params[param_name] = trial.suggest_categorical(full_param_name, param_info["choices"])
+            params = suggest_strategy_params(trial, name, param_space)
 
             strategy_classes.append(cls)
             strategy_params.append(params)
@@ -61,32 +149,232 @@ def run_optimize_ensemble(symbol, trials):
             strategy_weights[weight_name] = trial.suggest_float(weight_name, 0.0, 1.0)
 
         # === SL/TP Meta Params ===
-        sl_multiplier = trial.suggest_float("sl_multiplier", 0.5, 3.0)
-        tp_multiplier = trial.suggest_float("tp_multiplier", 0.5, 5.0)
-        meta_params = {"sl_multiplier": sl_multiplier, "tp_multiplier": tp_multiplier}
+        meta_params = suggest_meta_params(trial)
 
         from backtest.backtest import BacktestEngine
-        engine = BacktestEngine(df, strategy_classes, strategy_params, strategy_weights, meta_params)
+        engine = BacktestEngine(df, strategy_classes, strategy_params, strategy_weights, meta_params,
+                                signal_cache=signal_cache)
         result = engine.run()
         return result["sharpe_ratio"]
 
-    study = optuna.create_study(direction="maximize")
-    study.optimize(objective, n_trials=trials)
+    return objective
+
+
+def walk_forward_objective(df, all_strategies, signal_cache,
+                           train_size_days=WF_TRAIN_BARS, test_size_days=WF_TEST_BARS):
+    """
+    Objective scored fold by fold on walk-forward windows.
+
+    Each fold computes signals on its train+test window and backtests the
+    test part; the running mean test Sharpe is reported after every fold
+    (trial.report(score, step=fold)) so the study's pruner can abandon a
+    trial before the remaining folds are computed. Returns the mean over all folds.
+    """
+    bars = BarArrays.from_frame(df)
+    windows = walk_forward_windows(len(bars), train_size_days, test_size_days)
+    if not windows:
+        raise ValueError(f"Need at least {train_size_days + test_size_days} bars for walk-forward folds, got {len(bars)}.")
+
+    def objective(trial):
+        strategy_params = {
+            name: suggest_strategy_params(trial, name, entry.get("param_space", {}))
+            for name, entry in all_strategies
+        }
+        weights = [trial.suggest_float(f"{name}_weight", 0.0, 1.0) for name in strategy_params]
+        meta_params = suggest_meta_params(trial)
+
+        scores = []
+        for fold, (start, split, end) in enumerate(windows):
+            window = bars.window(start, end)
+            _, matrix = signal_matrix(window, strategy_params, signal_cache)
+            test_offset = split - start
+            stats = evaluate_weights(
+                window.window(test_offset, len(window)), matrix[:, test_offset:], weights,
+                meta_params["sl_multiplier"], meta_params["tp_multiplier"],
+            )
+            scores.append(float(stats["sharpe_ratio"][0]))
+
+            trial.report(float(np.mean(scores)), step=fold)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
+        return float(np.mean(scores))
+
+    return objective
+
+
+def make_objective(df, mode, weight_trials, signal_cache, all_strategies=None, priors=()):
+    all_strategies = all_strategies or StrategyFactory.get_all().items()
+    if mode == "joint":
+        return joint_objective(df, all_strategies, signal_cache)
+    if mode == "two_level":
+        # Inner weight studies would otherwise log every trial
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        return two_level_objective(df, all_strategies, weight_trials, signal_cache, priors)
+    if mode == "walk_forward":
+        return walk_forward_objective(df, all_strategies, signal_cache)
+    raise ValueError(f"Unknown optimization mode: {mode}")
+
+
+def suggest_joint_params(trial, all_strategies):
+    """Sample one full ensemble (the joint objective's space) and return the flat param set."""
+    for name, entry in all_strategies:
+        suggest_strategy_params(trial, name, entry.get("param_space", {}))
+        trial.suggest_float(f"{name}_weight", 0.0, 1.0)
+    suggest_meta_params(trial)
+    return dict(trial.params)
+
+
+def optimize_batched(study, df, all_strategies, trials, batch_size, signal_cache):
+    """
+    Ask/tell loop: ask for `batch_size` trials at once, backtest them together
+    over one shared price array (run_batch_backtest: deduplicated signals,
+    one blended K x n matrix, one batched kernel call) and tell the results.
+    """
+    bars = BarArrays.from_frame(df)
+    while True:
+        # Re-counted before every ask, in-flight trials included: each ask marks a
+        # trial RUNNING in the shared storage, so concurrent workers' batches
+        # together stay within the trial budget. Trials a dead worker left
+        # RUNNING are failed first, so a resumed run still reaches the budget.
+        fail_stale_trials(study)
+        batch = []
+        while len(batch) < batch_size and remaining_trials(study, trials, include_running=True) > 0:
+            batch.append(study.ask())
+        if not batch:
+            break
+        param_sets = [suggest_joint_params(trial, all_strategies) for trial in batch]
+        stats = run_batch_backtest(bars, param_sets, signal_cache=signal_cache)
+        for trial, sharpe in zip(batch, stats["sharpe_ratio"]):
+            # Skipped if fail_stale_trials in another worker gave up on this trial meanwhile
+            study.tell(trial, float(sharpe), skip_if_finished=True)
+        print(f"  Batch of {len(batch)} trials: best Sharpe {stats['sharpe_ratio'].max():.3f}")
+
+
+def run_study(study, df, mode, trials, signal_cache, all_strategies, weight_trials=50, batch_size=32, priors=()):
+    if mode == "batch":
+        optimize_batched(study, df, all_strategies, trials, batch_size, signal_cache)
+    else:
+        optimize(study, make_objective(df, mode, weight_trials, signal_cache, all_strategies, priors), trials)
+
+
+def study_options(mode, pruner):
+    options = {"pruner": PRUNERS[pruner]()}
+    if mode == "batch":
+        # Pending trials of a batch count as "lies" so TPE does not propose the same point B times
+        options["sampler"] = optuna.samplers.TPESampler(constant_liar=True)
+    return options
+
+
+def _study_worker(symbol, df, trials, mode, weight_trials, batch_size, storage, study_kind, date, pruner,
+                  all_strategies, priors):
+    """Extra worker process contributing trials to the shared study."""
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    signal_cache = SignalCache()
+    study = create_study(study_kind, symbol, storage=storage, date=date, **study_options(mode, pruner))
+    run_study(study, df, mode, trials, signal_cache, all_strategies, weight_trials, batch_size, priors)
+    signal_cache.save()
+
+
+def tune_symbol_ensemble(symbol, trials, mode="joint", weight_trials=50, df=None,
+                         storage=None, workers=1, pruner="median", warm_start=3, narrow=None,
+                         seed_params=None, study_kind="ensemble", study_date=None, batch_size=32):
+    """
+    Tune strategy params, weights and SL/TP for one symbol without writing anything.
+
+    mode="joint" samples everything in a single study and backtests every
+    trial from scratch; mode="two_level" searches strategy params in an
+    outer study and weights/SL/TP per signal matrix in an inner one;
+    mode="walk_forward" scores trials fold by fold so `pruner` ("median",
+    "halving" or "none") can stop unpromising ones early; mode="batch" samples
+    the joint space but asks for `batch_size` trials at a time and evaluates
+    them together with the batched backtester. `df` skips the data load when the caller already holds the bars.
+
+    With a storage (see core.optuna_storage) the study is named per
+    (symbol, date) and resumed if it exists; `workers` > 1 then adds worker
+    processes optimizing the same study until it holds `trials` trials.
+
+    A fresh study is seeded with the symbol's `warm_start` most recent best
+    param sets (ensemble_tuned_params.json, then backups/); in two_level
+    mode their weights and SL/TP seed each inner study. With `narrow`
+    set, strategy param ranges shrink to those priors +/- `narrow` of each
+    original range; weight and SL/TP ranges are left as they are.
+    `seed_params` (a list of flat param sets) replaces the file-based priors.
+    `study_kind`/`study_date` name the stored study ("<kind>-<SYMBOL>-<date>",
+    today by default).
+
+    Returns:
+        {"value": best Sharpe, "params": best flat params, "config": the
+        symbol's entry for ensemble_tuned_params.json}
+    """
+    print(f"\n🎯 Running ENSEMBLE optimization for {symbol} with {trials} trials ({mode})...")
+
+    # === Load and clean data from the local bar store ===
+    if df is None:
+        df = load_tuning_data(symbol)
+    df = df.dropna()
+
+    # Kept as a URL: every worker process opens the storage itself
+    storage = storage or OPTUNA_STORAGE
+    if workers > 1 and not storage:
+        raise ValueError("Multiple study workers need a shared storage (set OPTUNA_STORAGE or --storage).")
+    date = study_date or datetime.now().strftime("%Y-%m-%d")
+
+    # === Warm start from previous winners ===
+    all_strategies = list(StrategyFactory.get_all().items())
+    search_space = flat_search_space(all_strategies)
+    if seed_params is not None:
+        priors = list(seed_params)
+    elif warm_start:
+        priors = prior_param_sets(symbol, search_space, n=warm_start, params_file=PARAMS_FILE)
+    else:
+        priors = []
+    if priors and narrow:
+        all_strategies = with_search_space(all_strategies, narrow_search_space(search_space, priors, narrow))
+
+    # Per-strategy signals shared by every trial (persisted when SIGNAL_CACHE_PATH is set)
+    signal_cache = SignalCache()
+    study = create_study(study_kind, symbol, storage=storage, date=date, **study_options(mode, pruner))
+    if enqueue_prior_trials(study, priors):
+        print(f"🌱 Seeded study with {len(priors)} prior best param sets")
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers - 1) as pool:
+            extra = [
+                pool.submit(_study_worker, symbol, df, trials, mode, weight_trials, batch_size, storage,
+                            study_kind, date, pruner, all_strategies, priors)
+                for _ in range(workers - 1)
+            ]
+            run_study(study, df, mode, trials, signal_cache, all_strategies, weight_trials, batch_size, priors)
+            for future in extra:
+                future.result()
+    else:
+        run_study(study, df, mode, trials, signal_cache, all_strategies, weight_trials, batch_size, priors)
+
+    cache_stats = signal_cache.stats()
+    print(f"\n🧠 Signal cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+          f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['size']} entries)")
+    signal_cache.save()
 
     # === Display and Save Best Result ===
-    best_params = study.best_params
+    best_params = {**study.best_params, **study.best_trial.user_attrs.get("weight_params", {})}
     print("\n✅ Best Parameters:")
     for k, v in best_params.items():
         print(f"  {k}: {v}")
 
-    # Load or create output config
-    try:
-        with open(PARAMS_FILE, "r") as f:
-            all_results = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        all_results = {}
+    return {
+        "value": study.best_value,
+        "params": best_params,
+        "config": build_symbol_config(best_params, StrategyFactory.get_all().items()),
+    }
+
 
-    # Build config for current symbol
+def load_tuning_data(symbol):
+    start_date = (datetime.utcnow() - timedelta(days=TUNING_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    return get_price_data(symbol, start_date=start_date)
+
+
+def build_symbol_config(best_params, all_strategies):
     strategies_config = []
     for name, entry in all_strategies:
         param_space = entry["param_space"]
@@ -100,20 +388,56 @@ def run_optimize_ensemble(symbol, trials):
             strategy_config["params"][param_name] = best_params.get(full_param_name)
         strategies_config.append(strategy_config)
 
-    all_results[symbol] = {
+    return {
         "strategies": strategies_config,
         "sl_multiplier": best_params.get("sl_multiplier", 2.0),
         "tp_multiplier": best_params.get("tp_multiplier", 3.0)
     }
 
+
+def save_tuned_params(symbol_configs):
+    """Merge {symbol: config} into PARAMS_FILE with a single write."""
+    # Load or create output config
+    try:
+        with open(PARAMS_FILE, "r") as f:
+            all_results = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        all_results = {}
+
+    all_results.update(symbol_configs)
+
     with open(PARAMS_FILE, "w") as f:
         json.dump(all_results, f, indent=4)
+
+
+def run_optimize_ensemble(symbol, trials, mode="joint", weight_trials=50, storage=None, workers=1,
+                          pruner="median", warm_start=3, narrow=None, batch_size=32):
+    result = tune_symbol_ensemble(symbol, trials, mode=mode, weight_trials=weight_trials,
+                                  storage=storage, workers=workers, pruner=pruner,
+                                  warm_start=warm_start, narrow=narrow, batch_size=batch_size)
+    save_tuned_params({symbol: result["config"]})
     print(f"\n💾 Saved tuned parameters for {symbol} to {PARAMS_FILE}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--symbol", required=True, help="Symbol to optimize")
     parser.add_argument("--trials", type=int, default=25, help="Number of Optuna trials")
+    parser.add_argument("--mode", choices=["joint", "two_level", "walk_forward", "batch"], default="joint",
+                        help="joint: one study over everything; two_level: strategy params outer, weights/SL/TP inner; "
+                             "walk_forward: score fold by fold with pruning; batch: joint space, batched ask/tell")
+    parser.add_argument("--batch-size", type=int, default=32, help="Trials asked and evaluated together (batch)")
+    parser.add_argument("--pruner", choices=sorted(PRUNERS), default="median",
+                        help="Pruner for walk_forward fold scores")
+    parser.add_argument("--weight-trials", type=int, default=50, help="Inner weight trials per strategy param set (two_level)")
+    parser.add_argument("--storage", default=None,
+                        help="Optuna storage URL (sqlite:///path.db or journal:path.log); defaults to $OPTUNA_STORAGE")
+    parser.add_argument("--workers", type=int, default=1, help="Processes optimizing the shared study (needs --storage)")
+    parser.add_argument("--warm-start", type=int, default=3,
+                        help="Seed the study with this many prior best param sets (0 disables)")
+    parser.add_argument("--narrow", type=float, default=None,
+                        help="Narrow strategy param ranges to the priors +/- this fraction of each range")
     args = parser.parse_args()
 
-    run_optimize_ensemble(args.symbol.upper(), args.trials)
+    run_optimize_ensemble(args.symbol.upper(), args.trials, mode=args.mode, weight_trials=args.weight_trials,
+                          storage=args.storage, workers=args.workers, pruner=args.pruner,
+                          warm_start=args.warm_start, narrow=args.narrow, batch_size=args.batch_size)
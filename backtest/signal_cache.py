@@ -0,0 +1,129 @@
+# backtest/signal_cache.py
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from indicators.bar_arrays import BarArrays
+
+# Set to a file path to keep signals between runs (e.g. nightly tuning jobs)
+SIGNAL_CACHE_PATH = os.getenv("SIGNAL_CACHE_PATH")
+SIGNAL_CACHE_SIZE = int(os.getenv("SIGNAL_CACHE_SIZE", "4096"))
+
+
+def freeze_params(params):
+    """Hashable, order-independent form of a strategy's param dict."""
+    return tuple(sorted(params.items()))
+
+
+class SignalCache:
+    """
+    Bounded LRU of per-strategy int8 signals, keyed by
+    (data fingerprint, strategy name, frozen params).
+
+    One instance is shared by every trial of a study so integer-heavy param
+    spaces stop recomputing signals Optuna has already seen. Cached arrays
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=SIGNAL_CACHE_SIZE, path=SIGNAL_CACHE_PATH):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, bars, name, params, compute):
+        """Return the cached signal for (bars, name, params), calling compute() on a miss."""
+        bars = BarArrays.from_frame(bars)
+        key = (bars.fingerprint, name, freeze_params(params))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        signal = compute()
+        signal.flags.writeable = False
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = signal
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return signal
+
+    def get_many(self, bars, name, param_sets, compute_many):
+        """
+        Signals for several param dicts of one strategy, in order. The misses
+        are computed together with compute_many(missing_param_sets), which
+        returns one signal row per set (e.g. StrategyBase.signal_arrays).
+        """
+        bars = BarArrays.from_frame(bars)
+        keys = [(bars.fingerprint, name, freeze_params(params)) for params in param_sets]
+        signals = [None] * len(keys)
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    signals[i] = self._entries[key]
+            missing = [i for i, signal in enumerate(signals) if signal is None]
+            self.hits += len(keys) - len(missing)
+        if not missing:
+            return signals
+
+        computed = compute_many([param_sets[i] for i in missing])
+        with self._lock:
+            self.misses += len(missing)
+            for i, signal in zip(missing, computed):
+                # Own copy: a cached row view would pin the whole batch matrix
+                signal = np.array(signal, dtype=np.int8)
+                signal.flags.writeable = False
+                signals[i] = self._entries[keys[i]] = signal
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return signals
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    # === Persistence ===
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                entries = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return
+        with self._lock:
+            for key, signal in list(entries.items())[-self.maxsize:]:
+                signal.flags.writeable = False
+                self._entries[key] = signal
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            entries = OrderedDict(self._entries)
+        # Per-process temp file: parallel tuning workers may save concurrently
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,60 @@
+# backtest/signal_matrix.py
+
+import numpy as np
+
+from indicators.strategy_base import StrategyFactory
+from indicators.bar_arrays import BarArrays
+import indicators.registry  # ensures all strategies are registered
+from backtest.batch_backtest import batch_stats
+from backtest.kernels import simulate_long_only_batch
+
+
+def strategy_signal(bars, name, params, cache=None):
+    """int8 signal of one registered strategy, looked up in `cache` (a SignalCache) when given."""
+    def compute():
+        return StrategyFactory.get_class(name)(bars, **params).signal_array()
+    if cache is None:
+        return compute()
+    return cache.get(bars, name, params, compute)
+
+
+def signal_matrix(bars, strategy_params, cache=None):
+    """
+    Stack per-strategy signals into a (strategies x bars) int8 matrix.
+
+    Args:
+        bars: BarArrays (or an OHLCV frame)
+        strategy_params: {strategy name: params}, in the row order wanted
+
+    Returns:
+        (names, S) where S[i] is the signal of names[i]
+    """
+    bars = BarArrays.from_frame(bars)
+    names = list(strategy_params)
+    matrix = np.empty((len(names), len(bars)), dtype=np.int8)
+    for row, name in enumerate(names):
+        matrix[row] = strategy_signal(bars, name, strategy_params[name], cache)
+    return names, matrix
+
+
+def blend(weights, matrix):
+    """np.sign(W @ S) for one weight vector (m,) or a batch of them (K, m)."""
+    return np.sign(np.asarray(weights, dtype=np.float64) @ matrix)
+
+
+def evaluate_weights(bars, matrix, weights, sl_multipliers, tp_multipliers):
+    """
+    Backtest K weight vectors against one precomputed signal matrix.
+
+    Only the blend and the simulation kernel run; no indicator is recomputed.
+
+    Returns:
+        dict of K-length arrays: sharpe_ratio, max_drawdown, final_value
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    signals = blend(weights, matrix)
+    sl = np.broadcast_to(np.asarray(sl_multipliers, dtype=np.float64), len(weights)).copy()
+    tp = np.broadcast_to(np.asarray(tp_multipliers, dtype=np.float64), len(weights)).copy()
+    bars = BarArrays.from_frame(bars)
+    equity_curves, _ = simulate_long_only_batch(bars.close, bars.high, bars.low, signals, sl, tp)
+    return batch_stats(equity_curves)
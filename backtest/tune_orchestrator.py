@@ -0,0 +1,68 @@
+# backtest/tune_orchestrator.py
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import optuna
+
+from core import config
+from core.data_loader import get_price_data_batch
+from backtest.optimize_ensemble import (
+    tune_symbol_ensemble, save_tuned_params, PARAMS_FILE, TUNING_LOOKBACK_DAYS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    # Per-trial INFO lines from N interleaved studies are unreadable
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+def _tune_worker(symbol, df, trials, mode, weight_trials):
+    return symbol, tune_symbol_ensemble(symbol, trials, mode=mode, weight_trials=weight_trials, df=df)
+
+
+def tune_symbols(symbols, trials=25, mode="joint", weight_trials=50, max_workers=None):
+    """
+    Tune every symbol's ensemble in parallel and merge the results into
+    ensemble_tuned_params.json with one write at the end.
+
+    Price data is fetched once up front (a single batched download) and
+    handed to the workers, so worker processes never touch the network and
+    pay the pandas/optuna import cost once each rather than once per symbol.
+
+    Returns:
+        {symbol: tune_symbol_ensemble result} for the symbols that succeeded
+    """
+    symbols = [s.upper() for s in symbols]
+    max_workers = max(1, min(max_workers or config.TUNE_WORKERS, len(symbols)))
+
+    start_date = (datetime.utcnow() - timedelta(days=TUNING_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+    price_data = get_price_data_batch(symbols, start_date=start_date)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        futures = {}
+        for symbol in symbols:
+            df = price_data.get(symbol)
+            if df is None or df.empty:
+                logger.warning(f"⚠️ No data for {symbol}; skipping tuning.")
+                continue
+            futures[pool.submit(_tune_worker, symbol, df, trials, mode, weight_trials)] = symbol
+
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                _, result = future.result()
+            except Exception as e:
+                logger.error(f"❌ Optimization failed for {symbol}: {e}")
+                continue
+            results[symbol] = result
+            logger.info(f"✅ Completed: {symbol} (best Sharpe {result['value']:.3f})")
+
+    if results:
+        save_tuned_params({symbol: result["config"] for symbol, result in results.items()})
+        logger.info(f"💾 Saved tuned parameters for {len(results)} symbols to {PARAMS_FILE}")
+    return results
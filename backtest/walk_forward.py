@@ -2,14 +2,16 @@
 
 import os
 import json
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import argparse
 import optuna
-from datetime import timedelta
+from datetime import datetime, timedelta
 from indicators.strategy_base import StrategyFactory
 import indicators.registry  # ensure all strategies are registered
+from indicators.bar_arrays import BarArrays
+from core.data_loader import get_price_data
+from backtest.kernels import simulate_long_only
 
 PARAMS_FILE = "ensemble_tuned_params.json"
 
@@ -29,12 +31,50 @@ def calculate_stats(equity_curve):
     return sharpe, max_drawdown
 
 
-def run_walk_forward(symbol, initial_cash, train_size_days=180, test_size_days=30):
+def walk_forward_windows(total_bars, train_size_days=180, test_size_days=30):
+    """
+    (start, split, end) bar offsets of each rolling window: train is
+    [start, split), test is [split, end), and windows advance by one test size.
+    """
+    windows = []
+    start_idx = 0
+    while start_idx + train_size_days + test_size_days <= total_bars:
+        split_idx = start_idx + train_size_days
+        windows.append((start_idx, split_idx, split_idx + test_size_days))
+        start_idx += test_size_days
+    return windows
+
+
+def blended_signal(bars, strategies, strategy_params, weights):
+    """np.sign of the weighted strategy signals over `bars`."""
+    blended = np.zeros(len(bars))
+    for cls, strat_param in zip(strategies, strategy_params):
+        strat = cls(bars, **strat_param)
+        blended += strat.signal_array() * weights.get(f"{strat.name}_weight", 1.0)
+    return np.sign(blended)
+
+
+def simulate_window(test_bars, signal, sl_multiplier, tp_multiplier, initial_cash):
+    """SL/TP/signal-exit backtest of one test window; equity starts at initial_cash on its first bar."""
+    equity_curve, _, _ = simulate_long_only(
+        test_bars.close, test_bars.high, test_bars.low, signal,
+        float(sl_multiplier), float(tp_multiplier),
+    )
+    equity_curve[0] = 1.0
+    return pd.Series(equity_curve * initial_cash, index=test_bars.index)
+
+
+def run_walk_forward(symbol, initial_cash, train_size_days=180, test_size_days=30, full_series=False):
+    """
+    Re-evaluate the symbol's tuned ensemble on rolling test windows.
+
+    By default each window recomputes the strategies on its own train+test
+    bars. With full_series=True every signal is computed once over the whole
+    history and each window is a slice of it plus one kernel run.
+    """
     print(f"\n🔁 Starting walk-forward validation for {symbol}...\n")
-    df = yf.download(symbol, period="2y", interval="1d", auto_adjust=False)
-    df = df.rename(columns={
-        "Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume"
-    }).dropna()
+    start_date = (datetime.utcnow() - timedelta(days=730)).strftime("%Y-%m-%d")
+    df = get_price_data(symbol, start_date=start_date).dropna()
 
     params = load_params(symbol)
     if not params:
@@ -62,86 +102,48 @@ def run_walk_forward(symbol, initial_cash, train_size_days=180, test_size_days=3
     sl_multiplier = params.get("sl_multiplier", 2.0)
     tp_multiplier = params.get("tp_multiplier", 3.0)
 
-    start_idx = 0
+    bars = BarArrays.from_frame(df)
+    windows = walk_forward_windows(len(bars), train_size_days, test_size_days)
+
+    if full_series:
+        # Every strategy is causal, so one pass over the full series gives each
+        # bar the same signal it would get from the history up to that bar
+        full_signal = blended_signal(bars, strategies, strategy_params, weights)
+
     stats_per_window = []
-    total_days = len(df)
-
-    while start_idx + train_size_days + test_size_days <= total_days:
-        train_df = df.iloc[start_idx:start_idx + train_size_days]
-        test_df = df.iloc[start_idx + train_size_days:start_idx + train_size_days + test_size_days].copy()
-
-        blended_signal = np.zeros(len(test_df))
-
-        for cls, strat_param in zip(strategies, strategy_params):
-            strat = cls(pd.concat([train_df, test_df]).copy(), **strat_param)
-            signal = strat.generate_signals().iloc[-len(test_df):]
-            name_prefix = strat.name.split('_')[0]
-            weight = weights.get(f"{name_prefix}_weight", 1.0)
-            blended_signal += signal * weight
-
-        test_df["signal"] = np.sign(blended_signal)
-
-        # === Execute trades with SL/TP ===
-        equity = [initial_cash]
-        position = 0
-        entry_price = 0
-
-        for i in range(1, len(test_df)):
-            row = test_df.iloc[i]
-            prev = test_df.iloc[i - 1]
-            signal = prev["signal"]
-
-            price = row["close"]
-            high = row["high"]
-            low = row["low"]
-
-            if position == 0 and signal == 1:
-                position = equity[-1] / price
-                entry_price = price
-            elif position > 0:
-                sl_price = entry_price * (1 - sl_multiplier / 100)
-                tp_price = entry_price * (1 + tp_multiplier / 100)
-
-                if low <= sl_price:
-                    equity.append(position * sl_price)
-                    position = 0
-                elif high >= tp_price:
-                    equity.append(position * tp_price)
-                    position = 0
-                elif signal == -1:
-                    equity.append(position * price)
-                    position = 0
-                else:
-                    equity.append(equity[-1])
-            else:
-                equity.append(equity[-1])
-
-        if position > 0:
-            equity[-1] = position * test_df.iloc[-1]["close"]
-
-        eq_series = pd.Series(equity, index=test_df.index)
+
+    for start_idx, split_idx, end_idx in windows:
+        if full_series:
+            test_signal = full_signal[split_idx:end_idx]
+        else:
+            window_signal = blended_signal(bars.window(start_idx, end_idx), strategies, strategy_params, weights)
+            test_signal = window_signal[split_idx - start_idx:]
+
+        test_bars = bars.window(split_idx, end_idx)
+        eq_series = simulate_window(test_bars, test_signal, sl_multiplier, tp_multiplier, initial_cash)
         sharpe, max_dd = calculate_stats(eq_series)
 
         print(f"📅 Window {start_idx}: Final=${eq_series.iloc[-1]:.2f}, Sharpe={sharpe:.2f}, MaxDD={max_dd:.2%}")
         stats_per_window.append({
-            "start_date": test_df.index[0].strftime("%Y-%m-%d"),
-            "end_date": test_df.index[-1].strftime("%Y-%m-%d"),
+            "start_date": test_bars.index[0].strftime("%Y-%m-%d"),
+            "end_date": test_bars.index[-1].strftime("%Y-%m-%d"),
             "final_value": eq_series.iloc[-1],
             "sharpe_ratio": sharpe,
             "max_drawdown": max_dd
         })
 
-        start_idx += test_size_days
-
     print("\n✅ Walk-forward complete.\n")
     for stat in stats_per_window:
         print(stat)
+    return stats_per_window
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--symbol", required=True)
     parser.add_argument("--initial-cash", type=float, default=10000)
+    parser.add_argument("--full-series", action="store_true",
+                        help="Compute signals once over the full history and slice them per window")
     args = parser.parse_args()
 
-    run_walk_forward(args.symbol, args.initial_cash)
+    run_walk_forward(args.symbol, args.initial_cash, full_series=args.full_series)
@@ -0,0 +1,142 @@
+# backtest/walk_forward_optimize.py
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import optuna
+import pandas as pd
+
+from core import config
+from core.data_loader import get_price_data
+from indicators.bar_arrays import BarArrays
+from indicators.strategy_base import StrategyFactory
+from backtest.optimize_ensemble import tune_symbol_ensemble
+from backtest.walk_forward import (
+    walk_forward_windows, blended_signal, simulate_window, calculate_stats,
+)
+
+
+def _init_worker():
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+def _optimize_window(symbol, train_df, trials, mode, seed_params, study_date):
+    """Tune on one training window; seeded with the previous window's best when there is one."""
+    return tune_symbol_ensemble(
+        symbol, trials, mode=mode, df=train_df, warm_start=0,
+        seed_params=[seed_params] if seed_params else [],
+        study_kind="walk-forward", study_date=study_date,
+    )
+
+
+def _config_to_ensemble(symbol_config):
+    strategies = [StrategyFactory.get_class(s["strategy"]) for s in symbol_config["strategies"]]
+    strategy_params = [s["params"] for s in symbol_config["strategies"]]
+    weights = {f"{s['strategy']}_weight": s["weight"] for s in symbol_config["strategies"]}
+    return strategies, strategy_params, weights
+
+
+def run_walk_forward_optimization(symbol, initial_cash=10000, trials=25, mode="joint",
+                                  train_size_days=180, test_size_days=30, max_workers=None):
+    """
+    Rolling re-optimization: tune on each training window, score the tuned
+    ensemble on the following test window, and chain the test windows into
+    one out-of-sample equity curve.
+
+    Windows are tuned on a process pool in waves of `max_workers`; every
+    window in a wave is warm-started from the best params of the last window
+    of the previous wave (with max_workers=1 that is always the previous
+    window, as in a nightly re-tune).
+
+    Returns:
+        {"windows": per-window stats and tuned params,
+         "equity_curve": combined out-of-sample equity,
+         "sharpe_ratio", "max_drawdown", "final_value"}
+    """
+    print(f"\n🔁 Starting walk-forward optimization for {symbol}...\n")
+    start_date = (datetime.utcnow() - timedelta(days=730)).strftime("%Y-%m-%d")
+    df = get_price_data(symbol, start_date=start_date).dropna()
+    bars = BarArrays.from_frame(df)
+
+    windows = walk_forward_windows(len(bars), train_size_days, test_size_days)
+    if not windows:
+        print(f"❌ Not enough bars for a {train_size_days}/{test_size_days} walk-forward: {len(bars)}")
+        return None
+    max_workers = max(1, min(max_workers or config.TUNE_WORKERS, len(windows)))
+
+    tuned = []
+    seed_params = None
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        for wave_start in range(0, len(windows), max_workers):
+            wave = windows[wave_start:wave_start + max_workers]
+            futures = [
+                pool.submit(
+                    _optimize_window, symbol, df.iloc[start_idx:split_idx], trials, mode,
+                    seed_params, df.index[split_idx].strftime("%Y-%m-%d"),
+                )
+                for start_idx, split_idx, _ in wave
+            ]
+            tuned.extend(future.result() for future in futures)
+            seed_params = tuned[-1]["params"]
+
+    # === Score each tuned ensemble on its test window, chaining capital ===
+    capital = initial_cash
+    curves = []
+    stats_per_window = []
+    for (start_idx, split_idx, end_idx), result in zip(windows, tuned):
+        strategies, strategy_params, weights = _config_to_ensemble(result["config"])
+        signal = blended_signal(bars.window(start_idx, end_idx), strategies, strategy_params, weights)
+        test_bars = bars.window(split_idx, end_idx)
+        meta = result["config"]
+        eq_series = simulate_window(
+            test_bars, signal[split_idx - start_idx:], meta["sl_multiplier"], meta["tp_multiplier"], capital
+        )
+        sharpe, max_dd = calculate_stats(eq_series)
+
+        print(f"📅 Window {start_idx}: Train Sharpe={result['value']:.2f}, "
+              f"Final=${eq_series.iloc[-1]:.2f}, Sharpe={sharpe:.2f}, MaxDD={max_dd:.2%}")
+        stats_per_window.append({
+            "start_date": test_bars.index[0].strftime("%Y-%m-%d"),
+            "end_date": test_bars.index[-1].strftime("%Y-%m-%d"),
+            "train_sharpe": result["value"],
+            "final_value": eq_series.iloc[-1],
+            "sharpe_ratio": sharpe,
+            "max_drawdown": max_dd,
+            "params": result["params"],
+        })
+        curves.append(eq_series)
+        capital = eq_series.iloc[-1]
+
+    equity_curve = pd.concat(curves)
+    sharpe, max_dd = calculate_stats(equity_curve)
+    print("\n✅ Walk-forward optimization complete.")
+    print(f"  Out-of-sample Final Value : {equity_curve.iloc[-1]:.2f}")
+    print(f"  Out-of-sample Sharpe      : {sharpe:.2f}")
+    print(f"  Out-of-sample Max Drawdown: {abs(max_dd):.2%}")
+
+    return {
+        "windows": stats_per_window,
+        "equity_curve": equity_curve,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": max_dd,
+        "final_value": equity_curve.iloc[-1],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--initial-cash", type=float, default=10000)
+    parser.add_argument("--trials", type=int, default=25, help="Optuna trials per training window")
+    parser.add_argument("--mode", choices=["joint", "two_level", "walk_forward", "batch"], default="joint")
+    parser.add_argument("--workers", type=int, default=None, help="Windows tuned in parallel (default: TUNE_WORKERS)")
+    parser.add_argument("--output", default=None, help="Write the out-of-sample equity curve to this CSV")
+    args = parser.parse_args()
+
+    result = run_walk_forward_optimization(
+        args.symbol.upper(), args.initial_cash, trials=args.trials, mode=args.mode, max_workers=args.workers,
+    )
+    if result and args.output:
+        result["equity_curve"].rename("equity").to_csv(args.output)
+        print(f"💾 Saved out-of-sample equity curve to {args.output}")
@@ -0,0 +1,127 @@
+# backtest/warm_start.py
+
+import glob
+import json
+import math
+import os
+import re
+from datetime import datetime
+
+from core.config import PARAMS_FILE
+
+BACKUP_DIR = "backups"
+
+# ensemble_tuned_params_backup_YYYYMMDD_HHMMSS.json / ensemble_tuned_params_YYYY-MM-DD.json
+BACKUP_STAMPS = [
+    (re.compile(r"_(\d{8}_\d{6})\.json$"), "%Y%m%d_%H%M%S"),
+    (re.compile(r"_(\d{4}-\d{2}-\d{2})\.json$"), "%Y-%m-%d"),
+]
+
+
+def config_to_params(config):
+    """Flatten a saved symbol config back into Optuna's `{name}_{param}` / `{name}_weight` names."""
+    params = {}
+    for strat in config.get("strategies", []):
+        name = strat["strategy"]
+        for param_name, value in (strat.get("params") or {}).items():
+            params[f"{name}_{param_name}"] = value
+        if "weight" in strat:
+            params[f"{name}_weight"] = strat["weight"]
+    for key in ("sl_multiplier", "tp_multiplier"):
+        if key in config:
+            params[key] = config[key]
+    return params
+
+
+def backup_timestamp(path):
+    """When a backup was taken, from its file name (mtimes change on copy/checkout); datetime.min if undated."""
+    name = os.path.basename(path)
+    for pattern, fmt in BACKUP_STAMPS:
+        match = pattern.search(name)
+        if match:
+            try:
+                return datetime.strptime(match.group(1), fmt)
+            except ValueError:
+                break
+    return datetime.min
+
+
+def load_prior_configs(symbol, params_file=PARAMS_FILE, backup_dir=BACKUP_DIR):
+    """The symbol's saved configs, newest first: the live params file, then dated backups."""
+    paths = [params_file] + sorted(
+        glob.glob(os.path.join(backup_dir, "ensemble_tuned_params*.json")),
+        key=backup_timestamp,
+        reverse=True,
+    )
+    configs = []
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                config = json.load(f).get(symbol)
+        except (OSError, json.JSONDecodeError, AttributeError):
+            continue
+        if config:
+            configs.append(config)
+    return configs
+
+
+def _in_space(value, info):
+    if info["type"] == "categorical":
+        return value in info["choices"]
+    if info["type"] == "int" and (not isinstance(value, (int, float)) or value != int(value)):
+        return False
+    return isinstance(value, (int, float)) and info["low"] <= value <= info["high"]
+
+
+def prior_param_sets(symbol, search_space, n=3, params_file=PARAMS_FILE, backup_dir=BACKUP_DIR):
+    """
+    Up to n distinct prior best param sets for a symbol, newest first.
+
+    Values are kept only when the name is still in `search_space` (flat name ->
+    {"type", "low", "high"} / {"choices"}) and inside its range, so configs
+    saved under older param names or bounds still seed what they can.
+    """
+    param_sets = []
+    seen = set()
+    for config in load_prior_configs(symbol, params_file, backup_dir):
+        params = {
+            key: (int(value) if search_space[key]["type"] == "int" else value)
+            for key, value in config_to_params(config).items()
+            if key in search_space and _in_space(value, search_space[key])
+        }
+        key = tuple(sorted(params.items()))
+        if not params or key in seen:
+            continue
+        seen.add(key)
+        param_sets.append(params)
+        if len(param_sets) == n:
+            break
+    return param_sets
+
+
+def enqueue_prior_trials(study, param_sets):
+    """Queue prior bests as the first trials of a fresh study (resumed studies already ran them)."""
+    if study.trials:
+        return 0
+    for params in param_sets:
+        study.enqueue_trial(params, skip_if_exists=True)
+    return len(param_sets)
+
+
+def narrow_search_space(search_space, param_sets, width=0.25):
+    """
+    Shrink numeric ranges to the span of the prior values plus `width` of the
+    original range on each side, clipped to the original bounds.
+    """
+    narrowed = dict(search_space)
+    for key, info in search_space.items():
+        values = [params[key] for params in param_sets if key in params]
+        if not values or info["type"] not in ("int", "float"):
+            continue
+        margin = width * (info["high"] - info["low"])
+        low = max(info["low"], min(values) - margin)
+        high = min(info["high"], max(values) + margin)
+        if info["type"] == "int":
+            low, high = int(math.floor(low)), int(math.ceil(high))
+        narrowed[key] = {**info, "low": low, "high": high}
+    return narrowed
@@ -0,0 +1,118 @@
+# core/bar_scheduler.py
+
+import logging
+import os
+import threading
+from datetime import datetime, time, timedelta
+
+import pytz
+
+EASTERN = pytz.timezone("US/Eastern")
+SESSION_OPEN = time(9, 30)
+SESSION_CLOSE = time(16, 0)
+SESSION_MINUTES = 390
+
+# Seconds after a bar closes before its cycle fires, so the data feed has published the bar
+BAR_CLOSE_DELAY_SECONDS = float(os.getenv("BAR_CLOSE_DELAY_SECONDS", "5"))
+
+
+def session_bounds(day):
+    """Open and close of the regular session on `day`, as aware Eastern datetimes."""
+    return (
+        EASTERN.localize(datetime.combine(day, SESSION_OPEN)),
+        EASTERN.localize(datetime.combine(day, SESSION_CLOSE)),
+    )
+
+
+def daily_end_date(closed_at):
+    """
+    Exclusive end date for the daily-bar loader in a cycle fired by the close
+    at `closed_at`: the day after once the session has closed, so the bar
+    that just completed is fetched; the same day for intraday closes, whose
+    daily bar is still forming.
+    """
+    closed_at = closed_at.astimezone(EASTERN)
+    day = closed_at.date()
+    if closed_at >= session_bounds(day)[1]:
+        day += timedelta(days=1)
+    return day.strftime("%Y-%m-%d")
+
+
+def next_bar_close(now, interval_minutes):
+    """
+    First bar close strictly after `now` for bars of `interval_minutes`.
+
+    Bars are aligned to the session open (Monday–Friday, 9:30–16:00 ET, as in
+    core.utils.is_market_open); the last bar of a session closes at the
+    session close, and intervals of a full session or more are daily bars
+    closing at 16:00.
+    """
+    now = now.astimezone(EASTERN)
+    step = timedelta(minutes=max(1, min(int(interval_minutes), SESSION_MINUTES)))
+    day = now.date()
+    while True:
+        if day.weekday() < 5:
+            session_open, session_close = session_bounds(day)
+            if now < session_open:
+                return min(session_open + step, session_close)
+            if now < session_close:
+                bars_done = (now - session_open) // step + 1
+                return min(session_open + bars_done * step, session_close)
+        day += timedelta(days=1)
+
+
+class BarCloseScheduler:
+    """
+    Fires `on_bars_closed(symbols, closed_at)` once per completed bar, for the
+    symbols whose bar closed at `closed_at`, instead of polling the clock.
+
+    Symbols and their intervals are re-read before every wait (get_symbols(),
+    get_interval(symbol)), so edits to the params file apply from the next bar.
+    A cycle that overruns the next close is followed straight away by the one
+    it delayed. A symbol with an invalid interval is skipped (and logged)
+    rather than stopping the loop. `clock` returns the current aware time and
+    is injectable for tests.
+    """
+
+    def __init__(self, get_symbols, get_interval, on_bars_closed, delay=BAR_CLOSE_DELAY_SECONDS, clock=None):
+        self.get_symbols = get_symbols
+        self.get_interval = get_interval
+        self.on_bars_closed = on_bars_closed
+        self.delay = delay
+        self.clock = clock or (lambda: datetime.now(EASTERN))
+
+    def next_closes(self, after):
+        closes = {}
+        for symbol in self.get_symbols():
+            try:
+                closes[symbol] = next_bar_close(after, self.get_interval(symbol))
+            except (TypeError, ValueError) as e:
+                logging.error(f"❌ Invalid interval_minutes for {symbol}; not scheduled: {e}")
+        return closes
+
+    def run_forever(self, stop_event=None):
+        stop_event = stop_event or threading.Event()
+        last_close = self.clock()
+        while not stop_event.is_set():
+            try:
+                closes = self.next_closes(last_close)
+            except Exception as e:
+                logging.error(f"❌ Could not schedule the next bar close: {e}")
+                closes = {}
+            if not closes:
+                stop_event.wait(60)  # no schedulable symbols; look again later
+                last_close = self.clock()
+                continue
+
+            closed_at = min(closes.values())
+            due = [symbol for symbol, close in closes.items() if close == closed_at]
+            wait = (closed_at - self.clock()).total_seconds() + self.delay
+            logging.info(f"⏰ Next bar close {closed_at:%Y-%m-%d %H:%M} ET for {', '.join(due)}")
+            if stop_event.wait(max(0.0, wait)):
+                return
+
+            last_close = closed_at
+            try:
+                self.on_bars_closed(due, closed_at)
+            except Exception as e:
+                logging.error(f"❌ Bar-close cycle failed: {e}")
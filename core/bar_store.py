@@ -0,0 +1,132 @@
+# core/bar_store.py
+
+import os
+import logging
+import threading
+import numpy as np
+import pandas as pd
+
+# === Storage Layout ===
+# One partition per (timeframe, symbol): data/bars/<timeframe>/<SYMBOL>.npy
+BAR_STORE_DIR = os.getenv("BAR_STORE_DIR", os.path.join("data", "bars"))
+COLUMNS = ["open", "high", "low", "close", "volume"]
+BAR_DTYPE = np.dtype([("ts", "i8")] + [(col, "f8") for col in COLUMNS])
+
+
+def _to_ns(value):
+    """Convert a date-like value to naive-UTC int64 nanoseconds."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.value
+
+
+class BarStore:
+    """
+    Persistent OHLCV bar store backed by NumPy partitions.
+
+    Each partition is a structured array sorted by timestamp. Partitions are
+    memory-mapped read-only on first use and remapped only when the file's
+    mtime changes, and writes merge new bars in with a dedupe on timestamp.
+    """
+
+    def __init__(self, root=BAR_STORE_DIR):
+        self.root = root
+        # (symbol, timeframe) -> (file mtime, bars); steady-state reads skip the disk entirely
+        self._cache = {}
+
+    def _path(self, symbol, timeframe):
+        return os.path.join(self.root, timeframe, f"{symbol.upper()}.npy")
+
+    def _load(self, symbol, timeframe):
+        """Return the partition from memory, reloading it only if the file changed on disk."""
+        path = self._path(symbol, timeframe)
+        if not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        key = (symbol.upper(), timeframe)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        # Read-only map: pages are loaded on demand and read() copies out only its window
+        bars = np.load(path, mmap_mode="r")
+        self._cache[key] = (mtime, bars)
+        return bars
+
+    def has(self, symbol, timeframe="1d"):
+        return os.path.exists(self._path(symbol, timeframe))
+
+    def first_timestamp(self, symbol, timeframe="1d"):
+        bars = self._load(symbol, timeframe)
+        if bars is None or len(bars) == 0:
+            return None
+        return pd.Timestamp(int(bars["ts"][0]))
+
+    def last_timestamp(self, symbol, timeframe="1d"):
+        """Watermark: timestamp of the newest stored bar, or None if empty."""
+        bars = self._load(symbol, timeframe)
+        if bars is None or len(bars) == 0:
+            return None
+        return pd.Timestamp(int(bars["ts"][-1]))
+
+    def read(self, symbol, start=None, end=None, timeframe="1d") -> pd.DataFrame:
+        """
+        Return bars in [start, end) as a DataFrame with lowercase
+        open/high/low/close/volume columns and a DatetimeIndex.
+        """
+        bars = self._load(symbol, timeframe)
+        if bars is None or len(bars) == 0:
+            return pd.DataFrame(columns=COLUMNS)
+
+        ts = bars["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, _to_ns(start), side="left"))
+        hi = len(bars) if end is None else int(np.searchsorted(ts, _to_ns(end), side="left"))
+        window = bars[lo:hi]
+
+        df = pd.DataFrame(
+            {col: np.array(window[col]) for col in COLUMNS},
+            index=pd.DatetimeIndex(np.array(window["ts"]).astype("datetime64[ns]")),
+        )
+        return df
+
+    def write(self, symbol, df: pd.DataFrame, timeframe="1d", replace=False):
+        """
+        Merge `df` into the symbol's partition (newer rows win on duplicate
+        timestamps) and atomically replace the file on disk. With
+        replace=True the partition is rewritten from `df` alone.
+        """
+        if df is None or df.empty:
+            return
+
+        df = df[COLUMNS]
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        new = np.empty(len(df), dtype=BAR_DTYPE)
+        new["ts"] = index.values.astype("datetime64[ns]").astype("i8")
+        for col in COLUMNS:
+            new[col] = df[col].to_numpy(dtype="f8")
+
+        existing = None if replace else self._load(symbol, timeframe)
+        if existing is not None and len(existing):
+            merged = np.concatenate([existing, new])
+        else:
+            merged = new
+
+        # Stable sort + keep last occurrence so freshly fetched bars replace stale ones
+        order = np.argsort(merged["ts"], kind="stable")
+        merged = merged[order]
+        keep = np.ones(len(merged), dtype=bool)
+        keep[:-1] = merged["ts"][1:] != merged["ts"][:-1]
+        merged = merged[keep]
+
+        path = self._path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique per writer so concurrent writes of one partition never share a temp file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, merged)
+        os.replace(tmp_path, path)
+        self._cache[(symbol.upper(), timeframe)] = (os.path.getmtime(path), merged)
+        logging.info(f"💾 Stored {len(merged)} {timeframe} bars for {symbol.upper()}")
@@ -2,7 +2,10 @@
 
 import alpaca_trade_api as tradeapi
 import logging
+import threading
+import time
 from datetime import datetime
+from core.rate_limiter import RateLimitedClient
 from monitoring.telegram_utils import send_telegram_alert
 
 
@@ -11,7 +14,17 @@ class AlpacaBroker:
         self.api_key = config.ALPACA_API_KEY
         self.secret_key = config.ALPACA_SECRET_KEY
         self.base_url = config.ALPACA_BASE_URL
-        self.api = tradeapi.REST(self.api_key, self.secret_key, self.base_url, api_version="v2")
+        self.api = RateLimitedClient(tradeapi.REST(self.api_key, self.secret_key, self.base_url, api_version="v2"))
+
+        # Per-cycle snapshot of account, positions and open orders (see snapshot())
+        self.snapshot_ttl = config.BROKER_SNAPSHOT_TTL
+        self._snapshot = None
+        self._snapshot_at = 0.0
+        self._prices = {}
+        self._snapshot_lock = threading.Lock()
+        # Cash promised to buys sized but not yet submitted (symbol -> dollars)
+        self._reserved = {}
+        self._sizing_lock = threading.Lock()
 
         try:
             account = self.api.get_account()
@@ -21,32 +34,85 @@ class AlpacaBroker:
             logging.error(f"❌ Failed to connect to Alpaca: {e}")
             raise
 
+    # === Snapshot Cache ===
+    # One account, positions and open-orders fetch serves every read in a trade
+    # cycle: reads within snapshot_ttl seconds come from memory, and anything
+    # that changes the account (orders, closes, cancels) drops the snapshot so
+    # the next read refetches. Latest prices are cached the same way per symbol.
+    #
+    # Symbol threads size buys concurrently, so calculate_quantity() sizes
+    # against cash net of open buy orders and of buys other threads have sized
+    # but not yet submitted, and reserves its own share until submit_order()
+    # puts the order into the (refetched) snapshot.
+
+    def _fresh(self, fetched_at):
+        return time.monotonic() - fetched_at < self.snapshot_ttl
+
+    def snapshot(self):
+        """{"account", "positions" (symbol -> position), "open_orders"}, refetched once the TTL lapses."""
+        with self._snapshot_lock:
+            if self._snapshot is None or not self._fresh(self._snapshot_at):
+                self._snapshot = {
+                    "account": self.api.get_account(),
+                    "positions": {p.symbol: p for p in self.api.list_positions()},
+                    "open_orders": self.api.list_orders(status="open"),
+                }
+                self._snapshot_at = time.monotonic()
+            return self._snapshot
+
+    def refresh_snapshot(self, symbols=None):
+        """Start-of-cycle refresh; also prefetches latest prices for `symbols` in one request."""
+        with self._sizing_lock:
+            self._reserved.clear()  # sized-but-unsubmitted buys from the last cycle are abandoned
+        self.invalidate_snapshot()
+        try:
+            self.snapshot()
+        except Exception as e:
+            logging.error(f"❌ Error refreshing account snapshot: {e}")
+        if symbols:
+            try:
+                trades = self.api.get_latest_trades(list(symbols))
+                now = time.monotonic()
+                with self._snapshot_lock:
+                    for symbol, trade in trades.items():
+                        self._prices[symbol] = (float(trade.price), now)
+            except Exception as e:
+                logging.error(f"❌ Error prefetching latest prices: {e}")
+
+    def invalidate_snapshot(self):
+        with self._snapshot_lock:
+            self._snapshot = None
+
     def get_cash(self):
         try:
-            account = self.api.get_account()
-            return float(account.cash)
+            return float(self.snapshot()["account"].cash)
         except Exception as e:
             logging.error(f"❌ Error getting cash balance: {e}")
             return 0.0
 
     def get_equity(self):
         try:
-            account = self.api.get_account()
-            return float(account.equity)
+            return float(self.snapshot()["account"].equity)
         except Exception as e:
             logging.error(f"❌ Error getting equity: {e}")
             return 0.0
 
     def get_position(self, symbol):
         try:
-            position = self.api.get_position(symbol)
-            return float(position.qty)
-        except tradeapi.rest.APIError:
-            return 0  # No position
+            position = self.snapshot()["positions"].get(symbol)
+            return float(position.qty) if position is not None else 0  # No position
         except Exception as e:
             logging.error(f"❌ Error fetching position for {symbol}: {e}")
             return 0
 
+    def get_open_orders(self, symbol=None):
+        try:
+            orders = self.snapshot()["open_orders"]
+            return [o for o in orders if symbol is None or o.symbol == symbol]
+        except Exception as e:
+            logging.error(f"❌ Error fetching open orders: {e}")
+            return []
+
     def close_position(self, symbol):
         try:
             order = self.api.close_position(symbol)
@@ -55,29 +121,70 @@ class AlpacaBroker:
         except Exception as e:
             logging.error(f"❌ Error closing position for {symbol}: {e}")
             return None
+        finally:
+            self.invalidate_snapshot()
 
     def get_latest_price(self, symbol):
+        with self._snapshot_lock:
+            cached = self._prices.get(symbol)
+        if cached is not None and self._fresh(cached[1]):
+            return cached[0]
         try:
             quote = self.api.get_latest_trade(symbol)
-            return float(quote.price)
+            price = float(quote.price)
         except Exception as e:
             logging.error(f"❌ Error fetching latest price for {symbol}: {e}")
             return None
+        with self._snapshot_lock:
+            self._prices[symbol] = (price, time.monotonic())
+        return price
+
+    def _open_buy_cash(self, orders):
+        """Dollars still committed to open buy `orders` (unfilled quantity at the limit or latest price)."""
+        total = 0.0
+        for order in orders:
+            if order.side != "buy":
+                continue
+            filled = float(order.filled_qty or 0)
+            if getattr(order, "notional", None):  # dollar-amount order
+                total += max(0.0, float(order.notional) - filled * float(order.filled_avg_price or 0))
+                continue
+            price = getattr(order, "limit_price", None) or self.get_latest_price(order.symbol) or 0
+            total += max(0.0, float(order.qty or 0) - filled) * float(price)
+        return total
 
     def calculate_quantity(self, symbol, allocation_pct):
+        """Shares of `symbol` for `allocation_pct` of available cash; the cost stays reserved until submit_order."""
         try:
-            cash = self.get_cash()
-            alloc_cash = cash * allocation_pct
             price = self.get_latest_price(symbol)
             if not price or price == 0:
                 logging.warning(f"⚠️ Skipping quantity calc for {symbol}: invalid price {price}")
                 return 0
-            qty = int(alloc_cash // price)
-            return qty
+            while True:
+                # Account and open-order prices are fetched before taking the lock, so one
+                # thread's network calls never stall the others' sizing
+                snapshot = self.snapshot()
+                committed = self._open_buy_cash(snapshot["open_orders"])
+                with self._sizing_lock:
+                    # submit_order drops the snapshot before releasing its reservation: a changed
+                    # snapshot may be missing an order whose reservation is already gone
+                    if self._snapshot is not snapshot:
+                        continue
+                    self._reserved.pop(symbol, None)  # re-sizing replaces this symbol's earlier reservation
+                    cash = float(snapshot["account"].cash) - committed - sum(self._reserved.values())
+                    alloc_cash = max(0.0, cash) * allocation_pct
+                    qty = int(alloc_cash // price)
+                    if qty > 0:
+                        self._reserved[symbol] = qty * price
+                return qty
         except Exception as e:
             logging.error(f"❌ Error calculating quantity for {symbol}: {e}")
             return 0
 
+    def _release_reservation(self, symbol):
+        with self._sizing_lock:
+            self._reserved.pop(symbol, None)
+
     def submit_order(self, symbol, qty, side, take_profit=None, stop_loss=None, reason=None):
         try:
             order_data = {
@@ -95,7 +202,12 @@ class AlpacaBroker:
                 if stop_loss:
                     order_data["stop_loss"] = {"stop_price": round(stop_loss, 2)}
 
-            order = self.api.submit_order(**order_data)
+            try:
+                order = self.api.submit_order(**order_data)
+            finally:
+                # The next snapshot carries the order (open or filled) in place of the reservation
+                self.invalidate_snapshot()
+                self._release_reservation(symbol)
 
             # Send Telegram alert
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -114,14 +226,14 @@ class AlpacaBroker:
             if take_profit:
                 message += f"🎯 *Take-Profit:* `${take_profit:.2f}`\n"
 
-            send_telegram_alert(message)
+            send_telegram_alert(message, suppress=False)  # every fill is reported
 
             logging.info(f"✅ Order submitted: {symbol} | {side.upper()} | Qty: {qty} | TP: {take_profit} | SL: {stop_loss}")
             return order
 
         except Exception as e:
             logging.error(f"❌ Error submitting order for {symbol}: {e}")
-            send_telegram_alert(f"❌ *Order failed for {symbol}*: `{e}`")
+            send_telegram_alert(f"❌ *Order failed for {symbol}*: `{e}`", suppress=False)
             return None
 
     def cancel_all_orders(self):
@@ -130,3 +242,5 @@ class AlpacaBroker:
             logging.info("🔁 All open orders cancelled.")
         except Exception as e:
             logging.error(f"❌ Error cancelling all orders: {e}")
+        finally:
+            self.invalidate_snapshot()
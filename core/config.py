@@ -16,6 +16,15 @@ if USE_PAPER:
 else:
     ALPACA_BASE_URL = "https://api.alpaca.markets"
 
+# === Max symbols processed concurrently per trade cycle (1 = sequential) ===
+MAX_CONCURRENT_SYMBOLS = int(os.getenv("MAX_CONCURRENT_SYMBOLS", "8"))
+
+# === Seconds broker account/positions/orders snapshots are served from memory ===
+BROKER_SNAPSHOT_TTL = float(os.getenv("BROKER_SNAPSHOT_TTL", "5"))
+
+# === Worker processes for nightly parameter tuning (defaults to one per core) ===
+TUNE_WORKERS = int(os.getenv("TUNE_WORKERS", str(os.cpu_count() or 1)))
+
 # === JSON Parameters File ===
 PARAMS_FILE = "ensemble_tuned_params.json"
 
@@ -45,10 +54,13 @@ def get_initial_cash(symbol):
     cfg = get_symbol_config(symbol)
     return cfg.get("initial_cash", 17500.0)
 
+# === Bar interval used when a symbol sets no interval_minutes: one full session, i.e. daily bars ===
+DEFAULT_INTERVAL_MINUTES = int(os.getenv("DEFAULT_INTERVAL_MINUTES", "390"))
+
 # === Get trading interval (in minutes) for a symbol ===
 def get_interval_minutes(symbol):
     cfg = get_symbol_config(symbol)
-    return cfg.get("interval_minutes", 1)
+    return cfg.get("interval_minutes", DEFAULT_INTERVAL_MINUTES)
 
 # === Return API key bundle for AlpacaBroker ===
 def get_api_keys(config=None):
@@ -1,19 +1,40 @@
+import time
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
 
-def get_price_data(symbol: str, start_date: str = "2023-01-01", end_date: str = None) -> pd.DataFrame:
+from core.bar_store import BarStore
+
+# === Shared Bar Store ===
+bar_store = BarStore()
+
+# Minimum seconds between network refresh attempts for the same symbol and
+# end date; a new end date (a newly closed bar) may be fetched straight away
+REFRESH_INTERVAL_SECONDS = 15 * 60
+_last_refresh = {}
+
+# Relative change in a re-fetched, already settled bar's close beyond which the
+# stored history is stale: yFinance re-adjusted it for a split or dividend
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# Every caller shares the stored bars, so the price basis is pinned rather than
+# left to the yfinance default: split- and dividend-adjusted OHLC (which is what
+# the adjustment check above detects). backtest/walk_forward.py downloaded
+# unadjusted bars before it read through the store.
+YF_AUTO_ADJUST = True
+
+
+def download_price_data(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
     """
-    Fetches daily historical price data for a symbol using yFinance.
+    Downloads daily historical price data for a symbol using yFinance.
     Falls back to flat columns: open, high, low, close, volume
     """
     try:
         logging.info(f"📥 Trying yFinance for {symbol}...")
-        if not end_date:
-            end_date = datetime.utcnow().strftime("%Y-%m-%d")
-
-        df = yf.download(symbol, start=start_date, end=end_date, interval="1d", progress=False)
+        df = yf.download(symbol, start=start_date, end=end_date, interval="1d",
+                         auto_adjust=YF_AUTO_ADJUST, progress=False)
 
         # If tuple was returned accidentally (older yfinance bug workaround)
         if isinstance(df, tuple):
@@ -35,3 +56,187 @@ def get_price_data(symbol: str, start_date: str = "2023-01-01", end_date: str =
     except Exception as e:
         logging.warning(f"❌ Failed to get data from yFinance for {symbol}: {e}")
         return pd.DataFrame()
+
+
+def download_price_data_batch(symbols: list, start_date: str, end_date: str) -> dict:
+    """
+    Downloads daily bars for several symbols in one grouped yFinance request.
+    Returns {symbol: DataFrame} with the same flat lowercase columns as
+    download_price_data; symbols with no data are omitted.
+    """
+    if len(symbols) == 1:
+        df = download_price_data(symbols[0], start_date, end_date)
+        return {symbols[0]: df} if not df.empty else {}
+
+    try:
+        logging.info(f"📥 Trying yFinance batch for {len(symbols)} symbols...")
+        raw = yf.download(symbols, start=start_date, end=end_date, interval="1d",
+                          auto_adjust=YF_AUTO_ADJUST, group_by="ticker", progress=False)
+        if isinstance(raw, tuple):
+            raw = raw[0]
+        if raw.empty:
+            raise ValueError("yFinance returned empty data")
+    except Exception as e:
+        logging.warning(f"❌ Failed batch download from yFinance: {e}")
+        return {}
+
+    results = {}
+    tickers = raw.columns.get_level_values(0)
+    for symbol in symbols:
+        if symbol not in tickers:
+            continue
+        df = raw[symbol].dropna(how="all")
+        if df.empty:
+            continue
+        df = df.rename(columns={c: c.lower() for c in df.columns})
+        df.index = pd.to_datetime(df.index)
+        results[symbol] = df[['open', 'high', 'low', 'close', 'volume']]
+    logging.info(f"✅ yFinance batch returned data for {len(results)}/{len(symbols)} symbols")
+    return results
+
+
+def _missing_ranges(symbol: str, start_date: str, end_date: str, store: BarStore) -> list:
+    """
+    Date ranges that still have to be fetched: everything when the partition
+    is empty, otherwise only the bars from the last stored timestamp (the
+    watermark) on, plus any history before the first stored bar. The delta
+    starts one stored bar before the watermark: the watermark bar may have
+    been stored before its close settled and is simply overwritten, while the
+    settled bar before it is what _history_adjusted compares.
+    """
+    first = store.first_timestamp(symbol)
+    last = store.last_timestamp(symbol)
+    if last is None:
+        return [(start_date, end_date)]
+
+    ranges = []
+    if first > pd.Timestamp(start_date) + pd.Timedelta(days=7):
+        ranges.append((start_date, first.strftime("%Y-%m-%d")))
+
+    # yFinance treats `end` as exclusive, so the newest complete bar is the prior business day
+    latest_expected = pd.Timestamp(end_date).normalize() - pd.offsets.BDay(1)
+    if last < latest_expected:
+        recent = store.read(symbol, last - pd.Timedelta(days=14), last)
+        delta_start = recent.index[-1] if len(recent) else last
+        ranges.append((delta_start.strftime("%Y-%m-%d"), end_date))
+    return ranges
+
+
+def _history_adjusted(symbol: str, delta: pd.DataFrame, store: BarStore) -> bool:
+    """
+    True if a bar in `delta` older than the watermark no longer matches the
+    stored close. The watermark bar itself is left out: a close stored right
+    after the session may still have been preliminary, and the merge simply
+    overwrites it.
+    """
+    last = store.last_timestamp(symbol)
+    if last is None or delta.empty:
+        return False
+    index = pd.DatetimeIndex(delta.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    settled = index < last
+    if not settled.any():
+        return False
+    fetched = pd.Series(delta["close"].to_numpy()[settled], index=index[settled])
+    stored = store.read(symbol, fetched.index[0], last)["close"]
+    fetched, stored = fetched.align(stored, join="inner")
+    return not np.allclose(fetched.to_numpy(), stored.to_numpy(), rtol=ADJUSTMENT_TOLERANCE, atol=0)
+
+
+def _refetch_history(symbol: str, start_date: str, end_date: str, store: BarStore):
+    """Replace the symbol's partition with a fresh download, so every stored bar carries the new adjustment."""
+    first = store.first_timestamp(symbol)
+    fetch_start = min(pd.Timestamp(start_date), first).strftime("%Y-%m-%d") if first is not None else start_date
+    logging.warning(f"♻️ {symbol} history was re-adjusted upstream; refetching {fetch_start} → {end_date}")
+    history = download_price_data(symbol, fetch_start, end_date)
+    if not history.empty:
+        store.write(symbol, history, replace=True)
+
+
+def get_price_data(symbol: str, start_date: str = "2023-01-01", end_date: str = None,
+                   store: BarStore = None) -> pd.DataFrame:
+    """
+    Returns daily OHLCV bars for a symbol from the local bar store.
+
+    Only bars from just before the stored watermark on (or older than the
+    first stored bar) are requested from yFinance; they are merged into the
+    store with a dedupe on the index, so a steady-state call transfers a
+    handful of rows and the watermark bar is refreshed with its settled
+    close. If an older re-fetched bar differs from the stored one, the whole
+    symbol is refetched and rewritten.
+    """
+    store = store or bar_store
+    if not end_date:
+        end_date = datetime.utcnow().strftime("%Y-%m-%d")
+
+    ranges = _missing_ranges(symbol, start_date, end_date, store)
+
+    # Holidays and young listings never "catch up"; don't hammer the network over it
+    last_attempt = _last_refresh.get((symbol, end_date))
+    throttled = last_attempt is not None and time.time() - last_attempt < REFRESH_INTERVAL_SECONDS
+
+    if ranges and not throttled:
+        _last_refresh[(symbol, end_date)] = time.time()
+        for fetch_start, fetch_end in ranges:
+            delta = download_price_data(symbol, fetch_start, fetch_end)
+            if _history_adjusted(symbol, delta, store):
+                _refetch_history(symbol, start_date, end_date, store)
+                break
+            if not delta.empty:
+                logging.info(f"🔁 Merging {len(delta)} new bars for {symbol} ({fetch_start} → {fetch_end})")
+                store.write(symbol, delta)
+
+    df = store.read(symbol, start_date, end_date)
+    if df.empty:
+        logging.warning(f"❌ No stored bars available for {symbol}")
+    return df
+
+
+def get_price_data_batch(symbols: list, start_date: str = "2023-01-01", end_date: str = None,
+                         store: BarStore = None) -> dict:
+    """
+    Batched get_price_data for a whole universe.
+
+    Symbols needing the same date range are fetched together in one grouped
+    yFinance request, so a steady-state cycle costs one round trip rather
+    than one per symbol. Symbols whose settled bars changed upstream are
+    refetched one by one, as in get_price_data. Returns {symbol: DataFrame}
+    read from the store.
+    """
+    store = store or bar_store
+    if not end_date:
+        end_date = datetime.utcnow().strftime("%Y-%m-%d")
+
+    now = time.time()
+    groups = {}
+    for symbol in symbols:
+        last_attempt = _last_refresh.get((symbol, end_date))
+        if last_attempt is not None and now - last_attempt < REFRESH_INTERVAL_SECONDS:
+            continue
+        for date_range in _missing_ranges(symbol, start_date, end_date, store):
+            groups.setdefault(date_range, []).append(symbol)
+
+    adjusted = set()
+    for (fetch_start, fetch_end), group in groups.items():
+        for symbol in group:
+            _last_refresh[(symbol, end_date)] = now
+        for symbol, delta in download_price_data_batch(group, fetch_start, fetch_end).items():
+            if symbol in adjusted:
+                continue
+            if _history_adjusted(symbol, delta, store):
+                adjusted.add(symbol)
+                continue
+            logging.info(f"🔁 Merging {len(delta)} new bars for {symbol} ({fetch_start} → {fetch_end})")
+            store.write(symbol, delta)
+
+    for symbol in adjusted:
+        _refetch_history(symbol, start_date, end_date, store)
+
+    results = {}
+    for symbol in symbols:
+        df = store.read(symbol, start_date, end_date)
+        if df.empty:
+            logging.warning(f"❌ No stored bars available for {symbol}")
+        results[symbol] = df
+    return results
@@ -0,0 +1,155 @@
+# core/http_client.py
+
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from core import rate_limiter
+
+try:
+    from monitoring.prometheus_metrics import http_request_duration_seconds, http_retries_total
+except ImportError:  # prometheus_client is optional for scripts; latency is then not exported
+    http_request_duration_seconds = http_retries_total = None
+
+# === Transport Settings ===
+# One keep-alive Session per host, shared by every caller in the process, so
+# repeated Alpaca/Telegram calls reuse open TLS connections.
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))            # read timeout, seconds
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))  # seconds; doubles per retry
+HTTP_BACKOFF_MAX = 30.0
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url):
+    """The shared pooled Session for the URL's scheme and host."""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            # Retries are handled in request() so they can be jittered and measured
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+            session.mount(f"{parts.scheme}://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def backoff_delay(attempt, response=None):
+    """Full-jitter exponential backoff; a 429/503 Retry-After header (in seconds) takes precedence."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+def _never_sent(error):
+    """True when the connection itself failed, so the server cannot have seen the request."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _observe(host, endpoint, method, status, elapsed):
+    if http_request_duration_seconds is not None:
+        http_request_duration_seconds.labels(host=host, endpoint=endpoint, method=method, status=status).observe(elapsed)
+
+
+def request(method, url, endpoint=None, timeout=None, retries=None, idempotent=None, priority=None, **kwargs):
+    """
+    requests.request through the shared per-host pool, with a timeout on every
+    call and bounded, jittered retries.
+
+    A 429 and a failed connect are always retried (the server never processed
+    the request). 5xx responses, read timeouts and dropped connections are
+    only retried for idempotent methods unless `idempotent=True` is passed,
+    so an order POST or a Telegram message is never sent twice.
+    Alpaca URLs take a token from core/rate_limiter before every attempt;
+    order and cancel requests go ahead of queued reads.
+
+    Args:
+        endpoint: label for the latency histogram; pass a template such as
+            "stocks/{symbol}/bars" when the path holds symbols, IDs or tokens
+            (the default label is the raw path)
+        timeout: seconds or a (connect, read) tuple; defaults to HTTP_TIMEOUT
+        priority: rate_limiter.PRIORITY_ORDER / PRIORITY_READ; inferred from
+            the method and path by default
+
+    Returns:
+        the last requests.Response (callers check the status as before);
+        connection errors are raised once retries are exhausted
+    """
+    method = method.upper()
+    parts = urlsplit(url)
+    endpoint = endpoint or parts.path
+    timeout = timeout if timeout is not None else (HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT)
+    retries = HTTP_MAX_RETRIES if retries is None else retries
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    session = get_session(url)
+    bucket = rate_limiter.bucket_for_url(url)
+    if priority is None:
+        priority = rate_limiter.priority_for_request(method, url)
+
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            rate_limiter.acquire(bucket, priority)
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            _observe(parts.netloc, endpoint, method, "error", time.perf_counter() - start)
+            if not (idempotent or _never_sent(e)) or attempt == retries:
+                raise
+            response, reason = None, type(e).__name__
+        else:
+            _observe(parts.netloc, endpoint, method, str(response.status_code), time.perf_counter() - start)
+            status = response.status_code
+            retryable = status == 429 or (status in RETRY_STATUSES and idempotent)
+            if not retryable or attempt == retries:
+                return response
+            reason = status
+
+        delay = backoff_delay(attempt, response)
+        logging.warning(f"🔁 {method} {parts.netloc}{endpoint} failed ({reason}); retry {attempt + 1}/{retries} in {delay:.2f}s")
+        if http_retries_total is not None:
+            http_retries_total.labels(host=parts.netloc, endpoint=endpoint).inc()
+        time.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
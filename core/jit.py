@@ -0,0 +1,9 @@
+# core/jit.py
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; decorated functions run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
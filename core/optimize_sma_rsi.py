@@ -1,10 +1,10 @@
 import json
 import logging
-import optuna
 
 from core.config import SYMBOLS
 from indicators.sma_rsi import calculate_sma_rsi
 from tools.data import get_price_data
+from core.optuna_storage import create_study, optimize
 from monitoring.telegram_utils import send_telegram_message as send_telegram
 
 logger = logging.getLogger("optimize_sma_rsi")
@@ -52,8 +52,9 @@ def optimize_sma_rsi_for_symbol(symbol):
         return None
 
     try:
-        study = optuna.create_study(direction="maximize")
-        study.optimize(lambda trial: objective(trial, df), n_trials=50)
+        # Shared and resumable per (symbol, date) when OPTUNA_STORAGE is set
+        study = create_study("sma_rsi", symbol)
+        optimize(study, lambda trial: objective(trial, df), 50)
         best_params = study.best_params
         best_value = study.best_value
 
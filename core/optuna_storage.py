@@ -0,0 +1,108 @@
+# core/optuna_storage.py
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+import optuna
+
+# === Study Storage ===
+# Unset: in-memory studies (one process, lost on exit).
+# "sqlite:///data/optuna.db" (any RDB URL) or "journal:data/optuna.log": studies are
+# persisted, named per (kind, symbol, date), resumed when a run is restarted and
+# shared by every worker process pointing at the same storage.
+OPTUNA_STORAGE = os.getenv("OPTUNA_STORAGE")
+JOURNAL_PREFIX = "journal:"
+
+# A RUNNING trial older than this is taken to belong to a crashed or killed
+# worker (an ask/tell batch takes seconds to minutes) and is marked FAIL
+STALE_TRIAL_SECONDS = float(os.getenv("OPTUNA_STALE_TRIAL_SECONDS", "1800"))
+
+
+def get_storage(url=None):
+    url = url if url is not None else OPTUNA_STORAGE
+    if not url:
+        return None
+    if url.startswith(JOURNAL_PREFIX):
+        path = url[len(JOURNAL_PREFIX):]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        journal = optuna.storages.journal
+        # Open-file locks work on Windows too; symlink locks need extra privileges there
+        backend = journal.JournalFileBackend(path, lock_obj=journal.JournalFileOpenLock(path))
+        return journal.JournalStorage(backend)
+    if url.startswith("sqlite:///"):
+        os.makedirs(os.path.dirname(url[len("sqlite:///"):]) or ".", exist_ok=True)
+    return url
+
+
+def study_name(kind, symbol, date=None):
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    return f"{kind}-{symbol.upper()}-{date}"
+
+
+def create_study(kind, symbol, storage=None, date=None, direction="maximize", **kwargs):
+    """
+    optuna.create_study with an optional shared, named study.
+
+    With a storage configured the study is named "<kind>-<SYMBOL>-<date>" and
+    loaded if it already exists, so re-running the same day resumes it and
+    several processes can optimize it concurrently.
+    """
+    storage = get_storage(storage)
+    if storage is None:
+        return optuna.create_study(direction=direction, **kwargs)
+    return optuna.create_study(
+        study_name=study_name(kind, symbol, date),
+        storage=storage,
+        direction=direction,
+        load_if_exists=True,
+        **kwargs,
+    )
+
+
+FINISHED_STATES = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+
+
+def remaining_trials(study, n_trials, include_running=False):
+    """
+    Trials still needed for `study` to reach n_trials finished trials (for resumed runs).
+
+    With include_running, trials other workers have asked for but not yet
+    told count as spent too, so ask/tell workers sharing the study do not
+    overshoot the budget. Call fail_stale_trials first, or RUNNING trials
+    left by a crashed worker would count against it forever.
+    """
+    states = FINISHED_STATES + (optuna.trial.TrialState.RUNNING,) if include_running else FINISHED_STATES
+    return max(0, n_trials - len(study.get_trials(deepcopy=False, states=states)))
+
+
+def fail_stale_trials(study, max_age_seconds=None):
+    """Mark RUNNING trials started more than max_age_seconds ago FAIL; returns how many were failed."""
+    max_age_seconds = STALE_TRIAL_SECONDS if max_age_seconds is None else max_age_seconds
+    cutoff = datetime.now() - timedelta(seconds=max_age_seconds)
+    failed = 0
+    for trial in study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.RUNNING,)):
+        if trial.datetime_start is None or trial.datetime_start > cutoff:
+            continue
+        try:
+            study._storage.set_trial_state_values(trial._trial_id, state=optuna.trial.TrialState.FAIL)
+            failed += 1
+        except RuntimeError:  # finished meanwhile (UpdateFinishedTrialError), e.g. failed by another worker
+            continue
+    if failed:
+        logging.warning(f"⚠️ Marked {failed} stale RUNNING trial(s) of {study.study_name} as FAIL")
+    return failed
+
+
+def optimize(study, objective, n_trials, **kwargs):
+    """
+    Run `objective` until the study holds n_trials finished trials in total,
+    counting trials from earlier (interrupted) runs and from other workers.
+    """
+    remaining = remaining_trials(study, n_trials)
+    if remaining == 0:
+        return
+    callbacks = list(kwargs.pop("callbacks", [])) + [
+        optuna.study.MaxTrialsCallback(n_trials, states=FINISHED_STATES)
+    ]
+    study.optimize(objective, n_trials=remaining, callbacks=callbacks, **kwargs)
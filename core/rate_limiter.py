@@ -0,0 +1,157 @@
+# core/rate_limiter.py
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    from monitoring.prometheus_metrics import rate_limit_queue_depth, rate_limit_wait_seconds
+except ImportError:  # prometheus_client is optional for scripts; waits are then only counted in stats()
+    rate_limit_queue_depth = rate_limit_wait_seconds = None
+
+# === Request Budgets ===
+# Alpaca allows 200 requests/minute per API key on the trading and market-data
+# APIs. Every Alpaca call in this process (SDK clients and core/http_client)
+# draws from one of two buckets, so the live loop's symbol threads queue for a
+# token instead of tripping 429s. Lower these when several processes
+# (trading bot, rebalance, stop-fill monitor) share one key.
+ALPACA_TRADING_RATE = float(os.getenv("ALPACA_TRADING_RATE", "190"))  # requests per minute
+ALPACA_DATA_RATE = float(os.getenv("ALPACA_DATA_RATE", "190"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "10"))
+
+# === Priorities (lower is served first) ===
+PRIORITY_ORDER = 0  # submissions, cancels, closes
+PRIORITY_READ = 1   # account, positions, quotes, bars
+PRIORITY_NAMES = {PRIORITY_ORDER: "order", PRIORITY_READ: "read"}
+
+ORDER_METHODS = {
+    "submit_order", "replace_order", "cancel_order", "cancel_order_by_id",
+    "cancel_all_orders", "cancel_orders", "close_position", "close_all_positions",
+}
+DATA_METHOD_PREFIXES = ("get_latest_", "get_bars", "get_trades", "get_quotes", "get_snapshot", "get_stock_")
+
+
+class TokenBucket:
+    """
+    Blocking token bucket refilled at `rate_per_minute`, holding up to `burst` tokens.
+
+    Waiting callers are served by priority, then in arrival order, so an order
+    submitted while a backlog of reads is queued goes out with the next token.
+    `clock` (seconds, monotonic) is injectable for tests.
+    """
+
+    def __init__(self, name, rate_per_minute, burst=RATE_LIMIT_BURST, clock=time.monotonic):
+        if not rate_per_minute > 0:
+            raise ValueError(f"Rate for bucket '{name}' must be positive, got {rate_per_minute!r}")
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self._clock = clock
+        self.updated = clock()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _report_depth(self):
+        if rate_limit_queue_depth is not None:
+            rate_limit_queue_depth.labels(bucket=self.name).set(len(self._waiters))
+
+    def acquire(self, priority=PRIORITY_READ):
+        """Block until a token is available for this caller; returns the seconds waited."""
+        start = self._clock()
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            self._report_depth()
+            try:
+                while True:
+                    self._refill()
+                    if self._waiters[0] == ticket:
+                        if self.tokens >= 1:
+                            self.tokens -= 1
+                            break
+                        self._cond.wait((1 - self.tokens) / self.rate)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._report_depth()
+                self._cond.notify_all()
+
+            waited = self._clock() - start
+            self.acquired += 1
+            self.total_wait += waited
+        if rate_limit_wait_seconds is not None:
+            rate_limit_wait_seconds.labels(bucket=self.name, priority=PRIORITY_NAMES.get(priority, str(priority))).observe(waited)
+        return waited
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": len(self._waiters),
+                "acquired": self.acquired,
+                "mean_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            }
+
+
+BUCKETS = {
+    "trading": TokenBucket("trading", ALPACA_TRADING_RATE),
+    "data": TokenBucket("data", ALPACA_DATA_RATE),
+}
+
+
+def acquire(bucket, priority=PRIORITY_READ):
+    return BUCKETS[bucket].acquire(priority)
+
+
+def bucket_for_url(url):
+    """'data' for Alpaca market data, 'trading' for the other Alpaca APIs, None for anything else."""
+    host = urlsplit(url).hostname or ""
+    if not host.endswith("alpaca.markets"):
+        return None
+    return "data" if host.startswith("data.") else "trading"
+
+
+def priority_for_request(method, url):
+    path = urlsplit(url).path
+    if method.upper() in ("POST", "PATCH", "DELETE") and ("/orders" in path or "/positions" in path):
+        return PRIORITY_ORDER
+    return PRIORITY_READ
+
+
+class RateLimitedClient:
+    """
+    Proxy for an Alpaca SDK client (alpaca_trade_api.REST, TradingClient,
+    StockHistoricalDataClient) that takes a token before every API call.
+
+    Market-data methods draw from the "data" bucket, the rest from `bucket`;
+    order/cancel/close methods run at PRIORITY_ORDER.
+    """
+
+    def __init__(self, client, bucket="trading"):
+        self._client = client
+        self._bucket = bucket
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+        bucket = "data" if name.startswith(DATA_METHOD_PREFIXES) else self._bucket
+        priority = PRIORITY_ORDER if name in ORDER_METHODS else PRIORITY_READ
+
+        def call(*args, **kwargs):
+            acquire(bucket, priority)
+            return attr(*args, **kwargs)
+        return call
@@ -1,27 +1,79 @@
 import pandas as pd
 import numpy as np
 from indicators.strategy_base import StrategyFactory
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import StreamingEnsemble
 import indicators.registry  # ensure all strategies are registered
 
-def run_trade_cycle(symbol, price_data, ensemble_params):
-    df = price_data.copy()
-    df.columns = [col.lower() for col in df.columns]
+def ensemble_signal(symbol, price_data, ensemble_params):
+    """Blended signal for the last bar, recomputing every strategy over the full history."""
+    # Column names are matched case-insensitively; price_data itself is never copied
+    bars = BarArrays.from_frame(price_data)
 
     strategy_specs = ensemble_params.get(symbol.upper(), {}).get("strategies", [])
     if not strategy_specs:
         return None
 
-    blended_signal = np.zeros(len(df))
+    blended_signal = np.zeros(len(bars))
     for spec in strategy_specs:
         strategy_cls = StrategyFactory.get_class(spec["strategy"])
         if not strategy_cls:
             continue
-        strategy = strategy_cls(df.copy(), **spec["params"])
-        signal = strategy.generate_signals()
+        strategy = strategy_cls(bars, **spec["params"])
+        signal = strategy.signal_array()
 
-        weight_key = f"{spec['strategy'].split('_')[0].lower()}_weight"
         weight = spec.get("weight", 1.0)
         blended_signal += weight * signal
 
     final_signal = int(np.sign(blended_signal[-1]))
     return final_signal
+
+
+def run_trade_cycle(symbol, broker, signal, allocation_pct=0.25, sl_multiplier=2.0, tp_multiplier=3.0):
+    """
+    Act on `signal`, the blended ensemble signal (-1, 0 or 1) for the last
+    closed bar, for a long-only book: buy on 1 when flat, close on -1 when
+    long. Returns "buy", "sell" or "hold".
+
+    As in backtest.kernels.simulate_long_only, the SL/TP multipliers are
+    percentages of the entry price; they go out as the order's bracket legs.
+    """
+    position = broker.get_position(symbol)
+    if signal > 0 and position <= 0:
+        qty = broker.calculate_quantity(symbol, allocation_pct)
+        entry = broker.get_latest_price(symbol)
+        if qty <= 0 or not entry:
+            return "hold"
+        order = broker.submit_order(
+            symbol, qty, "buy",
+            take_profit=entry * (1 + tp_multiplier / 100),
+            stop_loss=entry * (1 - sl_multiplier / 100),
+            reason=f"ensemble signal {signal:+d}",
+        )
+        return "buy" if order is not None else "hold"
+    if signal < 0 and position > 0:
+        order = broker.close_position(symbol)
+        return "sell" if order is not None else "hold"
+    return "hold"
+
+
+def run_streaming_cycle(symbol, price_data, cfg, broker, streams):
+    """
+    One live cycle for `symbol`: advance its StreamingEnsemble in `streams`
+    (symbol -> stream, kept across cycles) with the bars of `price_data` it has
+    not seen, then trade on the streamed signal. Retuned strategy specs start
+    a fresh stream. Returns the run_trade_cycle decision.
+    """
+    specs = cfg.get("strategies", [])
+    stream = streams.get(symbol)
+    if stream is None or stream.specs != specs:
+        stream = streams[symbol] = StreamingEnsemble(specs)
+    signal = stream.sync(price_data)
+    return run_trade_cycle(
+        symbol,
+        broker,
+        signal,
+        allocation_pct=cfg.get("meta", {}).get("allocation_pct", 0.25),
+        sl_multiplier=cfg.get("sl_multiplier", 2.0),
+        tp_multiplier=cfg.get("tp_multiplier", 3.0),
+    )
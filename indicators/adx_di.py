@@ -1,49 +1,84 @@
 # indicators/adx_di.py
 
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import RollingWindow, true_range
+from indicators import primitives
 import pandas as pd
 import numpy as np
 
 
 class ADXDIStrategy(StrategyBase):
     def __init__(self, df, di_adx_period=14, di_adx_threshold=20):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.period = di_adx_period
         self.threshold = di_adx_threshold
         self.name = "adx_di"
 
-    def generate_signals(self):
-        df = self.df.copy()
+    def _directional_movement(self):
+        high = self.bars.series("high")
+        low = self.bars.series("low")
+        up_move = high.diff()
+        down_move = low.diff() * -1
+        plus_dm = pd.Series(np.where((up_move > down_move) & (up_move > 0), up_move, 0), index=high.index)
+        minus_dm = pd.Series(np.where((down_move > plus_dm) & (down_move > 0), down_move, 0), index=high.index)
+        return plus_dm, minus_dm
 
-        df["plus_dm"] = df["high"].diff()
-        df["minus_dm"] = df["low"].diff() * -1
+    def _di_lines(self, plus_dm, minus_dm):
+        bars = self.bars
+        atr = primitives.atr(bars.series("high"), bars.series("low"), bars.series("close"), self.period)
+        plus_di = 100 * plus_dm.rolling(self.period).mean() / atr
+        minus_di = 100 * minus_dm.rolling(self.period).mean() / atr
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
+        return plus_di, minus_di, dx
 
-        df["plus_dm"] = np.where(
-            (df["plus_dm"] > df["minus_dm"]) & (df["plus_dm"] > 0),
-            df["plus_dm"], 0
-        )
-        df["minus_dm"] = np.where(
-            (df["minus_dm"] > df["plus_dm"]) & (df["minus_dm"] > 0),
-            df["minus_dm"], 0
+    def signal_array(self):
+        plus_di, minus_di, dx = self._di_lines(*self._directional_movement())
+        adx = dx.rolling(self.period).mean()
+        return signal_from_conditions(
+            (plus_di > minus_di) & (adx > self.threshold),
+            (minus_di > plus_di) & (adx > self.threshold),
         )
 
-        tr1 = df["high"] - df["low"]
-        tr2 = abs(df["high"] - df["close"].shift())
-        tr3 = abs(df["low"] - df["close"].shift())
-        df["tr"] = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    def bootstrap(self):
+        bars = self.bars
+        plus_dm, minus_dm = self._directional_movement()
+        _, _, dx = self._di_lines(plus_dm, minus_dm)
+        tr = primitives.true_range(bars.series("high"), bars.series("low"), bars.series("close"))
 
-        atr = df["tr"].rolling(self.period).mean()
-        plus_di = 100 * df["plus_dm"].rolling(self.period).mean() / atr
-        minus_di = 100 * df["minus_dm"].rolling(self.period).mean() / atr
+        self._plus_dm = RollingWindow(self.period, plus_dm)
+        self._minus_dm = RollingWindow(self.period, minus_dm)
+        self._tr = RollingWindow(self.period, tr)
+        self._dx = RollingWindow(self.period, dx)
+        self._last_high, self._last_low, self._last_close = (
+            float(bars.high[-1]), float(bars.low[-1]), float(bars.close[-1])
+        )
+        return int(self.signal_array()[-1])
 
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
-        adx = dx.rolling(self.period).mean()
+    def update(self, bar):
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        up_move = high - self._last_high
+        down_move = (low - self._last_low) * -1
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > plus_dm and down_move > 0) else 0.0
+
+        self._plus_dm.append(plus_dm)
+        self._minus_dm.append(minus_dm)
+        self._tr.append(true_range(high, low, self._last_close))
+        self._last_high, self._last_low, self._last_close = high, low, close
 
-        df["signal"] = 0
-        df.loc[(plus_di > minus_di) & (adx > self.threshold), "signal"] = 1
-        df.loc[(minus_di > plus_di) & (adx > self.threshold), "signal"] = -1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            atr = self._tr.mean()
+            plus_di = 100 * self._plus_dm.mean() / atr
+            minus_di = 100 * self._minus_dm.mean() / atr
+            self._dx.append(100 * abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10))
+            adx = self._dx.mean()
 
-        return df["signal"]
+        if minus_di > plus_di and adx > self.threshold:
+            return -1
+        if plus_di > minus_di and adx > self.threshold:
+            return 1
+        return 0
 
 
 # Register strategy
@@ -1,18 +1,12 @@
-import pandas as pd
+from indicators import primitives
 
 def apply_atr_stop(df, period=14, multiplier=1.5):
     """
     Add ATR-based stop-loss bands to the DataFrame.
     """
 
-    # Calculate True Range
-    hl = df['high'] - df['low']
-    hc = (df['high'] - df['close'].shift(1)).abs()
-    lc = (df['low'] - df['close'].shift(1)).abs()
-    tr = pd.concat([hl, hc, lc], axis=1).max(axis=1)
-
-    # Calculate ATR
-    atr = tr.rolling(window=period, min_periods=1).mean()
+    # Calculate ATR over the shared True Range primitive
+    atr = primitives.atr(df['high'], df['low'], df['close'], period, min_periods=1)
     df['atr'] = atr
 
     # Force close and atr to be Series (not accidentally DataFrames)
@@ -0,0 +1,86 @@
+# indicators/bar_arrays.py
+
+import hashlib
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _read_only(values):
+    # A fresh view: flagging it read-only leaves the caller's frame writable
+    array = np.ascontiguousarray(values, dtype=np.float64).view()
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class BarArrays:
+    """
+    Read-only float64 OHLCV arrays shared by every strategy evaluated on a frame.
+
+    Built once per frame with from_frame(); the arrays are views of the frame's
+    columns whenever they are already contiguous float64, so passing bars to
+    many strategies neither copies nor risks mutating the caller's data.
+    """
+    index: pd.Index
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    open: Optional[np.ndarray] = None
+    volume: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Wrap an OHLCV frame (column names in any case); BarArrays pass through."""
+        if isinstance(df, cls):
+            return df
+        columns = {str(col).lower(): col for col in df.columns}
+        arrays = {
+            field: _read_only(df[columns[field]].to_numpy(dtype=np.float64))
+            for field in FIELDS
+            if field in columns
+        }
+        return cls(index=df.index, **arrays)
+
+    def __len__(self):
+        return len(self.index)
+
+    @cached_property
+    def fingerprint(self):
+        """Content digest of the index and OHLC values, computed once per instance."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(pd.util.hash_pandas_object(self.index, index=False).to_numpy().tobytes())
+        for field in ("open", "high", "low", "close"):
+            values = getattr(self, field)
+            if values is not None:
+                digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def window(self, start, stop):
+        """Bars [start, stop) as views of these arrays (no copy)."""
+        return replace(self, index=self.index[start:stop], **{
+            field: getattr(self, field)[start:stop]
+            for field in FIELDS
+            if getattr(self, field) is not None
+        })
+
+    @cached_property
+    def _series(self):
+        return {}
+
+    def series(self, field):
+        """
+        Zero-copy Series view of one field, for pandas rolling/ewm primitives.
+        The same Series object is returned on every call, so the primitives'
+        memo hashes each field once per dataset.
+        """
+        series = self._series.get(field)
+        if series is None:
+            series = self._series.setdefault(
+                field, pd.Series(getattr(self, field), index=self.index, name=field, copy=False))
+        return series
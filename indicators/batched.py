@@ -0,0 +1,142 @@
+# indicators/batched.py
+
+import numpy as np
+
+from core.jit import njit
+
+# === Parameter-batched kernels ===
+# Each function takes one input series and a vector of periods and returns a
+# (len(periods) x bars) float64 array, with row r matching the corresponding
+# primitive (indicators/primitives.py) for periods[r]. The work shared by every
+# period (cumulative sums, the min/max sparse table) is done once, so a sweep
+# over many periods costs about one pass over the data plus one vector
+# operation per period. Rolling sums come from prefix-sum differences, so
+# rolling means/std agree with pandas to float rounding rather than bit for
+# bit; EMA and rolling min/max are exact.
+
+
+def _periods(periods):
+    return np.asarray(periods, dtype=np.int64).ravel()
+
+
+def rolling_sum_batch(values, windows):
+    """Rolling sums for every window from one cumulative sum; NaN until the window is full or while it holds a NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    windows = _periods(windows)
+    n = len(values)
+    missing = np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    cmissing = np.concatenate(([0], np.cumsum(missing)))
+
+    out = np.full((len(windows), n), np.nan)
+    for row, window in enumerate(windows):
+        if window > n:
+            continue
+        sums = csum[window:] - csum[:-window]
+        sums[cmissing[window:] - cmissing[:-window] > 0] = np.nan
+        out[row, window - 1:] = sums
+    return out
+
+
+def rolling_mean_batch(values, windows):
+    windows = _periods(windows)
+    return rolling_sum_batch(values, windows) / windows[:, None]
+
+
+def rolling_mean_std_batch(values, windows):
+    """(mean, sample std) for every window, from the cumulative sums of x and x**2."""
+    values = np.asarray(values, dtype=np.float64)
+    windows = _periods(windows)
+    # Centre first: keeps sum(x**2) - sum(x)**2 / w from cancelling on price levels
+    centred = values - np.nanmean(values) if len(values) else values
+    sums = rolling_sum_batch(centred, windows)
+    sq_sums = rolling_sum_batch(centred * centred, windows)
+
+    w = windows[:, None].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.maximum(sq_sums - sums * sums / w, 0.0) / (w - 1)
+    var[windows < 2] = np.nan
+    mean = rolling_mean_batch(values, windows)
+    return mean, np.sqrt(var)
+
+
+def _sparse_table(values, max_window, reduce):
+    # table[j][i] = reduce(values[i : i + 2**j]); only as many levels as max_window needs
+    table = [values]
+    span = 1
+    while span * 2 <= max_window:
+        prev = table[-1]
+        table.append(reduce(prev[:-span], prev[span:]))
+        span *= 2
+    return table
+
+
+def _rolling_extreme_batch(values, windows, reduce):
+    values = np.asarray(values, dtype=np.float64)
+    windows = _periods(windows)
+    n = len(values)
+    out = np.full((len(windows), n), np.nan)
+    if not len(windows) or not n:
+        return out
+
+    table = _sparse_table(values, min(int(windows.max()), n), reduce)
+    for row, window in enumerate(windows):
+        if window > n:
+            continue
+        level = int(window).bit_length() - 1
+        span = 1 << level
+        # Two overlapping power-of-two blocks cover [i - window + 1, i]
+        out[row, window - 1:] = reduce(table[level][:n - window + 1], table[level][window - span:n - span + 1])
+    return out
+
+
+def rolling_min_batch(values, windows):
+    return _rolling_extreme_batch(values, windows, np.minimum)
+
+
+def rolling_max_batch(values, windows):
+    return _rolling_extreme_batch(values, windows, np.maximum)
+
+
+@njit(cache=True)
+def _ewm_rows(values, alphas):
+    # pandas ewm(adjust=False) recurrence, step for step, so results match bit for bit
+    k_rows, n = values.shape
+    out = np.empty((k_rows, n))
+    if n == 0:
+        return out
+    old_wt = 1.0 - alphas
+    norm = old_wt + alphas
+    weighted = values[:, 0].copy()
+    out[:, 0] = weighted
+    for i in range(1, n):
+        cur = values[:, i]
+        weighted = np.where(weighted != cur, (old_wt * weighted + alphas * cur) / norm, weighted)
+        out[:, i] = weighted
+    return out
+
+
+def ema_batch(values, spans):
+    """
+    EMA (ewm(span, adjust=False)) for every span.
+
+    `values` is one NaN-free series shared by all spans, or a (len(spans) x bars)
+    array with one input row per span (e.g. MACD lines into their signal EMAs).
+    """
+    spans = _periods(spans)
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = np.broadcast_to(values, (len(spans), len(values)))
+    alphas = 1.0 / (1.0 + (spans - 1) / 2.0)
+    return _ewm_rows(np.ascontiguousarray(values), alphas)
+
+
+def rsi_batch(close, periods):
+    """Simple-average RSI for every period, sharing the gain/loss cumulative sums."""
+    close = np.asarray(close, dtype=np.float64)
+    delta = np.diff(close, prepend=np.nan)
+    # As in primitives.rsi, the first bar's missing delta counts as a zero gain/loss
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    rs = rolling_mean_batch(gain, periods) / (rolling_mean_batch(loss, periods) + 1e-10)
+    return 100 - (100 / (1 + rs))
@@ -1,29 +1,56 @@
 # indicators/bollinger.py
 
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import RollingWindow
+from indicators import primitives, batched
 import pandas as pd
 
 
 class BollingerStrategy(StrategyBase):
     def __init__(self, df, bollinger_window=20, bollinger_num_std=2.0):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.window = bollinger_window
         self.num_std = bollinger_num_std
         self.name = "bollinger"
 
-    def generate_signals(self):
-        df = self.df.copy()
-        df["ma"] = df["close"].rolling(window=self.window).mean()
-        df["std"] = df["close"].rolling(window=self.window).std()
+    def signal_array(self):
+        close = self.bars.series("close")
+        ma = primitives.sma(close, self.window)
+        std = primitives.rolling_std(close, self.window)
 
-        df["upper_band"] = df["ma"] + self.num_std * df["std"]
-        df["lower_band"] = df["ma"] - self.num_std * df["std"]
+        upper_band = ma + self.num_std * std
+        lower_band = ma - self.num_std * std
 
-        df["signal"] = 0
-        df.loc[df["close"] < df["lower_band"], "signal"] = 1
-        df.loc[df["close"] > df["upper_band"], "signal"] = -1
+        return signal_from_conditions(close < lower_band, close > upper_band)
 
-        return df["signal"]
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        windows = sorted({s.window for s in strategies})
+        means, stds = batched.rolling_mean_std_batch(bars.close, windows)
+        bands = {window: (means[row], stds[row]) for row, window in enumerate(windows)}
+        signals = []
+        for s in strategies:
+            ma, std = bands[s.window]
+            signals.append(signal_from_conditions(
+                bars.close < ma - s.num_std * std, bars.close > ma + s.num_std * std,
+            ))
+        return signals
+
+    def bootstrap(self):
+        self._closes = RollingWindow(self.window, self.bars.close)
+        return int(self.signal_array()[-1])
+
+    def update(self, bar):
+        close = float(bar["close"])
+        self._closes.append(close)
+        ma = self._closes.mean()
+        std = self._closes.std()
+        if close > ma + self.num_std * std:
+            return -1
+        if close < ma - self.num_std * std:
+            return 1
+        return 0
 
 
 # Register strategy
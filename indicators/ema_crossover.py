@@ -1,26 +1,46 @@
 # indicators/ema_crossover.py
 
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import EMAState
+from indicators import primitives, batched
 import pandas as pd
 
 
 class EMACrossoverStrategy(StrategyBase):
     def __init__(self, df, ema_crossover_fast_period=10, ema_crossover_slow_period=50):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.fast = ema_crossover_fast_period
         self.slow = ema_crossover_slow_period
         self.name = "ema_crossover"
 
-    def generate_signals(self):
-        df = self.df.copy()
-        df["ema_fast"] = df["close"].ewm(span=self.fast, adjust=False).mean()
-        df["ema_slow"] = df["close"].ewm(span=self.slow, adjust=False).mean()
+    def signal_array(self):
+        close = self.bars.series("close")
+        ema_fast = primitives.ema(close, self.fast)
+        ema_slow = primitives.ema(close, self.slow)
+        return signal_from_conditions(ema_fast > ema_slow, ema_fast < ema_slow)
 
-        df["signal"] = 0
-        df.loc[df["ema_fast"] > df["ema_slow"], "signal"] = 1
-        df.loc[df["ema_fast"] < df["ema_slow"], "signal"] = -1
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        spans = sorted({s.fast for s in strategies} | {s.slow for s in strategies})
+        ema = dict(zip(spans, batched.ema_batch(bars.close, spans)))
+        return [signal_from_conditions(ema[s.fast] > ema[s.slow], ema[s.fast] < ema[s.slow]) for s in strategies]
 
-        return df["signal"]
+    def bootstrap(self):
+        close = self.bars.series("close")
+        self._ema_fast = EMAState(self.fast, primitives.ema(close, self.fast).iloc[-1])
+        self._ema_slow = EMAState(self.slow, primitives.ema(close, self.slow).iloc[-1])
+        return int(self.signal_array()[-1])
+
+    def update(self, bar):
+        close = float(bar["close"])
+        ema_fast = self._ema_fast.update(close)
+        ema_slow = self._ema_slow.update(close)
+        if ema_fast < ema_slow:
+            return -1
+        if ema_fast > ema_slow:
+            return 1
+        return 0
 
 
 # Register strategy
@@ -1,30 +1,61 @@
 # indicators/macd.py
 
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import EMAState
+from indicators import primitives, batched
+import numpy as np
 import pandas as pd
 
 
 class MACDStrategy(StrategyBase):
     def __init__(self, df, macd_fast_period=12, macd_slow_period=26, macd_signal_period=9):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.fast = macd_fast_period
         self.slow = macd_slow_period
         self.signal = macd_signal_period
         self.name = "macd"
 
-    def generate_signals(self):
-        df = self.df.copy()
+    def signal_array(self):
+        close = self.bars.series("close")
+        macd = primitives.ema(close, self.fast) - primitives.ema(close, self.slow)
+        macd_signal = primitives.ema(macd, self.signal)
+        return signal_from_conditions(macd > macd_signal, macd < macd_signal)
 
-        df["ema_fast"] = df["close"].ewm(span=self.fast, adjust=False).mean()
-        df["ema_slow"] = df["close"].ewm(span=self.slow, adjust=False).mean()
-        df["macd"] = df["ema_fast"] - df["ema_slow"]
-        df["macd_signal"] = df["macd"].ewm(span=self.signal, adjust=False).mean()
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        spans = sorted({s.fast for s in strategies} | {s.slow for s in strategies})
+        ema = dict(zip(spans, batched.ema_batch(bars.close, spans)))
+        # One signal EMA per distinct (fast, slow, signal), all in a single pass
+        lines = sorted({(s.fast, s.slow, s.signal) for s in strategies})
+        macd = np.stack([ema[fast] - ema[slow] for fast, slow, _ in lines])
+        macd_signal = batched.ema_batch(macd, [signal for _, _, signal in lines])
+        rows = {line: row for row, line in enumerate(lines)}
+        signals = []
+        for s in strategies:
+            row = rows[(s.fast, s.slow, s.signal)]
+            signals.append(signal_from_conditions(macd[row] > macd_signal[row], macd[row] < macd_signal[row]))
+        return signals
 
-        df["signal"] = 0
-        df.loc[df["macd"] > df["macd_signal"], "signal"] = 1
-        df.loc[df["macd"] < df["macd_signal"], "signal"] = -1
+    def bootstrap(self):
+        close = self.bars.series("close")
+        ema_fast = primitives.ema(close, self.fast)
+        ema_slow = primitives.ema(close, self.slow)
+        macd_signal = primitives.ema(ema_fast - ema_slow, self.signal)
+        self._ema_fast = EMAState(self.fast, ema_fast.iloc[-1])
+        self._ema_slow = EMAState(self.slow, ema_slow.iloc[-1])
+        self._ema_signal = EMAState(self.signal, macd_signal.iloc[-1])
+        return int(self.signal_array()[-1])
 
-        return df["signal"]
+    def update(self, bar):
+        close = float(bar["close"])
+        macd = self._ema_fast.update(close) - self._ema_slow.update(close)
+        macd_signal = self._ema_signal.update(macd)
+        if macd < macd_signal:
+            return -1
+        if macd > macd_signal:
+            return 1
+        return 0
 
 
 # Register strategy
@@ -0,0 +1,128 @@
+# indicators/primitives.py
+
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# === Memo Cache ===
+# Keyed by (data version of every input, primitive name, params) so one ensemble
+# evaluation computes each shared primitive once, whichever strategy asks first.
+# Inputs and returned Series are shared between callers and must be treated as
+# read-only. A Series' version is hashed once and then remembered for that
+# Series object; BarArrays.series() hands every strategy the same object per
+# field, so a cache hit costs a dict lookup rather than a pass over the data.
+CACHE_SIZE = 512
+_cache = OrderedDict()
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+_versions = {}  # id(series) -> (weakref to the series, data pointer, version)
+
+
+def _content_version(series, values):
+    digest = hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=16).digest()
+    index = series.index
+    bounds = (index[0], index[-1]) if len(index) else (None, None)
+    return len(values), bounds, digest
+
+
+def _forget(ref, key):
+    # Weakref callback: may run during garbage collection inside a locked section, so it takes no lock
+    entry = _versions.get(key)
+    if entry is not None and entry[0] is ref:
+        _versions.pop(key, None)
+
+
+def data_version(series: pd.Series):
+    """Content fingerprint of a Series (length, index bounds, value digest), hashed once per Series object."""
+    values = series.to_numpy(dtype=np.float64)
+    pointer = values.__array_interface__["data"][0]
+    key = id(series)
+    with _lock:
+        entry = _versions.get(key)
+        # The pointer check catches a Series whose data was swapped (copy-on-write) since it was hashed
+        if entry is not None and entry[0]() is series and entry[1] == pointer:
+            return entry[2]
+
+    version = _content_version(series, values)
+    ref = weakref.ref(series, lambda ref, key=key: _forget(ref, key))
+    with _lock:
+        _versions[key] = (ref, pointer, version)
+    return version
+
+
+def _memoize(primitive, inputs, params, compute):
+    key = (tuple(data_version(s) for s in inputs), primitive, params)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            return _cache[key]
+
+    result = compute()
+    with _lock:
+        stats["misses"] += 1
+        _cache[key] = result
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+        _versions.clear()
+        stats["hits"] = stats["misses"] = 0
+
+
+# === Primitives ===
+
+def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    def compute():
+        hl = high - low
+        hc = (high - close.shift()).abs()
+        lc = (low - close.shift()).abs()
+        return pd.concat([hl, hc, lc], axis=1).max(axis=1)
+    return _memoize("true_range", (high, low, close), (), compute)
+
+
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int, min_periods=None) -> pd.Series:
+    """Simple-average ATR (rolling mean of true range)."""
+    return _memoize(
+        "atr", (high, low, close), (period, min_periods),
+        lambda: true_range(high, low, close).rolling(window=period, min_periods=min_periods).mean(),
+    )
+
+
+def ema(series: pd.Series, span: int) -> pd.Series:
+    return _memoize("ema", (series,), (span,), lambda: series.ewm(span=span, adjust=False).mean())
+
+
+def sma(series: pd.Series, window: int) -> pd.Series:
+    return _memoize("sma", (series,), (window,), lambda: series.rolling(window=window).mean())
+
+
+def rolling_std(series: pd.Series, window: int) -> pd.Series:
+    return _memoize("rolling_std", (series,), (window,), lambda: series.rolling(window=window).std())
+
+
+def rolling_min(series: pd.Series, window: int) -> pd.Series:
+    return _memoize("rolling_min", (series,), (window,), lambda: series.rolling(window).min())
+
+
+def rolling_max(series: pd.Series, window: int) -> pd.Series:
+    return _memoize("rolling_max", (series,), (window,), lambda: series.rolling(window).max())
+
+
+def rsi(close: pd.Series, period: int) -> pd.Series:
+    """Simple-average RSI; the first bar's missing delta counts as a zero gain/loss."""
+    def compute():
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        rs = gain / (loss + 1e-10)
+        return 100 - (100 / (1 + rs))
+    return _memoize("rsi", (close,), (period,), compute)
@@ -1,28 +1,53 @@
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import RollingWindow
+from indicators import primitives, batched
 import pandas as pd
 
 
 class RSIStrategy(StrategyBase):
     def __init__(self, df, rsi_rsi_period=14, rsi_overbought=70, rsi_oversold=30):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.period = rsi_rsi_period
         self.overbought = rsi_overbought
         self.oversold = rsi_oversold
         self.name = "rsi"
 
-    def generate_signals(self):
-        df = self.df.copy()
-        delta = df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
-        rs = gain / (loss + 1e-10)
-        df["rsi"] = 100 - (100 / (1 + rs))
+    def signal_array(self):
+        rsi = primitives.rsi(self.bars.series("close"), self.period)
+        return signal_from_conditions(rsi < self.oversold, rsi > self.overbought)
 
-        df["signal"] = 0
-        df.loc[df["rsi"] < self.oversold, "signal"] = 1
-        df.loc[df["rsi"] > self.overbought, "signal"] = -1
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        periods = sorted({s.period for s in strategies})
+        rsi = dict(zip(periods, batched.rsi_batch(bars.close, periods)))
+        return [
+            signal_from_conditions(rsi[s.period] < s.oversold, rsi[s.period] > s.overbought)
+            for s in strategies
+        ]
 
-        return df["signal"]
+    def bootstrap(self):
+        close = self.bars.series("close")
+        delta = close.diff()
+        self._gains = RollingWindow(self.period, delta.where(delta > 0, 0))
+        self._losses = RollingWindow(self.period, -delta.where(delta < 0, 0))
+        self._last_close = float(close.iloc[-1])
+        return int(self.signal_array()[-1])
+
+    def update(self, bar):
+        close = float(bar["close"])
+        delta = close - self._last_close
+        self._last_close = close
+        self._gains.append(delta if delta > 0 else 0.0)
+        self._losses.append(-delta if delta < 0 else 0.0)
+
+        rs = self._gains.mean() / (self._losses.mean() + 1e-10)
+        rsi = 100 - (100 / (1 + rs))
+        if rsi > self.overbought:
+            return -1
+        if rsi < self.oversold:
+            return 1
+        return 0
 
 
 # Register strategy
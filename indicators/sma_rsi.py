@@ -1,37 +1,79 @@
 # indicators/sma_rsi.py
 
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import RollingWindow
+from indicators import primitives, batched
+import numpy as np
 import pandas as pd
 
 
 class SMARsiStrategy(StrategyBase):
     def __init__(self, df, sma_rsi_period=14, sma_window=20, sma_rsi_threshold=50):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.rsi_period = sma_rsi_period
         self.sma_window = sma_window
         self.threshold = sma_rsi_threshold
         self.name = "sma_rsi"
 
-    def generate_signals(self):
-        df = self.df.copy()
+    def signal_array(self):
+        close = self.bars.close
+        rsi = primitives.rsi(self.bars.series("close"), self.rsi_period).to_numpy()
+        sma = primitives.sma(self.bars.series("close"), self.sma_window).to_numpy()
 
-        # RSI calculation
-        delta = df["close"].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        avg_gain = gain.rolling(self.rsi_period).mean()
-        avg_loss = loss.rolling(self.rsi_period).mean()
-        rs = avg_gain / (avg_loss + 1e-10)
-        df["rsi"] = 100 - (100 / (1 + rs))
+        # Shared RSI primitive; this strategy's warm-up also skips the first
+        # bar's missing delta, so its first rsi_period bars never signal
+        warm = np.arange(len(close)) >= self.rsi_period
 
-        # SMA calculation
-        df["sma"] = df["close"].rolling(self.sma_window).mean()
+        return signal_from_conditions(
+            warm & (close > sma) & (rsi > self.threshold),
+            warm & (close < sma) & (rsi < self.threshold),
+        )
 
-        df["signal"] = 0
-        df.loc[(df["close"] > df["sma"]) & (df["rsi"] > self.threshold), "signal"] = 1
-        df.loc[(df["close"] < df["sma"]) & (df["rsi"] < self.threshold), "signal"] = -1
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        close = bars.close
+        rsi_periods = sorted({s.rsi_period for s in strategies})
+        sma_windows = sorted({s.sma_window for s in strategies})
+        rsi = dict(zip(rsi_periods, batched.rsi_batch(close, rsi_periods)))
+        sma = dict(zip(sma_windows, batched.rolling_mean_batch(close, sma_windows)))
+        bar_numbers = np.arange(len(close))
 
-        return df["signal"]
+        signals = []
+        for s in strategies:
+            warm = bar_numbers >= s.rsi_period
+            above, below = close > sma[s.sma_window], close < sma[s.sma_window]
+            signals.append(signal_from_conditions(
+                warm & above & (rsi[s.rsi_period] > s.threshold),
+                warm & below & (rsi[s.rsi_period] < s.threshold),
+            ))
+        return signals
+
+    def bootstrap(self):
+        close = self.bars.series("close")
+        delta = close.diff()
+        self._gains = RollingWindow(self.rsi_period, delta.clip(lower=0))
+        self._losses = RollingWindow(self.rsi_period, -delta.clip(upper=0))
+        self._closes = RollingWindow(self.sma_window, close)
+        self._last_close = float(close.iloc[-1])
+        return int(self.signal_array()[-1])
+
+    def update(self, bar):
+        close = float(bar["close"])
+        delta = close - self._last_close
+        self._last_close = close
+        self._gains.append(max(delta, 0.0))
+        self._losses.append(-min(delta, 0.0))
+        self._closes.append(close)
+
+        rs = self._gains.mean() / (self._losses.mean() + 1e-10)
+        rsi = 100 - (100 / (1 + rs))
+        sma = self._closes.mean()
+        if close < sma and rsi < self.threshold:
+            return -1
+        if close > sma and rsi > self.threshold:
+            return 1
+        return 0
 
 
 # Register strategy
@@ -1,32 +1,77 @@
 # indicators/stochastic.py
 
-from indicators.strategy_base import StrategyFactory, StrategyBase
+from indicators.strategy_base import StrategyFactory, StrategyBase, signal_from_conditions
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import RollingWindow
+from indicators import primitives, batched
 import pandas as pd
 
 
 class StochasticStrategy(StrategyBase):
     def __init__(self, df, stochastic_k_period=14, stochastic_d_period=3,
                  stochastic_lower_bound=20, stochastic_upper_bound=80):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.k = stochastic_k_period
         self.d = stochastic_d_period
         self.lower = stochastic_lower_bound
         self.upper = stochastic_upper_bound
         self.name = "stochastic"
 
-    def generate_signals(self):
-        df = self.df.copy()
+    def _k_line(self):
+        low_min = primitives.rolling_min(self.bars.series("low"), self.k)
+        high_max = primitives.rolling_max(self.bars.series("high"), self.k)
+        return 100 * (self.bars.series("close") - low_min) / (high_max - low_min + 1e-10)
 
-        low_min = df["low"].rolling(self.k).min()
-        high_max = df["high"].rolling(self.k).max()
-        df["%K"] = 100 * (df["close"] - low_min) / (high_max - low_min + 1e-10)
-        df["%D"] = df["%K"].rolling(self.d).mean()
+    def signal_array(self):
+        k_line = self._k_line()
+        d_line = primitives.sma(k_line, self.d)
+        return signal_from_conditions(
+            (k_line > d_line) & (k_line < self.lower),
+            (k_line < d_line) & (k_line > self.upper),
+        )
 
-        df["signal"] = 0
-        df.loc[(df["%K"] > df["%D"]) & (df["%K"] < self.lower), "signal"] = 1
-        df.loc[(df["%K"] < df["%D"]) & (df["%K"] > self.upper), "signal"] = -1
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        k_periods = sorted({s.k for s in strategies})
+        low_min = batched.rolling_min_batch(bars.low, k_periods)
+        high_max = batched.rolling_max_batch(bars.high, k_periods)
+        k_lines = 100 * (bars.close - low_min) / (high_max - low_min + 1e-10)
 
-        return df["signal"]
+        lines = {}
+        for row, k in enumerate(k_periods):
+            d_periods = sorted({s.d for s in strategies if s.k == k})
+            d_lines = batched.rolling_mean_batch(k_lines[row], d_periods)
+            lines.update({(k, d): (k_lines[row], d_line) for d, d_line in zip(d_periods, d_lines)})
+
+        signals = []
+        for s in strategies:
+            k_line, d_line = lines[(s.k, s.d)]
+            signals.append(signal_from_conditions(
+                (k_line > d_line) & (k_line < s.lower),
+                (k_line < d_line) & (k_line > s.upper),
+            ))
+        return signals
+
+    def bootstrap(self):
+        self._lows = RollingWindow(self.k, self.bars.low)
+        self._highs = RollingWindow(self.k, self.bars.high)
+        self._k_window = RollingWindow(self.d, self._k_line())
+        return int(self.signal_array()[-1])
+
+    def update(self, bar):
+        self._lows.append(bar["low"])
+        self._highs.append(bar["high"])
+        low_min = self._lows.min()
+        high_max = self._highs.max()
+        k_value = 100 * (float(bar["close"]) - low_min) / (high_max - low_min + 1e-10)
+        self._k_window.append(k_value)
+        d_value = self._k_window.mean()
+
+        if k_value < d_value and k_value > self.upper:
+            return -1
+        if k_value > d_value and k_value < self.lower:
+            return 1
+        return 0
 
 
 # Register strategy
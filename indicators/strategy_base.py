@@ -1,10 +1,20 @@
 # indicators/strategy_base.py
 
+import numpy as np
+import pandas as pd
+
+from indicators.bar_arrays import BarArrays
+
+
 class StrategyFactory:
     _registry = {}
 
     @classmethod
     def register(cls, name, backtest_cls=None, param_space=None):
+        # Strategy modules register with one config dict: {"backtest_cls": ..., "param_space": ...}
+        if isinstance(backtest_cls, dict):
+            param_space = backtest_cls.get("param_space", param_space)
+            backtest_cls = backtest_cls.get("backtest_cls")
         cls._registry[name] = {
             "backtest_cls": backtest_cls,
             "param_space": param_space or {}
@@ -18,12 +28,66 @@ class StrategyFactory:
     def get_all(cls):
         return cls._registry
 
+    @classmethod
+    def get_class(cls, name):
+        entry = cls._registry.get(name)
+        return entry["backtest_cls"] if entry else None
+
+    @classmethod
+    def create(cls, name, df, **params):
+        strategy_cls = cls.get_class(name)
+        if strategy_cls is None:
+            raise ValueError(f"Strategy '{name}' not found in registry.")
+        return strategy_cls(df, **params)
+
+
+def signal_from_conditions(long_condition, short_condition):
+    """int8 signal: 1 where long_condition holds, -1 where short_condition holds (short wins)."""
+    signal = np.zeros(len(long_condition), dtype=np.int8)
+    signal[np.asarray(long_condition, dtype=bool)] = 1
+    signal[np.asarray(short_condition, dtype=bool)] = -1
+    return signal
+
 
 class StrategyBase:
     def __init__(self, df, **params):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.params = params
         self.name = self.__class__.__name__
 
+    def signal_array(self):
+        raise NotImplementedError("Each strategy must implement the signal_array() method.")
+
     def generate_signals(self):
-        raise NotImplementedError("Each strategy must implement the generate_signals() method.")
+        """Signals as a Series on the bar index (a view of signal_array())."""
+        return pd.Series(self.signal_array(), index=self.bars.index, name="signal", copy=False)
+
+    # === Parameter-batched mode ===
+    # signal_arrays(bars, param_sets) returns one int8 signal row per param dict.
+    # Strategies built on indicators/batched.py override _batch_signals() to
+    # compute every distinct period in one pass; the default runs each set alone.
+    @classmethod
+    def signal_arrays(cls, bars, param_sets):
+        bars = BarArrays.from_frame(bars)
+        strategies = [cls(bars, **params) for params in param_sets]
+        signals = np.empty((len(strategies), len(bars)), dtype=np.int8)
+        if strategies:
+            for row, signal in enumerate(cls._batch_signals(bars, strategies)):
+                signals[row] = signal
+        return signals
+
+    @classmethod
+    def _batch_signals(cls, bars, strategies):
+        """Signals of several configured instances over the same bars, in order."""
+        return [strategy.signal_array() for strategy in strategies]
+
+    # === Streaming mode ===
+    # bootstrap() seeds compact state (EMA accumulators, rolling windows, last bar)
+    # from the batch computation over self.bars; update(bar) then consumes one new
+    # bar (a mapping with open/high/low/close/volume) and returns its signal, so
+    # per-bar cost does not grow with history length.
+    def bootstrap(self):
+        raise NotImplementedError(f"{self.name} does not support streaming updates.")
+
+    def update(self, bar):
+        raise NotImplementedError(f"{self.name} does not support streaming updates.")
@@ -0,0 +1,121 @@
+# indicators/streaming.py
+
+from collections import deque
+import math
+
+import numpy as np
+
+from indicators.bar_arrays import FIELDS, BarArrays
+from indicators.strategy_base import StrategyFactory
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer for O(window) rolling stats, independent of history length.
+
+    Mirrors pandas' rolling(window) with min_periods=window: stats are NaN
+    until the window is full, and any NaN inside the window propagates.
+    """
+
+    def __init__(self, window, history=()):
+        self.window = window
+        self.values = deque((float(v) for v in list(history)[-window:]), maxlen=window)
+
+    def append(self, value):
+        self.values.append(float(value))
+
+    def full(self):
+        return len(self.values) == self.window
+
+    def mean(self):
+        if not self.full():
+            return np.nan
+        return np.float64(sum(self.values)) / self.window
+
+    def std(self):
+        """Sample standard deviation (ddof=1), as pandas rolling().std()."""
+        if not self.full() or self.window < 2:
+            return np.nan
+        mean = sum(self.values) / self.window
+        return np.float64(math.sqrt(sum((v - mean) ** 2 for v in self.values) / (self.window - 1)))
+
+    def min(self):
+        if not self.full() or any(math.isnan(v) for v in self.values):
+            return np.nan
+        return np.float64(min(self.values))
+
+    def max(self):
+        if not self.full() or any(math.isnan(v) for v in self.values):
+            return np.nan
+        return np.float64(max(self.values))
+
+
+class EMAState:
+    """Exponential moving average with pandas' ewm(span=..., adjust=False) recurrence."""
+
+    def __init__(self, span, value):
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = float(value)
+
+    def update(self, x):
+        old_wt = 1.0 - self.alpha
+        self.value = (old_wt * self.value + self.alpha * float(x)) / (old_wt + self.alpha)
+        return self.value
+
+
+def true_range(high, low, prev_close):
+    """Single-bar true range; NaN terms are skipped like pandas' row-wise max."""
+    terms = [high - low, abs(high - prev_close), abs(low - prev_close)]
+    terms = [t for t in terms if not math.isnan(t)]
+    return max(terms) if terms else np.nan
+
+
+class StreamingEnsemble:
+    """
+    Live state for one symbol's tuned strategies ({"strategy", "params",
+    "weight"} specs, as in the params file).
+
+    sync(df) bootstraps every strategy on the first call and afterwards feeds
+    only the bars after the last one consumed through update(), so a cycle
+    costs one update per new bar instead of a pass over the whole history.
+    The strategies are bootstrapped again when the last consumed bar is
+    missing from `df` or its close changed: a gap in the data, or a bar store
+    rewrite after an upstream split/dividend re-adjustment.
+    """
+
+    def __init__(self, specs):
+        self.specs = specs
+        self.strategies = []
+        self.signals = []
+        self._last_ts = None
+        self._last_close = None
+
+    def _continues(self, bars):
+        """True if `bars` still holds the last consumed bar, unchanged."""
+        if self._last_ts is None:
+            return False
+        pos = bars.index.searchsorted(self._last_ts)
+        return pos < len(bars) and bars.index[pos] == self._last_ts and bars.close[pos] == self._last_close
+
+    def sync(self, df):
+        """Bring the state up to the last bar of `df`; returns the blended signal (-1, 0 or 1)."""
+        bars = BarArrays.from_frame(df)
+        if not len(bars):
+            return self.signal
+        if self._continues(bars):
+            fields = [field for field in FIELDS if getattr(bars, field) is not None]
+            for i in range(bars.index.searchsorted(self._last_ts, side="right"), len(bars)):
+                bar = {field: getattr(bars, field)[i] for field in fields}
+                self.signals = [strategy.update(bar) for strategy in self.strategies]
+        else:
+            self.strategies = [StrategyFactory.create(spec["strategy"], bars, **spec["params"]) for spec in self.specs]
+            self.signals = [strategy.bootstrap() for strategy in self.strategies]
+        self._last_ts = bars.index[-1]
+        self._last_close = bars.close[-1]
+        return self.signal
+
+    @property
+    def signal(self):
+        """Sign of the weighted sum of the latest strategy signals, as in core.trade_cycle.ensemble_signal."""
+        blended = sum(spec.get("weight", 1.0) * signal for spec, signal in zip(self.specs, self.signals))
+        return int(np.sign(blended))
@@ -1,45 +1,102 @@
 # indicators/supertrend.py
 
 from indicators.strategy_base import StrategyFactory, StrategyBase
-import pandas as pd
+from indicators.bar_arrays import BarArrays
+from indicators.streaming import RollingWindow, true_range
+from indicators import primitives
+import numpy as np
+from core.jit import njit
 
 
 class SupertrendStrategy(StrategyBase):
     def __init__(self, df, supertrend_atr_period=10, supertrend_multiplier=3.0):
-        self.df = df.copy()
+        self.bars = BarArrays.from_frame(df)
         self.atr_period = supertrend_atr_period
         self.multiplier = supertrend_multiplier
         self.name = "supertrend"
 
-    def generate_signals(self):
-        df = self.df.copy()
+    def _atr(self):
+        bars = self.bars
+        return primitives.atr(bars.series("high"), bars.series("low"), bars.series("close"), self.atr_period).to_numpy()
 
-        hl = df["high"] - df["low"]
-        hc = (df["high"] - df["close"].shift()).abs()
-        lc = (df["low"] - df["close"].shift()).abs()
-        tr = pd.concat([hl, hc, lc], axis=1).max(axis=1)
-        atr = tr.rolling(self.atr_period).mean()
+    def signal_array(self):
+        atr = self._atr()
 
-        hl2 = (df["high"] + df["low"]) / 2
+        hl2 = (self.bars.high + self.bars.low) / 2
         upperband = hl2 + self.multiplier * atr
         lowerband = hl2 - self.multiplier * atr
 
-        direction = [0]
-        for i in range(1, len(df)):
-            prev_dir = direction[-1]
-            close = df["close"].iloc[i]
-            prev_upper = upperband.iloc[i - 1]
-            prev_lower = lowerband.iloc[i - 1]
-
-            if prev_dir == -1 and close > prev_upper:
-                direction.append(1)
-            elif prev_dir == 1 and close < prev_lower:
-                direction.append(-1)
-            else:
-                direction.append(prev_dir)
-
-        df["signal"] = direction
-        return df["signal"]
+        direction = supertrend_direction(self.bars.close, upperband, lowerband)
+        return direction.astype(np.int8)
+
+    def bootstrap(self):
+        bars = self.bars
+        tr = primitives.true_range(bars.series("high"), bars.series("low"), bars.series("close"))
+        atr = self._atr()
+        hl2 = (bars.high[-1] + bars.low[-1]) / 2
+
+        self._tr = RollingWindow(self.atr_period, tr)
+        self._prev_upper = float(hl2 + self.multiplier * atr[-1])
+        self._prev_lower = float(hl2 - self.multiplier * atr[-1])
+        self._last_close = float(bars.close[-1])
+        self._direction = int(self.signal_array()[-1])
+        return self._direction
+
+    def update(self, bar):
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        self._tr.append(true_range(high, low, self._last_close))
+        atr = self._tr.mean()
+        hl2 = (high + low) / 2
+
+        if self._direction == -1 and close > self._prev_upper:
+            self._direction = 1
+        elif self._direction == 1 and close < self._prev_lower:
+            self._direction = -1
+
+        self._prev_upper = hl2 + self.multiplier * atr
+        self._prev_lower = hl2 - self.multiplier * atr
+        self._last_close = close
+        return self._direction
+
+
+@njit(cache=True)
+def supertrend_direction(close, upperband, lowerband, initial_direction=0):
+    """
+    Supertrend direction state machine: flip to 1 when close breaks the
+    previous upper band, to -1 when it breaks the previous lower band.
+    """
+    n = close.shape[0]
+    direction = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return direction
+    direction[0] = initial_direction
+    for i in range(1, n):
+        prev_dir = direction[i - 1]
+        if prev_dir == -1 and close[i] > upperband[i - 1]:
+            direction[i] = 1
+        elif prev_dir == 1 and close[i] < lowerband[i - 1]:
+            direction[i] = -1
+        else:
+            direction[i] = prev_dir
+    return direction
+
+
+def supertrend_direction_reference(close, upperband, lowerband, initial_direction=0):
+    """Original per-row Python loop, kept as the reference for supertrend_direction."""
+    direction = [initial_direction]
+    for i in range(1, len(close)):
+        prev_dir = direction[-1]
+        price = close.iloc[i]
+        prev_upper = upperband.iloc[i - 1]
+        prev_lower = lowerband.iloc[i - 1]
+
+        if prev_dir == -1 and price > prev_upper:
+            direction.append(1)
+        elif prev_dir == 1 and price < prev_lower:
+            direction.append(-1)
+        else:
+            direction.append(prev_dir)
+    return direction
 
 
 # Register strategy
@@ -4,13 +4,14 @@ import os
 from datetime import datetime, timedelta
 from core.config import API_KEY, API_SECRET, BASE_URL
 from alpaca_trade_api.rest import REST
+from core.rate_limiter import RateLimitedClient
 from monitoring.telegram_utils import send_telegram_message as send_telegram
 from datetime import timezone
 
 # Setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("monitor_stop_fills")
-api = REST(API_KEY, API_SECRET, BASE_URL)
+api = RateLimitedClient(REST(API_KEY, API_SECRET, BASE_URL))
 LOG_FILE = "stop_fills_log.csv"
 
 def log_stop_fill(symbol, qty, filled_price):
@@ -36,7 +37,7 @@ def monitor_stop_fills():
             if order.side == 'sell' and order.type == 'stop_limit':
                 msg = f"🚨 {order.symbol}: Stop-loss was TRIGGERED at ${order.filled_avg_price}"
                 logger.warning(msg)
-                send_telegram(msg)
+                send_telegram(msg, suppress=False)  # every fill is reported
                 log_stop_fill(order.symbol, order.qty, order.filled_avg_price)
     except Exception as e:
         logger.error(f"❌ Error checking stop-loss fills: {e}")
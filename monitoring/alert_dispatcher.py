@@ -0,0 +1,282 @@
+# monitoring/alert_dispatcher.py
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+from core.rate_limiter import TokenBucket
+
+try:
+    from monitoring.prometheus_metrics import alerts_dropped_total, alerts_coalesced_total
+except ImportError:  # prometheus_client is optional for scripts
+    alerts_dropped_total = alerts_coalesced_total = None
+
+# === Dispatcher Settings ===
+# Alerts are queued and sent from one background thread, so order paths and
+# the trade loop never wait on Telegram or SMTP. Identical alerts arriving
+# within ALERT_COALESCE_SECONDS go out once with a repeat count.
+#
+# An alert that keeps recurring across cycles is sent once per
+# ALERT_SUPPRESS_MINUTES: alerts sharing a template (the text with its symbol
+# and numbers masked) are counted while the window is open and go out as one
+# "N× <message>" digest, listing the affected symbols, when it closes.
+#
+# When the queue is full, alerts are appended to ALERT_SPILL_PATH and replayed
+# once the queue has drained (or on the next start), or dropped if no spill
+# path is set.
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "500"))
+ALERT_COALESCE_SECONDS = float(os.getenv("ALERT_COALESCE_SECONDS", "2"))
+ALERT_SUPPRESS_MINUTES = float(os.getenv("ALERT_SUPPRESS_MINUTES", "15"))
+ALERT_SPILL_PATH = os.getenv("ALERT_SPILL_PATH", os.path.join("logs", "alerts_spill.jsonl"))
+ALERT_FLUSH_TIMEOUT = float(os.getenv("ALERT_FLUSH_TIMEOUT", "10"))  # seconds waited at exit
+
+_FLUSH = object()  # queued by flush(): send every pending digest now
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _template(arg, symbol=None):
+    """`arg` with the symbol and numbers masked, so repeats of one alert share a key."""
+    if not isinstance(arg, str):
+        return arg
+    if symbol:
+        arg = re.sub(rf"\b{re.escape(symbol)}\b", "{symbol}", arg)
+    return _NUMBER.sub("#", arg)
+
+
+class AlertDispatcher:
+    def __init__(self, maxsize=ALERT_QUEUE_SIZE, coalesce_seconds=ALERT_COALESCE_SECONDS, spill_path=ALERT_SPILL_PATH,
+                 suppress_minutes=ALERT_SUPPRESS_MINUTES, clock=time.monotonic):
+        self.coalesce_seconds = coalesce_seconds
+        self.spill_path = spill_path
+        self.suppress_seconds = suppress_minutes * 60
+        self.channels = {}
+        self.dropped = 0
+        self.spilled = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._flushing = threading.Event()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._windows = {}  # template key -> open suppression window; worker thread only
+        self._spill_pending = False
+        self._last_send_ok = True  # outcome of the most recent channel send
+
+    def register_channel(self, name, send, per_minute=20, burst=3):
+        """send(*args) delivers one alert synchronously; it runs only on the worker thread."""
+        self.channels[name] = (send, TokenBucket(f"alerts_{name}", per_minute, burst))
+
+    # === Producer side (never blocks) ===
+
+    def dispatch(self, channel, *args, symbol=None, suppress=True):
+        """
+        Queue an alert; never blocks.
+
+        `symbol` names the symbol the alert is about, so the same failure on
+        several symbols lands in one digest. suppress=False sends every
+        occurrence (e.g. trade confirmations).
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((channel, args, symbol, suppress))
+        except queue.Full:
+            self._overflow(channel, args, symbol, suppress)
+
+    def _overflow(self, channel, args, symbol=None, suppress=True):
+        if self.spill_path:
+            try:
+                os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+                item = {"channel": channel, "args": list(args), "symbol": symbol, "suppress": suppress}
+                with self._lock, open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(item) + "\n")
+                self.spilled += 1
+                self._spill_pending = True
+                return
+            except (OSError, TypeError) as e:
+                logging.error(f"❌ Failed to spill alert to {self.spill_path}: {e}")
+        self.dropped += 1
+        if alerts_dropped_total is not None:
+            alerts_dropped_total.labels(channel=channel).inc()
+        logging.warning(f"⚠️ Alert queue full; dropped {channel} alert")
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+                self._worker.start()
+
+    # === Worker side ===
+
+    def _replay_spill(self):
+        """Requeue spilled alerts, as many as the queue has room for; the rest stay spilled."""
+        self._spill_pending = False
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return
+        try:
+            with self._lock:
+                with open(self.spill_path, "r", encoding="utf-8") as f:
+                    lines = f.readlines()
+                room = self._queue.maxsize - self._queue.qsize() if self._queue.maxsize > 0 else len(lines)
+                replay, keep = lines[:room], lines[room:]
+                if keep:
+                    with open(self.spill_path, "w", encoding="utf-8") as f:
+                        f.writelines(keep)
+                    self._spill_pending = True
+                else:
+                    os.remove(self.spill_path)
+        except OSError as e:
+            logging.error(f"❌ Failed to read spilled alerts: {e}")
+            return
+        for line in replay:
+            try:
+                item = json.loads(line)
+                self.dispatch(item["channel"], *item["args"], symbol=item.get("symbol"),
+                              suppress=item.get("suppress", True))
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def _collect(self, first):
+        """The first alert plus everything else queued within the coalescing window."""
+        batch = [first]
+        deadline = time.monotonic() + self.coalesce_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0 or self._flushing.is_set():
+                    item = self._queue.get_nowait()
+                else:
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch
+            batch.append(item)
+
+    def _run(self):
+        self._replay_spill()
+        while True:
+            try:
+                first = self._queue.get(timeout=self._until_next_digest())
+            except queue.Empty:
+                self._send_digests()
+                continue
+            batch = self._collect(first)
+            # Identical alerts (same channel and args) collapse into one, in first-seen order
+            counts = {}
+            for item in batch:
+                counts[item] = counts.get(item, 0) + 1
+            flush_requested = counts.pop(_FLUSH, 0)
+            for (channel, args, symbol, suppress), count in counts.items():
+                if suppress and self._suppressed(channel, args, symbol, count):
+                    continue
+                self._deliver(channel, args, count)
+            self._send_digests(force=bool(flush_requested))
+            # Sends are going through and the backlog is gone: bring back what overflowed
+            if self._last_send_ok and self._spill_pending and self._queue.empty():
+                self._replay_spill()
+            for _ in batch:
+                self._queue.task_done()
+
+    # === Cross-cycle suppression ===
+
+    def _suppressed(self, channel, args, symbol, count):
+        """True if an open window for this alert's template absorbs it; otherwise opens one (send it)."""
+        if self.suppress_seconds <= 0:
+            return False
+        key = (channel,) + tuple(_template(arg, symbol) for arg in args)
+        window = self._windows.get(key)
+        if window is None:
+            self._windows[key] = {"channel": channel, "args": args, "count": 0, "symbols": [],
+                                  "expires": self._clock() + self.suppress_seconds}
+            return False
+        window["count"] += count
+        window["args"] = args
+        if symbol and symbol not in window["symbols"]:
+            window["symbols"].append(symbol)
+        if alerts_coalesced_total is not None:
+            alerts_coalesced_total.labels(channel=channel).inc(count)
+        return True
+
+    def _until_next_digest(self):
+        if not self._windows:
+            return None
+        return max(0.0, min(w["expires"] for w in self._windows.values()) - self._clock())
+
+    def _send_digests(self, force=False):
+        """
+        Send "N× <latest message>" for each expired window that absorbed repeats.
+        A window that did is renewed, so an alert firing every cycle yields one
+        digest per window; a quiet one closes. force=True closes them all.
+        """
+        now = self._clock()
+        for key, window in list(self._windows.items()):
+            if not force and window["expires"] > now:
+                continue
+            count, args = window["count"], window["args"]
+            if count:
+                text = f"{count}× {args[-1]}"
+                if len(window["symbols"]) > 1:
+                    text += f"\n(symbols: {', '.join(window['symbols'])})"
+                self._deliver(window["channel"], args[:-1] + (text,), 1)
+            if count and not force:
+                window.update(count=0, symbols=[], expires=now + self.suppress_seconds)
+            else:
+                del self._windows[key]
+
+    def _deliver(self, channel, args, count):
+        """Send one alert; True (also kept as _last_send_ok) if the channel's send call did not raise."""
+        if channel not in self.channels:
+            logging.warning(f"⚠️ No alert channel '{channel}' registered; alert discarded")
+            return False
+        send, bucket = self.channels[channel]
+        if count > 1:
+            if alerts_coalesced_total is not None:
+                alerts_coalesced_total.labels(channel=channel).inc(count - 1)
+            args = args[:-1] + (f"{args[-1]}\n(x{count} in {self.coalesce_seconds:g}s)",)
+        bucket.acquire()
+        try:
+            send(*args)
+            self._last_send_ok = True
+        except Exception as e:
+            logging.error(f"❌ Failed to deliver {channel} alert: {e}")
+            self._last_send_ok = False
+        return self._last_send_ok
+
+    # === Shutdown ===
+
+    def flush(self, timeout=ALERT_FLUSH_TIMEOUT):
+        """Deliver everything queued (skipping the coalescing wait) and every pending digest; False if it timed out."""
+        if self._worker is None:
+            return True
+        self._flushing.set()
+        deadline = time.monotonic() + timeout
+        try:
+            try:
+                self._queue.put(_FLUSH, timeout=timeout)
+            except queue.Full:
+                return False
+            with self._queue.all_tasks_done:
+                while self._queue.unfinished_tasks:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._queue.all_tasks_done.wait(remaining)
+            return True
+        finally:
+            self._flushing.clear()
+
+
+dispatcher = AlertDispatcher()
+atexit.register(dispatcher.flush)
+
+
+def register_channel(name, send, per_minute=20, burst=3):
+    dispatcher.register_channel(name, send, per_minute, burst)
+
+
+def dispatch(channel, *args, symbol=None, suppress=True):
+    dispatcher.dispatch(channel, *args, symbol=symbol, suppress=suppress)
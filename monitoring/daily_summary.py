@@ -11,6 +11,7 @@ from datetime import datetime
 from core.config import API_KEY, API_SECRET, BASE_URL
 from alpaca_trade_api.rest import REST
 from monitoring.telegram_utils import send_telegram_message as send_telegram
+from monitoring import alert_dispatcher
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import smtplib
@@ -88,31 +89,36 @@ def format_message(realized, unrealized, snapshot):
 
 
 def send_email(subject, body):
+    """Queue the email on the alert dispatcher; SMTP runs on its worker thread."""
     if not EMAIL_ENABLED:
         return
+    alert_dispatcher.dispatch("email", subject, body, suppress=False)
 
+
+def send_email_now(subject, body):
+    """Send synchronously; raises on failure so the dispatcher can tell sends are failing."""
     msg = MIMEMultipart()
     msg["From"] = EMAIL_FROM
     msg["To"] = EMAIL_TO
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "plain"))
 
-    try:
-        context = ssl.create_default_context()
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls(context=context)
-            server.login(SMTP_USER, SMTP_PASS)
-            server.sendmail(EMAIL_FROM, EMAIL_TO, msg.as_string())
-        logger.info("✉️ Email summary sent")
-    except Exception as e:
-        logger.error(f"❌ Failed to send email summary: {e}")
+    context = ssl.create_default_context()
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+        server.starttls(context=context)
+        server.login(SMTP_USER, SMTP_PASS)
+        server.sendmail(EMAIL_FROM, EMAIL_TO, msg.as_string())
+    logger.info("✉️ Email summary sent")
+
+
+alert_dispatcher.register_channel("email", send_email_now, per_minute=6)
 
 
 def run_daily_summary():
     realized = summarize_fills()
     unrealized, snapshot = summarize_positions()
     message = format_message(realized, unrealized, snapshot)
-    send_telegram(message)
+    send_telegram(message, suppress=False)
     send_email("Daily Bot Summary", message)
 
 
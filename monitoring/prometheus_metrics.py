@@ -1,4 +1,4 @@
-from prometheus_client import start_http_server, Gauge, Counter
+from prometheus_client import start_http_server, Gauge, Counter, Histogram
 import time
 import threading
 
@@ -44,6 +44,50 @@ stop_loss_orders_total = Counter(
     ['symbol']
 )
 
+# ─── Outbound HTTP (core/http_client) ───────────────────────────────────────────
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Latency of outbound REST calls per attempt",
+    ["host", "endpoint", "method", "status"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+http_retries_total = Counter(
+    "http_retries_total",
+    "Outbound REST attempts retried after a 429/5xx or connection error",
+    ["host", "endpoint"]
+)
+
+# ─── Client-side Rate Limiting (core/rate_limiter) ──────────────────────────────
+
+rate_limit_queue_depth = Gauge(
+    "rate_limit_queue_depth",
+    "Calls waiting for a token in each rate-limit bucket",
+    ["bucket"]
+)
+
+rate_limit_wait_seconds = Histogram(
+    "rate_limit_wait_seconds",
+    "Time calls spent waiting for a rate-limit token",
+    ["bucket", "priority"],
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# ─── Alert Dispatcher (monitoring/alert_dispatcher) ─────────────────────────────
+
+alerts_dropped_total = Counter(
+    "alerts_dropped_total",
+    "Alerts dropped because the dispatcher queue was full",
+    ["channel"]
+)
+
+alerts_coalesced_total = Counter(
+    "alerts_coalesced_total",
+    "Repeated alerts folded into a coalesced alert or a digest",
+    ["channel"]
+)
+
 # ─── Uptime Tracker ─────────────────────────────────────────────────────────────
 
 _start_time = time.time()
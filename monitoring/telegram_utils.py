@@ -1,8 +1,9 @@
 # monitoring/telegram_utils.py
 
 import os
-import requests
 import logging
+from core import http_client
+from monitoring import alert_dispatcher
 import re
 
 token = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -14,7 +15,21 @@ def strip_emojis(text):
     return emoji_pattern.sub(r"", text)
 
 
-def send_telegram_alert(message):
+def send_telegram_alert(message, symbol=None, suppress=True):
+    """
+    Queue a Telegram alert; returns at once (delivery runs on the alert dispatcher thread).
+    Repeats are folded into digests (see alert_dispatcher) unless suppress=False,
+    which order fills and failures must pass.
+    """
+    alert_dispatcher.dispatch("telegram", message, symbol=symbol, suppress=suppress)
+
+
+# Several scripts import the alert under this name
+send_telegram_message = send_telegram_alert
+
+
+def send_telegram_alert_now(message):
+    """Send synchronously; raises on failure so the dispatcher can tell sends are failing."""
     if not token or not chat_id:
         logging.warning("Telegram credentials not set. Skipping alert.")
         return
@@ -26,9 +41,11 @@ def send_telegram_alert(message):
         "text": clean_message,
         "parse_mode": "Markdown"
     }
-    try:
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        logging.info("Telegram alert sent.")
-    except Exception as e:
-        logging.error(f"Failed to send Telegram alert: {e}")
+    # Endpoint label keeps the bot token out of the latency metrics; not idempotent:
+    # a 5xx may come after Telegram delivered the message, so only 429s and failed connects retry
+    response = http_client.post(url, json=payload, endpoint="telegram/sendMessage")
+    response.raise_for_status()
+    logging.info("Telegram alert sent.")
+
+
+alert_dispatcher.register_channel("telegram", send_telegram_alert_now, per_minute=20)
@@ -1,6 +1,5 @@
 import config
-import urllib.request
-import json
+from core import http_client
 
 # ────────────────────────────────────────────────────────────────────────────────
 # API Config
@@ -15,18 +14,14 @@ BASE_URL = config.BASE_URL
 # HTTP Fallbacks for When Alpaca SDK is Unavailable
 # ────────────────────────────────────────────────────────────────────────────────
 def http_get(path):
-    url = BASE_URL + path
-    req = urllib.request.Request(url, headers=HEADERS)
-    with urllib.request.urlopen(req) as response:
-        return json.load(response)
+    response = http_client.get(BASE_URL + path, headers=HEADERS)
+    response.raise_for_status()
+    return response.json()
 
 def http_post(path, data):
-    url = BASE_URL + path
-    body = json.dumps(data).encode("utf-8")
-    headers = {**HEADERS, "Content-Type": "application/json"}
-    req = urllib.request.Request(url, data=body, headers=headers)
-    with urllib.request.urlopen(req) as response:
-        return json.load(response)
+    response = http_client.post(BASE_URL + path, json=data, headers=HEADERS)
+    response.raise_for_status()
+    return response.json()
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Portfolio Fetching (via Alpaca SDK or HTTP Fallback)
@@ -1,30 +1,34 @@
 # rebalance.py
 
 import logging
-import yfinance as yf
+from datetime import datetime, timedelta
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import LimitOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockLatestTradeRequest
 
+from core.rate_limiter import RateLimitedClient
 from core.config import API_KEY, API_SECRET, TARGET_WEIGHTS, SYMBOLS
 from monitoring.prometheus_metrics import METRIC_TRADES
 from monitoring.telegram_utils import send_telegram_message as send_telegram
 from atr_filter_utils import apply_atr_regime
+from core.data_loader import get_price_data
 
 # ─── Setup Logging ──────────────────────────────────────────────────────────────
 logger = logging.getLogger("rebalance")
 logger.setLevel(logging.INFO)
 
 # ─── Clients ─────────────────────────────────────────────────────────────────────
-trading_client = TradingClient(API_KEY, API_SECRET)
-data_client = StockHistoricalDataClient(API_KEY, API_SECRET)
+trading_client = RateLimitedClient(TradingClient(API_KEY, API_SECRET))
+data_client = RateLimitedClient(StockHistoricalDataClient(API_KEY, API_SECRET), bucket="data")
 
 # ─── ATR Regime Filter ──────────────────────────────────────────────────────────
 def get_current_regime(symbol: str) -> int:
     try:
-        df = yf.download(symbol, period="1y", interval="1d", auto_adjust=True)
+        start_date = (datetime.utcnow() - timedelta(days=365)).strftime("%Y-%m-%d")
+        df = get_price_data(symbol, start_date=start_date)
+        df = df.rename(columns=str.capitalize)  # apply_atr_regime expects High/Low/Close
         df.dropna(inplace=True)
         regimes, _ = apply_atr_regime(df)
         return regimes.iloc[-1]
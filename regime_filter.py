@@ -3,6 +3,8 @@
 import pandas as pd
 import numpy as np
 
+from indicators import primitives
+
 def apply_volume_filter(df: pd.DataFrame, volume_ratio: float = 1.5) -> pd.DataFrame:
     """
     Adds a 'volume_pass' column to the DataFrame indicating whether current volume
@@ -24,17 +26,7 @@ def apply_atr_regime(df: pd.DataFrame, window: int = 14, z_threshold: float = 0.
              1 = high volatility (aggressive)
         atr: Series of ATR values
     """
-    high = df['high']
-    low = df['low']
-    close = df['close']
-
-    tr = pd.concat([
-        high - low,
-        (high - close.shift()).abs(),
-        (low - close.shift()).abs()
-    ], axis=1).max(axis=1)
-
-    atr = tr.rolling(window=window).mean()
+    atr = primitives.atr(df['high'], df['low'], df['close'], window)
 
     z_scores = (atr - atr.mean()) / atr.std()
     regime = pd.cut(z_scores, bins=[-np.inf, -z_threshold, z_threshold, np.inf], labels=[-1, 0, 1]).astype(int)
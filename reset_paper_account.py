@@ -1,5 +1,5 @@
-import requests
 from core import config
+from core import http_client
 
 def reset_paper_account():
     API_KEY = config.API_KEY
@@ -10,7 +10,7 @@ def reset_paper_account():
         print("⚠️ This reset script only works for paper trading accounts.")
         return
 
-    response = requests.post(
+    response = http_client.post(
         f"{BASE_URL}/v2/account/reset",
         headers={
             "APCA-API-KEY-ID": API_KEY,
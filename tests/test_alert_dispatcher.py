@@ -0,0 +1,167 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from monitoring import telegram_utils
+from monitoring.alert_dispatcher import AlertDispatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def drain(dispatcher):
+    """Wait for the worker to handle everything queued, without flush() closing the digest windows."""
+    while dispatcher._queue.unfinished_tasks:
+        threading.Event().wait(0.01)
+
+
+class TestAlertDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.spill_path = os.path.join(self.tmp.name, "spill.jsonl")
+        self.clock = FakeClock()
+        self.sent = []
+
+    def make(self, **kwargs):
+        options = dict(maxsize=100, coalesce_seconds=0.05, spill_path=self.spill_path, suppress_minutes=15,
+                       clock=self.clock)
+        options.update(kwargs)
+        dispatcher = AlertDispatcher(**options)
+        dispatcher.register_channel("telegram", self.sent.append, per_minute=6000, burst=100)
+        return dispatcher
+
+    def test_identical_burst_is_coalesced(self):
+        dispatcher = self.make(suppress_minutes=0)
+        for _ in range(3):
+            dispatcher.dispatch("telegram", "disk full")
+        dispatcher.dispatch("telegram", "other")
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(self.sent, ["disk full\n(x3 in 0.05s)", "other"])
+
+    def test_repeats_across_cycles_become_one_digest_per_window(self):
+        dispatcher = self.make()
+        dispatcher.dispatch("telegram", "❌ Error with AAPL: timeout after 30s", symbol="AAPL")
+        drain(dispatcher)
+        self.assertEqual(self.sent, ["❌ Error with AAPL: timeout after 30s"])
+
+        # Later cycles: same template, other symbols and numbers
+        for minute, symbol in [(1, "MSFT"), (2, "AAPL"), (3, "NVDA")]:
+            self.clock.now = minute * 60
+            dispatcher.dispatch("telegram", f"❌ Error with {symbol}: timeout after {minute}s", symbol=symbol)
+            dispatcher.dispatch("telegram", f"✅ Order submitted: {symbol} at {minute}", suppress=False)
+            drain(dispatcher)
+        self.assertEqual(len(self.sent), 4)
+        self.assertTrue(all(text.startswith("✅") for text in self.sent[1:]))
+
+        # The window closes: one digest with the count and the affected symbols
+        self.clock.now = 16 * 60
+        dispatcher.dispatch("telegram", "unrelated")
+        self.assertTrue(dispatcher.flush(5))
+        self.assertIn("3× ❌ Error with NVDA: timeout after 3s\n(symbols: MSFT, AAPL, NVDA)", self.sent)
+
+    def test_flush_sends_pending_digests(self):
+        dispatcher = self.make()
+        for minutes in (12, 12, 13):
+            dispatcher.dispatch("telegram", f"feed stale for {minutes} min")
+            drain(dispatcher)
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(self.sent, ["feed stale for 12 min", "2× feed stale for 13 min"])
+        self.assertEqual(dispatcher._windows, {})
+        dispatcher.dispatch("telegram", "feed stale for 14 min")  # windows closed: sent straight away
+        drain(dispatcher)
+        self.assertEqual(self.sent[-1], "feed stale for 14 min")
+
+    def test_overflow_spills_and_replays_once_sends_resume(self):
+        release = threading.Event()
+        started = threading.Event()
+        delivered = []
+
+        def slow_send(message):
+            started.set()
+            release.wait(5)
+            delivered.append(message)
+
+        dispatcher = self.make(maxsize=2, suppress_minutes=0, coalesce_seconds=0)
+        dispatcher.register_channel("telegram", slow_send, per_minute=6000, burst=100)
+        dispatcher.dispatch("telegram", "m0")
+        self.assertTrue(started.wait(5))  # the worker is stuck sending m0
+        for i in range(1, 6):
+            dispatcher.dispatch("telegram", f"m{i}")
+        self.assertEqual(dispatcher.spilled, 3)
+        self.assertTrue(os.path.exists(self.spill_path))
+
+        release.set()
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(sorted(delivered), [f"m{i}" for i in range(6)])
+        self.assertFalse(os.path.exists(self.spill_path))
+        self.assertEqual(dispatcher.dropped, 0)
+
+    def test_spill_waits_until_a_send_succeeds(self):
+        release = threading.Event()
+        started = threading.Event()
+        failing = [True]
+        delivered = []
+
+        def flaky_send(message):
+            started.set()
+            release.wait(5)
+            if failing[0]:
+                raise ConnectionError("telegram down")
+            delivered.append(message)
+
+        dispatcher = self.make(maxsize=1, suppress_minutes=0, coalesce_seconds=0)
+        dispatcher.register_channel("telegram", flaky_send, per_minute=6000, burst=100)
+        dispatcher.dispatch("telegram", "m0")
+        self.assertTrue(started.wait(5))
+        for i in range(1, 4):
+            dispatcher.dispatch("telegram", f"m{i}")
+        release.set()
+        with self.assertLogs(level="ERROR"):
+            drain(dispatcher)
+        self.assertTrue(os.path.exists(self.spill_path))  # failed sends do not pull the spill back in
+
+        failing[0] = False
+        dispatcher.dispatch("telegram", "recovered")
+        self.assertTrue(dispatcher.flush(5))
+        self.assertEqual(delivered[0], "recovered")
+        self.assertEqual(sorted(delivered[1:]), ["m2", "m3"])
+        self.assertFalse(os.path.exists(self.spill_path))
+
+    def test_overflow_without_spill_path_drops(self):
+        release = threading.Event()
+        started = threading.Event()
+        dispatcher = self.make(maxsize=1, spill_path=None, suppress_minutes=0)
+        dispatcher.register_channel("telegram", lambda message: (started.set(), release.wait(5)), burst=100)
+        dispatcher.dispatch("telegram", "m0")
+        self.assertTrue(started.wait(5))
+        for i in range(1, 4):
+            dispatcher.dispatch("telegram", f"m{i}")
+        self.assertEqual(dispatcher.dropped, 2)
+        release.set()
+        self.assertTrue(dispatcher.flush(5))
+
+
+class TestTelegramSend(unittest.TestCase):
+
+    def test_failed_send_raises_for_the_dispatcher(self):
+        response = requests.Response()
+        response.status_code = 502
+        with mock.patch.object(telegram_utils, "token", "t"), mock.patch.object(telegram_utils, "chat_id", "c"), \
+                mock.patch.object(telegram_utils.http_client, "post", return_value=response):
+            with self.assertRaises(requests.HTTPError):
+                telegram_utils.send_telegram_alert_now("hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from core import data_loader
+from core.bar_scheduler import EASTERN, BarCloseScheduler, daily_end_date, next_bar_close
+from core.bar_store import BarStore
+
+
+def eastern(*args):
+    return EASTERN.localize(datetime(*args))
+
+
+class TestNextBarClose(unittest.TestCase):
+
+    def test_intraday_bars_align_to_session_open(self):
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 9, 0), 1), eastern(2025, 7, 14, 9, 31))
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 9, 31, 10), 3), eastern(2025, 7, 14, 9, 33))
+        # A close exactly at `now` has already fired
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 9, 33), 3), eastern(2025, 7, 14, 9, 36))
+
+    def test_last_bar_closes_with_the_session(self):
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 15, 58), 7), eastern(2025, 7, 14, 16, 0))
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 16, 0), 1), eastern(2025, 7, 15, 9, 31))
+
+    def test_weekends_and_daily_bars(self):
+        self.assertEqual(next_bar_close(eastern(2025, 7, 18, 17, 0), 5), eastern(2025, 7, 21, 9, 35))
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 12, 0), 1440), eastern(2025, 7, 14, 16, 0))
+        self.assertEqual(next_bar_close(eastern(2025, 7, 14, 16, 0), 1440), eastern(2025, 7, 15, 16, 0))
+
+
+class FakeStopEvent:
+    """Stands in for threading.Event: wait() moves a fake clock instead of sleeping."""
+
+    def __init__(self, clock, max_waits):
+        self.clock = clock
+        self.waits = []
+        self.max_waits = max_waits
+
+    def is_set(self):
+        return len(self.waits) >= self.max_waits
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        self.clock.now += timedelta(seconds=timeout)
+        return self.is_set()
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestBarCloseScheduler(unittest.TestCase):
+
+    def test_daily_cycles_survive_bad_intervals_and_failures(self):
+        clock = FakeClock(eastern(2025, 7, 17, 12, 0))  # Thursday
+        intervals = {"AAPL": 390, "MSFT": 390, "BAD": "three"}
+        fired = []
+
+        def on_bars_closed(symbols, closed_at):
+            fired.append((sorted(symbols), closed_at))
+            if len(fired) == 1:
+                raise RuntimeError("broker down")
+
+        scheduler = BarCloseScheduler(lambda: list(intervals), intervals.get, on_bars_closed, delay=5, clock=clock)
+        stop = FakeStopEvent(clock, max_waits=3)
+        with self.assertLogs(level="ERROR") as logs:
+            scheduler.run_forever(stop)
+
+        self.assertEqual(fired, [
+            (["AAPL", "MSFT"], eastern(2025, 7, 17, 16, 0)),
+            (["AAPL", "MSFT"], eastern(2025, 7, 18, 16, 0)),
+        ])
+        self.assertEqual(stop.waits[0], 4 * 3600 + 5)
+        self.assertTrue(any("BAD" in line for line in logs.output))
+        self.assertTrue(any("broker down" in line for line in logs.output))
+
+    def test_symbols_lookup_failure_backs_off(self):
+        clock = FakeClock(eastern(2025, 7, 17, 12, 0))
+
+        def get_symbols():
+            raise OSError("params file unreadable")
+
+        scheduler = BarCloseScheduler(get_symbols, lambda symbol: 390, lambda *args: None, clock=clock)
+        stop = FakeStopEvent(clock, max_waits=2)
+        with self.assertLogs(level="ERROR"):
+            scheduler.run_forever(stop)
+        self.assertEqual(stop.waits, [60, 60])
+
+
+class TestClosedDailyBar(unittest.TestCase):
+
+    def test_end_date_includes_the_bar_closed_at_the_session_close(self):
+        self.assertEqual(daily_end_date(eastern(2025, 7, 18, 16, 0)), "2025-07-19")
+        self.assertEqual(daily_end_date(eastern(2025, 7, 18, 15, 30)), "2025-07-18")
+
+    def test_closed_bar_reaches_the_cycle_frame(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = BarStore(root)
+            index = pd.bdate_range("2025-07-01", "2025-07-17")
+            close = np.linspace(100, 110, len(index))
+            stored = pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": 1.0},
+                                  index=index)
+            store.write("AAPL", stored)
+            # yFinance now has Friday's completed bar as well
+            fresh = pd.concat([stored.iloc[-2:], stored.iloc[-1:].set_axis([pd.Timestamp("2025-07-18")])])
+
+            closed_at = eastern(2025, 7, 18, 16, 0)
+            data_loader._last_refresh.clear()
+            self.addCleanup(data_loader._last_refresh.clear)
+            with mock.patch.object(data_loader, "download_price_data_batch", return_value={"AAPL": fresh}) as fetch:
+                frames = data_loader.get_price_data_batch(["AAPL"], "2025-07-01", daily_end_date(closed_at),
+                                                          store=store)
+            fetch.assert_called_once_with(["AAPL"], "2025-07-16", "2025-07-19")
+            self.assertEqual(frames["AAPL"].index[-1], pd.Timestamp(closed_at.date()))
+
+
+if __name__ == "__main__":
+    unittest.main()
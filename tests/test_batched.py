@@ -0,0 +1,82 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators import batched, primitives
+from indicators.bar_arrays import BarArrays
+from indicators.strategy_base import StrategyFactory
+import indicators.registry  # ensure all strategies are registered
+
+
+def make_ohlc(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+def random_params(param_space, rng):
+    return {
+        key: rng.randint(info["low"], info["high"]) if info["type"] == "int" else rng.uniform(info["low"], info["high"])
+        for key, info in param_space.items()
+    }
+
+
+class TestBatchedKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.df = make_ohlc()
+        self.close = self.df["close"]
+
+    def assert_rows_match(self, matrix, periods, primitive, series, exact=False):
+        for row, period in zip(matrix, periods):
+            expected = primitive(series, period).to_numpy()
+            if exact:
+                np.testing.assert_array_equal(row, expected, err_msg=str(period))
+            else:
+                np.testing.assert_allclose(row, expected, rtol=1e-8, atol=1e-8, err_msg=str(period))
+
+    def test_kernels_match_primitives(self):
+        self.assert_rows_match(batched.rsi_batch(self.close, range(5, 31)), range(5, 31), primitives.rsi, self.close)
+        self.assert_rows_match(batched.ema_batch(self.close, range(5, 101)), range(5, 101), primitives.ema,
+                               self.close, exact=True)
+        means, stds = batched.rolling_mean_std_batch(self.close, range(2, 31))
+        self.assert_rows_match(means, range(2, 31), primitives.sma, self.close)
+        self.assert_rows_match(stds, range(2, 31), primitives.rolling_std, self.close)
+        self.assert_rows_match(batched.rolling_min_batch(self.df["low"], range(1, 40)), range(1, 40),
+                               primitives.rolling_min, self.df["low"], exact=True)
+        self.assert_rows_match(batched.rolling_max_batch(self.df["high"], range(1, 40)), range(1, 40),
+                               primitives.rolling_max, self.df["high"], exact=True)
+
+    def test_signal_arrays_match_single_instances(self):
+        bars = BarArrays.from_frame(self.df)
+        rng = random.Random(0)
+        for name, entry in StrategyFactory.get_all().items():
+            cls = entry["backtest_cls"]
+            param_sets = [random_params(entry["param_space"], rng) for _ in range(25)]
+            signals = cls.signal_arrays(bars, param_sets)
+            self.assertEqual(signals.dtype, np.int8)
+            for row, params in zip(signals, param_sets):
+                np.testing.assert_array_equal(row, cls(bars, **params).signal_array(), err_msg=f"{name} {params}")
+
+
+
+class TestSharedFrame(unittest.TestCase):
+
+    def test_strategies_leave_the_callers_frame_untouched(self):
+        # backtest_daily and the trade cycle hand every strategy the same frame without copying it
+        df = make_ohlc(300, seed=2)
+        before = df.copy()
+        rng = random.Random(4)
+        for name, entry in StrategyFactory.get_all().items():
+            for _ in range(3):
+                entry["backtest_cls"](df, **random_params(entry["param_space"], rng)).generate_signals()
+                pd.testing.assert_frame_equal(df, before, obj=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from core import data_loader
+from core.bar_store import BarStore
+
+
+def bars(start, periods, close=100.0):
+    index = pd.bdate_range(start, periods=periods)
+    close = close + np.arange(periods, dtype=float)
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1000.0},
+                        index=index)
+
+
+class TestBarStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = BarStore(self.tmp.name)
+
+    def test_write_merges_and_newer_rows_win(self):
+        self.store.write("AAPL", bars("2024-01-01", 5))
+        update = bars("2024-01-05", 3, close=200.0)  # overlaps the last stored bar
+        self.store.write("aapl", update)
+
+        df = self.store.read("AAPL")
+        self.assertEqual(len(df), 7)
+        self.assertTrue(df.index.is_monotonic_increasing and df.index.is_unique)
+        self.assertEqual(df.loc["2024-01-05", "close"], 200.0)
+        self.assertEqual(df.loc["2024-01-04", "close"], 103.0)
+        self.assertEqual(self.store.last_timestamp("AAPL"), pd.Timestamp("2024-01-09"))
+
+    def test_replace_rewrites_the_partition(self):
+        self.store.write("AAPL", bars("2024-01-01", 5))
+        self.store.write("AAPL", bars("2024-01-03", 2, close=50.0), replace=True)
+        df = self.store.read("AAPL")
+        self.assertEqual(list(df["close"]), [50.0, 51.0])
+        self.assertEqual(self.store.first_timestamp("AAPL"), pd.Timestamp("2024-01-03"))
+
+    def test_partitions_are_memory_mapped_read_only(self):
+        self.store.write("AAPL", bars("2024-01-01", 5))
+        partition = BarStore(self.tmp.name)._load("AAPL", "1d")
+        self.assertIsInstance(partition, np.memmap)
+        self.assertFalse(partition.flags.writeable)
+
+
+class TestDownload(unittest.TestCase):
+
+    def test_price_basis_is_pinned(self):
+        raw = bars("2024-01-01", 3).rename(columns=str.title)
+        with mock.patch.object(data_loader.yf, "download", return_value=raw) as download:
+            data_loader.download_price_data("AAPL", "2024-01-01", "2024-01-04")
+        self.assertIs(download.call_args.kwargs["auto_adjust"], data_loader.YF_AUTO_ADJUST)
+
+
+class TestWatermarkDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = BarStore(self.tmp.name)
+        self.store.write("AAPL", bars("2024-01-01", 10))  # through Fri 2024-01-12
+        data_loader._last_refresh.clear()
+        self.addCleanup(data_loader._last_refresh.clear)
+
+    def test_delta_starts_one_bar_before_the_watermark(self):
+        self.assertEqual(data_loader._missing_ranges("AAPL", "2024-01-01", "2024-01-18", self.store),
+                         [("2024-01-11", "2024-01-18")])
+        # Up to date: the newest complete bar before an exclusive end of Monday is Friday's
+        self.assertEqual(data_loader._missing_ranges("AAPL", "2024-01-01", "2024-01-15", self.store), [])
+
+    def test_unchanged_watermark_merges_the_delta(self):
+        delta = bars("2024-01-11", 5, close=108.0)  # overlapping closes match the stored 108.0 and 109.0
+        with mock.patch.object(data_loader, "download_price_data", return_value=delta) as download:
+            df = data_loader.get_price_data("AAPL", "2024-01-01", "2024-01-18", store=self.store)
+        download.assert_called_once_with("AAPL", "2024-01-11", "2024-01-18")
+        self.assertEqual(len(df), 13)
+        self.assertEqual(df["close"].iloc[0], 100.0)
+
+    def test_changed_watermark_refetches_the_whole_symbol(self):
+        # A 2:1 split: yFinance now serves every bar, including the stored watermark, at half the price
+        adjusted = bars("2024-01-01", 13, close=50.0)
+        delta = adjusted.loc["2024-01-11":]
+
+        def download(symbol, start, end):
+            return delta if start == "2024-01-11" else adjusted
+
+        with mock.patch.object(data_loader, "download_price_data", side_effect=download) as fake:
+            df = data_loader.get_price_data("AAPL", "2024-01-01", "2024-01-18", store=self.store)
+        self.assertEqual([c.args for c in fake.call_args_list],
+                         [("AAPL", "2024-01-11", "2024-01-18"), ("AAPL", "2024-01-01", "2024-01-18")])
+        np.testing.assert_array_equal(df["close"], adjusted["close"])
+        self.assertTrue((df.index == adjusted.index).all())
+
+    def test_settling_watermark_close_is_overwritten_without_refetch(self):
+        # The watermark was stored right after the close; its settled close is a little different
+        delta = bars("2024-01-11", 5, close=108.0)
+        delta.loc["2024-01-12", "close"] = 109.37
+        with mock.patch.object(data_loader, "download_price_data", return_value=delta) as download:
+            df = data_loader.get_price_data("AAPL", "2024-01-01", "2024-01-18", store=self.store)
+        download.assert_called_once_with("AAPL", "2024-01-11", "2024-01-18")
+        self.assertEqual(df.loc["2024-01-12", "close"], 109.37)
+        self.assertEqual(df["close"].iloc[0], 100.0)
+        self.assertEqual(len(df), 13)
+
+    def test_batch_refetches_only_the_adjusted_symbol(self):
+        self.store.write("MSFT", bars("2024-01-01", 10, close=300.0))
+        deltas = {"AAPL": bars("2024-01-11", 5, close=54.0), "MSFT": bars("2024-01-11", 5, close=308.0)}
+        adjusted = bars("2024-01-01", 13, close=50.0)
+        with mock.patch.object(data_loader, "download_price_data_batch", return_value=deltas) as batch, \
+                mock.patch.object(data_loader, "download_price_data", return_value=adjusted) as single:
+            frames = data_loader.get_price_data_batch(["AAPL", "MSFT"], "2024-01-01", "2024-01-18", store=self.store)
+        batch.assert_called_once_with(["AAPL", "MSFT"], "2024-01-11", "2024-01-18")
+        single.assert_called_once_with("AAPL", "2024-01-01", "2024-01-18")
+        self.assertEqual(frames["AAPL"]["close"].iloc[0], 50.0)
+        self.assertEqual(len(frames["MSFT"]), 13)
+        self.assertEqual(frames["MSFT"]["close"].iloc[0], 300.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import socket
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from core import http_client
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each path with the next status from `server.script[path]` (200 once exhausted)."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server.hits[(self.command, self.path)] += 1
+        server.clients.add(self.client_address)
+        statuses = server.script.get(self.path, [])
+        status, headers = statuses.pop(0) if statuses else (200, {})
+        body = b'{"ok": true}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _respond
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+        self.server.hits = Counter()
+        self.server.clients = set()
+        self.server.script = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        http_client.close_sessions()
+        sleep_patch = mock.patch.object(http_client.time, "sleep")
+        self.sleep = sleep_patch.start()
+        self.addCleanup(sleep_patch.stop)
+
+    def tearDown(self):
+        http_client.close_sessions()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retry_after_header_sets_the_delay(self):
+        self.server.script["/limited"] = [(429, {"Retry-After": "7"}), (429, {"Retry-After": "2.5"})]
+        response = http_client.get(self.base + "/limited")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.hits[("GET", "/limited")], 3)
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [7.0, 2.5])
+
+    def test_429_is_retried_for_post(self):
+        self.server.script["/orders"] = [(429, {})]
+        self.assertEqual(http_client.post(self.base + "/orders", json={}).status_code, 200)
+        self.assertEqual(self.server.hits[("POST", "/orders")], 2)
+
+    def test_5xx_retried_only_for_idempotent_methods(self):
+        self.server.script["/get"] = [(503, {}), (500, {})]
+        self.assertEqual(http_client.get(self.base + "/get").status_code, 200)
+        self.assertEqual(self.server.hits[("GET", "/get")], 3)
+
+        self.server.script["/post"] = [(503, {}), (500, {})]
+        self.assertEqual(http_client.post(self.base + "/post", json={}).status_code, 503)
+        self.assertEqual(self.server.hits[("POST", "/post")], 1)
+
+        self.server.script["/opt-in"] = [(503, {})]
+        self.assertEqual(http_client.post(self.base + "/opt-in", json={}, idempotent=True).status_code, 200)
+        self.assertEqual(self.server.hits[("POST", "/opt-in")], 2)
+
+    def test_failed_connect_is_retried_even_for_post(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+        with self.assertRaises(requests.ConnectionError):
+            http_client.post(f"http://127.0.0.1:{closed_port}/x", json={}, retries=2)
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_one_keep_alive_session_per_host(self):
+        session = http_client.get_session(self.base + "/a")
+        self.assertIs(http_client.get_session(self.base + "/b?x=1"), session)
+        self.assertIsNot(http_client.get_session("http://localhost:1/a"), session)
+
+        for _ in range(10):
+            http_client.get(self.base + "/a")
+        self.assertEqual(len(self.server.clients), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
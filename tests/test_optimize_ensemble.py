@@ -0,0 +1,90 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import optuna
+import pandas as pd
+
+from backtest.optimize_ensemble import optimize_batched, study_options
+from backtest.signal_cache import SignalCache
+from backtest.warm_start import load_prior_configs
+from core import optuna_storage
+from indicators.strategy_base import StrategyFactory
+
+
+def make_ohlc(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+class TestBatchedOptimization(unittest.TestCase):
+
+    def setUp(self):
+        optuna.logging.set_verbosity(optuna.logging.WARNING)
+        self.df = make_ohlc()
+        self.all_strategies = list(StrategyFactory.get_all().items())
+
+    def run_batched(self, study, trials, batch_size):
+        with contextlib.redirect_stdout(io.StringIO()):
+            optimize_batched(study, self.df, self.all_strategies, trials, batch_size, SignalCache(path=None))
+
+    def test_batches_stop_at_the_trial_budget(self):
+        study = optuna.create_study(direction="maximize", **study_options("batch", "none"))
+        self.run_batched(study, trials=10, batch_size=4)
+        self.assertEqual(len(study.trials), 10)
+
+    def test_other_workers_in_flight_trials_count_against_the_budget(self):
+        study = optuna.create_study(direction="maximize", **study_options("batch", "none"))
+        # Another worker's batch, asked but not yet told
+        for _ in range(3):
+            study.ask()
+        self.run_batched(study, trials=10, batch_size=4)
+        self.assertEqual(len(study.trials), 10)
+        finished = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        self.assertEqual(len(finished), 7)
+
+    def test_resume_after_an_interrupted_batch_runs_the_full_budget(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        options = dict(storage=f"sqlite:///{os.path.join(tmp.name, 'optuna.db')}", study_name="AAPL_ensemble",
+                       direction="maximize", load_if_exists=True)
+        # The first run was killed mid-batch: its asked trials stay RUNNING in the storage
+        interrupted = optuna.create_study(**options, **study_options("batch", "none"))
+        for _ in range(4):
+            interrupted.ask()
+
+        resumed = optuna.create_study(**options, **study_options("batch", "none"))
+        with mock.patch.object(optuna_storage, "STALE_TRIAL_SECONDS", 0), self.assertLogs(level="WARNING"):
+            self.run_batched(resumed, trials=10, batch_size=4)
+        states = [trial.state for trial in resumed.get_trials(deepcopy=False)]
+        self.assertEqual(states.count(optuna.trial.TrialState.FAIL), 4)
+        self.assertEqual(states.count(optuna.trial.TrialState.COMPLETE), 10)
+
+
+class TestWarmStart(unittest.TestCase):
+
+    def test_backups_are_ordered_by_the_date_in_their_name(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        names = ["ensemble_tuned_params_2025-03-01.json", "ensemble_tuned_params_backup_20250415_093000.json",
+                 "ensemble_tuned_params_2025-04-14.json"]
+        for age, name in enumerate(names):
+            path = os.path.join(tmp.name, name)
+            with open(path, "w") as f:
+                json.dump({"AAPL": {"sl_multiplier": age}}, f)
+            os.utime(path, (1e9 - age, 1e9 - age))  # mtimes say the opposite, as after a copy or checkout
+        configs = load_prior_configs("AAPL", params_file=os.path.join(tmp.name, "missing.json"), backup_dir=tmp.name)
+        self.assertEqual([config["sl_multiplier"] for config in configs], [1, 2, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
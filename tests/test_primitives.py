@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from indicators import primitives
+from indicators.bar_arrays import BarArrays
+
+
+def make_ohlc(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        primitives.clear_cache()
+        self.addCleanup(primitives.clear_cache)
+
+    def test_each_field_is_hashed_once_per_dataset(self):
+        bars = BarArrays.from_frame(make_ohlc())
+        with mock.patch.object(primitives, "_content_version", wraps=primitives._content_version) as hashed:
+            for period in (5, 14, 5, 14):
+                primitives.atr(bars.series("high"), bars.series("low"), bars.series("close"), period)
+                primitives.ema(bars.series("close"), period)
+        self.assertEqual(hashed.call_count, 3)  # high, low, close
+        self.assertEqual(primitives.stats["misses"], 1 + 2 + 2)  # true_range, atr x2, ema x2
+        self.assertGreaterEqual(primitives.stats["hits"], 4)
+
+    def test_different_data_gets_its_own_entry(self):
+        df = make_ohlc()
+        first = primitives.ema(BarArrays.from_frame(df).series("close"), 10)
+        shifted = df.assign(close=df["close"] * 2)
+        second = primitives.ema(BarArrays.from_frame(shifted).series("close"), 10)
+        np.testing.assert_allclose(second.to_numpy(), first.to_numpy() * 2)
+        self.assertEqual(primitives.stats["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+
+from core.rate_limiter import PRIORITY_ORDER, PRIORITY_READ, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.001)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_rejects_non_positive_rate(self):
+        for rate in (0, -5):
+            with self.assertRaises(ValueError):
+                TokenBucket("bad", rate)
+
+    def test_refill_is_capped_at_burst(self):
+        bucket = TokenBucket("t", rate_per_minute=60, burst=3, clock=self.clock)
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.tokens, 0.0)
+
+        self.clock.now += 1.5  # one token per second
+        bucket._refill()
+        self.assertAlmostEqual(bucket.tokens, 1.5)
+
+        self.clock.now += 3600
+        bucket._refill()
+        self.assertEqual(bucket.tokens, 3.0)
+
+    def test_order_jumps_ahead_of_queued_reads(self):
+        # A fast real-time rate keeps the wait timeouts short; tokens only appear when the fake clock moves
+        bucket = TokenBucket("t", rate_per_minute=60 * 128, burst=1, clock=self.clock)
+        bucket.acquire()
+        served = []
+
+        def take(label, priority):
+            bucket.acquire(priority)
+            served.append(label)
+
+        threads = []
+        for label, priority in [("read1", PRIORITY_READ), ("read2", PRIORITY_READ), ("read3", PRIORITY_READ),
+                                ("order", PRIORITY_ORDER)]:
+            thread = threading.Thread(target=take, args=(label, priority), daemon=True)
+            thread.start()
+            threads.append(thread)
+            wait_until(lambda: bucket.stats()["queue_depth"] == len(threads))
+
+        for expected in range(1, 5):
+            self.clock.now += 1 / 128  # exactly one token
+            wait_until(lambda: len(served) == expected)
+            time.sleep(0.02)  # no second caller gets through on the same token
+            self.assertEqual(len(served), expected)
+
+        for thread in threads:
+            thread.join(1)
+        self.assertEqual(served, ["order", "read1", "read2", "read3"])
+        self.assertEqual(bucket.stats()["acquired"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
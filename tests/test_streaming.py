@@ -0,0 +1,98 @@
+import random
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators.bar_arrays import BarArrays
+from indicators.strategy_base import StrategyFactory
+from indicators.streaming import StreamingEnsemble
+import indicators.registry  # ensure all strategies are registered
+
+
+def make_ohlc(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+def random_params(param_space, rng):
+    return {
+        key: rng.randint(info["low"], info["high"]) if info["type"] == "int" else rng.uniform(info["low"], info["high"])
+        for key, info in param_space.items()
+    }
+
+
+def bar_at(bars, i):
+    return {"open": bars.open[i], "high": bars.high[i], "low": bars.low[i], "close": bars.close[i],
+            "volume": bars.volume[i]}
+
+
+class TestStreamingParity(unittest.TestCase):
+
+    def test_bootstrap_then_update_matches_signal_array(self):
+        bars = BarArrays.from_frame(make_ohlc(400, seed=3))
+        rng = random.Random(1)
+        for name, entry in StrategyFactory.get_all().items():
+            cls = entry["backtest_cls"]
+            for _ in range(5):
+                params = random_params(entry["param_space"], rng)
+                expected = cls(bars, **params).signal_array()
+                for prefix in (120, 250):
+                    strategy = cls(bars.window(0, prefix), **params)
+                    streamed = [strategy.bootstrap()]
+                    streamed += [strategy.update(bar_at(bars, i)) for i in range(prefix, len(bars))]
+                    np.testing.assert_array_equal(streamed, expected[prefix - 1:], err_msg=f"{name} {params} {prefix}")
+
+
+class TestStreamingEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self.df = make_ohlc(300, seed=5)
+        self.specs = [
+            {"strategy": name, "params": random_params(entry["param_space"], random.Random(i)), "weight": 0.5 + i}
+            for i, (name, entry) in enumerate(StrategyFactory.get_all().items())
+        ]
+
+    def expected(self, df):
+        bars = BarArrays.from_frame(df)
+        signals = [StrategyFactory.get_class(spec["strategy"])(bars, **spec["params"]).signal_array()[-1]
+                   for spec in self.specs]
+        return signals, int(np.sign(sum(spec["weight"] * signal for spec, signal in zip(self.specs, signals))))
+
+    def test_new_bars_are_streamed(self):
+        stream = StreamingEnsemble(self.specs)
+        stream.sync(self.df.iloc[:200])
+        strategies = stream.strategies
+        for end in (201, 202, 250, 300, 300):
+            signal = stream.sync(self.df.iloc[:end])
+            expected_signals, expected_signal = self.expected(self.df.iloc[:end])
+            self.assertIs(stream.strategies, strategies)  # updated, not bootstrapped again
+            self.assertEqual(stream.signals, expected_signals)
+            self.assertEqual(signal, expected_signal)
+
+    def test_store_rewrite_or_gap_bootstraps_again(self):
+        stream = StreamingEnsemble(self.specs)
+        stream.sync(self.df.iloc[:200])
+
+        # Split re-adjustment: every stored bar changed
+        adjusted = self.df.iloc[:220].copy()
+        adjusted[["open", "high", "low", "close"]] /= 2
+        strategies = stream.strategies
+        stream.sync(adjusted)
+        self.assertIsNot(stream.strategies, strategies)
+        self.assertEqual(stream.signals, self.expected(adjusted)[0])
+
+        # The last consumed bar is missing from the frame
+        gapped = self.df.drop(self.df.index[219])
+        strategies = stream.strategies
+        stream.sync(gapped)
+        self.assertIsNot(stream.strategies, strategies)
+        self.assertEqual(stream.signals, self.expected(gapped)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators.supertrend import (
+    SupertrendStrategy,
+    supertrend_direction,
+    supertrend_direction_reference,
+)
+
+
+def make_ohlc(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+def reference_signals(df, atr_period, multiplier):
+    hl = df["high"] - df["low"]
+    hc = (df["high"] - df["close"].shift()).abs()
+    lc = (df["low"] - df["close"].shift()).abs()
+    tr = pd.concat([hl, hc, lc], axis=1).max(axis=1)
+    atr = tr.rolling(atr_period).mean()
+    hl2 = (df["high"] + df["low"]) / 2
+    direction = supertrend_direction_reference(
+        df["close"], hl2 + multiplier * atr, hl2 - multiplier * atr
+    )
+    return pd.Series(direction, index=df.index, name="signal", dtype=np.int8)
+
+
+class TestSupertrendKernel(unittest.TestCase):
+
+    def test_generate_signals_matches_reference_loop(self):
+        for seed, (period, mult) in enumerate([(10, 3.0), (5, 1.0), (20, 1.8)]):
+            df = make_ohlc(seed=seed)
+            expected = reference_signals(df, period, mult)
+            actual = SupertrendStrategy(df, period, mult).generate_signals()
+            pd.testing.assert_series_equal(actual, expected)
+
+    def test_kernel_matches_reference_from_each_seed_direction(self):
+        df = make_ohlc(seed=7)
+        hl2 = (df["high"] + df["low"]) / 2
+        spread = df["close"].rolling(5).std()
+        upper, lower = hl2 + spread, hl2 - spread
+
+        for initial in (-1, 0, 1):
+            expected = supertrend_direction_reference(df["close"], upper, lower, initial)
+            actual = supertrend_direction(
+                df["close"].to_numpy(), upper.to_numpy(), lower.to_numpy(), initial
+            )
+            self.assertEqual(actual.tolist(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
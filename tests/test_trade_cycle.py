@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from core.trade_cycle import ensemble_signal, run_streaming_cycle, run_trade_cycle
+from indicators.rsi import RSIStrategy
+
+
+def make_ohlc(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+class FakeBroker:
+    def __init__(self, position=0, qty=10, price=100.0):
+        self.position = position
+        self.qty = qty
+        self.price = price
+        self.orders = []
+        self.closed = []
+
+    def get_position(self, symbol):
+        return self.position
+
+    def calculate_quantity(self, symbol, allocation_pct):
+        return self.qty
+
+    def get_latest_price(self, symbol):
+        return self.price
+
+    def submit_order(self, symbol, qty, side, take_profit=None, stop_loss=None, reason=None):
+        self.orders.append({"symbol": symbol, "qty": qty, "side": side, "take_profit": take_profit,
+                            "stop_loss": stop_loss})
+        return object()
+
+    def close_position(self, symbol):
+        self.closed.append(symbol)
+        return object()
+
+
+class TestRunTradeCycle(unittest.TestCase):
+
+    def test_buy_when_flat_with_percentage_bracket(self):
+        broker = FakeBroker()
+        self.assertEqual(run_trade_cycle("AAPL", broker, 1, allocation_pct=0.5, sl_multiplier=2, tp_multiplier=3), "buy")
+        order = broker.orders[0]
+        self.assertEqual((order["qty"], order["side"]), (10, "buy"))
+        self.assertAlmostEqual(order["stop_loss"], 98.0)
+        self.assertAlmostEqual(order["take_profit"], 103.0)
+
+    def test_close_when_long_and_hold_otherwise(self):
+        broker = FakeBroker(position=5)
+        self.assertEqual(run_trade_cycle("AAPL", broker, -1), "sell")
+        self.assertEqual(broker.closed, ["AAPL"])
+        self.assertEqual(run_trade_cycle("AAPL", broker, 1), "hold")  # already long
+        self.assertEqual(run_trade_cycle("AAPL", FakeBroker(), -1), "hold")  # nothing to close
+        self.assertEqual(run_trade_cycle("AAPL", FakeBroker(qty=0), 1), "hold")
+
+
+class TestStreamingCycle(unittest.TestCase):
+
+    def test_orders_follow_the_streamed_signal(self):
+        df = make_ohlc()
+        params = {"rsi_rsi_period": 5, "rsi_overbought": 65, "rsi_oversold": 35}
+        cfg = {"strategies": [{"strategy": "rsi", "params": params, "weight": 1.0}]}
+        full = RSIStrategy(df, **params).signal_array()
+        buy_bar = next(i for i in range(200, len(df)) if full[i] == 1)
+        sell_bar = next(i for i in range(buy_bar, len(df)) if full[i] == -1)
+
+        streams = {}
+        broker = FakeBroker()
+        self.assertEqual(run_streaming_cycle("AAPL", df.iloc[:150], cfg, broker, streams),
+                         {1: "buy", 0: "hold", -1: "hold"}[int(full[149])])
+        broker.orders.clear()
+
+        # Later cycles must come from update(): a full recomputation would raise here
+        with mock.patch.object(RSIStrategy, "signal_array", side_effect=AssertionError("recomputed history")):
+            decision = run_streaming_cycle("AAPL", df.iloc[:buy_bar + 1], cfg, broker, streams)
+            self.assertEqual(decision, "buy")
+            self.assertEqual(streams["AAPL"].signal, 1)
+            self.assertEqual(broker.orders[-1]["side"], "buy")
+
+            broker.position = 10
+            self.assertEqual(run_streaming_cycle("AAPL", df.iloc[:sell_bar + 1], cfg, broker, streams), "sell")
+        self.assertEqual(ensemble_signal("AAPL", df.iloc[:sell_bar + 1], {"AAPL": cfg}), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
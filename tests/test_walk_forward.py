@@ -0,0 +1,70 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from indicators.strategy_base import StrategyFactory
+import indicators.registry  # ensure all strategies are registered
+from backtest import walk_forward
+
+
+def make_ohlc(n=320, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    index = pd.bdate_range("2022-01-03", periods=n)
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+def ensemble_params():
+    return {
+        "strategies": [
+            {"strategy": name, "params": {}, "weight": 0.1 * (i + 1)}
+            for i, name in enumerate(sorted(StrategyFactory.get_all()))
+        ],
+        "sl_multiplier": 2.0,
+        "tp_multiplier": 3.0,
+    }
+
+
+class TestFullSeriesWalkForward(unittest.TestCase):
+
+    def test_strategy_signals_are_causal(self):
+        df = make_ohlc(seed=1)
+        for name in StrategyFactory.get_all():
+            cls = StrategyFactory.get_class(name)
+            full = cls(df).signal_array()
+            for end in (60, 150, 271):
+                np.testing.assert_array_equal(cls(df.iloc[:end]).signal_array(), full[:end], err_msg=name)
+
+    def test_full_series_matches_prefix_computation(self):
+        df = make_ohlc(seed=2)
+        params = ensemble_params()
+        strategies = [StrategyFactory.get_class(s["strategy"]) for s in params["strategies"]]
+        strategy_params = [s["params"] for s in params["strategies"]]
+        weights = {f"{s['strategy']}_weight": s["weight"] for s in params["strategies"]}
+
+        with mock.patch.object(walk_forward, "get_price_data", return_value=df), \
+                mock.patch.object(walk_forward, "load_params", return_value=params), \
+                contextlib.redirect_stdout(io.StringIO()):
+            stats = walk_forward.run_walk_forward("TEST", 10000, 120, 40, full_series=True)
+
+        bars = walk_forward.BarArrays.from_frame(df)
+        windows = walk_forward.walk_forward_windows(len(df), 120, 40)
+        self.assertEqual(len(stats), len(windows))
+        for stat, (_, split, end) in zip(stats, windows):
+            # Causal reference: signals computed from the history up to the window's end only
+            prefix_signal = walk_forward.blended_signal(bars.window(0, end), strategies, strategy_params, weights)
+            eq = walk_forward.simulate_window(bars.window(split, end), prefix_signal[split:], 2.0, 3.0, 10000)
+            sharpe, max_dd = walk_forward.calculate_stats(eq)
+            self.assertEqual(stat["final_value"], eq.iloc[-1])
+            self.assertEqual(stat["sharpe_ratio"], sharpe)
+            self.assertEqual(stat["max_drawdown"], max_dd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
-import config, urllib.request, json
+import config
+from core import http_client
 
 HEADERS = {
     "APCA-API-KEY-ID":     config.API_KEY,
@@ -6,11 +7,9 @@ HEADERS = {
 }
 
 def cancel_all():
-    url = config.BASE_URL + "/v2/orders?status=open"
-    req = urllib.request.Request(url, headers=HEADERS, method="DELETE")
-    with urllib.request.urlopen(req) as r:
-        payload = r.read().decode()
-    print("Canceled orders response:", payload)
+    r = http_client.delete(config.BASE_URL + "/v2/orders", params={"status": "open"}, headers=HEADERS)
+    r.raise_for_status()
+    print("Canceled orders response:", r.text)
 
 if __name__ == "__main__":
     cancel_all()
@@ -1,37 +1,77 @@
 print("✅ Using Alpaca IEX fallback data.py")
 
+import os
 import pandas as pd
 from datetime import datetime, timedelta
-import requests
 from core import config  # ✅
+from core import http_client
+from core.bar_store import BarStore
 
-def get_price_data(symbol, days=30):
-    end = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-    start = (datetime.utcnow() - timedelta(days=days)).replace(microsecond=0).isoformat() + "Z"
+# IEX bars are kept apart from the yFinance store: volumes differ between feeds
+iex_store = BarStore(os.path.join("data", "bars_iex"))
 
+
+def _fetch_bars(symbol, start, end):
     url = f"https://data.alpaca.markets/v2/stocks/{symbol}/bars"
     headers = {
         "APCA-API-KEY-ID": config.API_KEY,
         "APCA-API-SECRET-KEY": config.API_SECRET
     }
     params = {
-        "start": start,
-        "end": end,
+        "start": start.replace(microsecond=0).isoformat() + "Z",
+        "end": end.replace(microsecond=0).isoformat() + "Z",
         "timeframe": "1Day",
         "feed": "iex",
         "limit": 1000
     }
 
-    response = requests.get(url, headers=headers, params=params)
+    response = http_client.get(url, headers=headers, params=params, endpoint="/v2/stocks/{symbol}/bars")
     if response.status_code != 200:
         raise Exception(f"Failed to fetch data: {response.status_code} {response.text}")
 
-    raw_bars = response.json().get("bars", [])
+    raw_bars = response.json().get("bars") or []
+    return _bars_to_frame(raw_bars)
+
+
+def _fetch_bars_batch(symbols, start, end):
+    """One grouped request (following page tokens) for several symbols' daily bars."""
+    url = "https://data.alpaca.markets/v2/stocks/bars"
+    headers = {
+        "APCA-API-KEY-ID": config.API_KEY,
+        "APCA-API-SECRET-KEY": config.API_SECRET
+    }
+    params = {
+        "symbols": ",".join(symbols),
+        "start": start.replace(microsecond=0).isoformat() + "Z",
+        "end": end.replace(microsecond=0).isoformat() + "Z",
+        "timeframe": "1Day",
+        "feed": "iex",
+        "limit": 10000
+    }
+
+    raw = {}
+    while True:
+        response = http_client.get(url, headers=headers, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch data: {response.status_code} {response.text}")
+        payload = response.json()
+        for symbol, bars in (payload.get("bars") or {}).items():
+            raw.setdefault(symbol, []).extend(bars)
+        page_token = payload.get("next_page_token")
+        if not page_token:
+            break
+        params["page_token"] = page_token
+
+    return {symbol: _bars_to_frame(bars) for symbol, bars in raw.items()}
+
+
+def _bars_to_frame(raw_bars):
     if not raw_bars:
-        raise ValueError(f"No bars returned for {symbol}")
+        return pd.DataFrame()
 
     df = pd.DataFrame(raw_bars)
-    df["t"] = pd.to_datetime(df["t"])
+    # Daily bars are stamped at midnight ET; key them by session date like yFinance does
+    df["t"] = pd.to_datetime(df["t"], utc=True).dt.tz_convert("US/Eastern").dt.normalize().dt.tz_localize(None)
     df.set_index("t", inplace=True)
     df.index.name = "datetime"
 
@@ -46,3 +86,64 @@ def get_price_data(symbol, days=30):
     return df
 
 
+def _fetch_start(symbol, store, window_start):
+    """Where the next request for `symbol` should begin, based on its stored watermark."""
+    watermark = store.last_timestamp(symbol)
+    first = store.first_timestamp(symbol)
+    if watermark is None or first > window_start + timedelta(days=7):
+        return window_start
+    # Re-request the watermark bar too: it may have been a partial session when stored
+    return watermark.to_pydatetime()
+
+
+def get_price_data(symbol, days=30, store=None):
+    """
+    Return the last `days` of daily IEX bars for a symbol.
+
+    Bars are cached on disk and in memory; only bars after the last stored
+    timestamp (the watermark) are requested from Alpaca.
+    """
+    store = store or iex_store
+    now = datetime.utcnow()
+    window_start = now - timedelta(days=days)
+
+    fetch_start = _fetch_start(symbol, store, window_start)
+    if fetch_start < now:
+        new_bars = _fetch_bars(symbol, fetch_start, now)
+        if not new_bars.empty:
+            store.write(symbol, new_bars)
+
+    df = store.read(symbol, start=window_start.strftime("%Y-%m-%d"))
+    if df.empty:
+        raise ValueError(f"No bars returned for {symbol}")
+    df.index.name = "datetime"
+    return df
+
+
+def get_price_data_batch(symbols, days=30, store=None):
+    """
+    Batched get_price_data: symbols sharing a fetch start are requested
+    together through Alpaca's multi-symbol bars endpoint.
+    Returns {symbol: DataFrame}; symbols without bars map to an empty frame.
+    """
+    store = store or iex_store
+    now = datetime.utcnow()
+    window_start = now - timedelta(days=days)
+
+    groups = {}
+    for symbol in symbols:
+        fetch_start = _fetch_start(symbol, store, window_start)
+        if fetch_start < now:
+            groups.setdefault(fetch_start, []).append(symbol)
+
+    for fetch_start, group in groups.items():
+        for symbol, new_bars in _fetch_bars_batch(group, fetch_start, now).items():
+            if not new_bars.empty:
+                store.write(symbol, new_bars)
+
+    results = {}
+    for symbol in symbols:
+        df = store.read(symbol, start=window_start.strftime("%Y-%m-%d"))
+        df.index.name = "datetime"
+        results[symbol] = df
+    return results
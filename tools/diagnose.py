@@ -1,4 +1,5 @@
-import config, urllib.request, urllib.parse, json
+import config
+from core import http_client
 
 HEADERS = {
     "APCA-API-KEY-ID":     config.API_KEY,
@@ -6,12 +7,9 @@ HEADERS = {
 }
 
 def http_get(path, params=None):
-    url = config.BASE_URL + path
-    if params:
-        url += '?' + urllib.parse.urlencode(params)
-    req = urllib.request.Request(url, headers=HEADERS)
-    with urllib.request.urlopen(req) as r:
-        return json.load(r)
+    r = http_client.get(config.BASE_URL + path, params=params, headers=HEADERS)
+    r.raise_for_status()
+    return r.json()
 
 # 1) Account overview
 acct = http_get("/v2/account")
@@ -1,20 +1,19 @@
 import os
 import sys
-import time
 import json
 import pytz
 import logging
-import schedule
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import core.config as config
-from core.data_loader import get_price_data
+from core.data_loader import get_price_data_batch
 from core.broker import AlpacaBroker
 from core.utils import is_market_open
-from core.trade_cycle import run_trade_cycle
+from core.bar_scheduler import BarCloseScheduler, daily_end_date
+from core.trade_cycle import run_streaming_cycle
 from monitoring.prometheus_metrics import start_prometheus_server
 from monitoring.telegram_utils import send_telegram_alert
-from indicators.strategy_base import StrategyFactory
 import indicators.registry
 
 # === Logging Setup ===
@@ -38,6 +37,8 @@ TIMEZONE = pytz.timezone("US/Eastern")
 PARAMS_FILE = "ensemble_tuned_params.json"
 cached_params_timestamp = None
 ensemble_params = {}
+# symbol -> StreamingEnsemble; bootstrapped once, then updated with each newly closed bar
+strategy_streams = {}
 
 # === Load Tuned Parameters ===
 def load_ensemble_params():
@@ -58,67 +59,68 @@ def trading_loop():
     if not is_market_open():
         logger.info("📉 Market is closed. Skipping trade cycle.")
         return
+    run_cycle(config.get_symbols())
 
+# === Bar-Close Trigger ===
+def on_bars_closed(symbols, closed_at):
+    # Fired by BarCloseScheduler only at session bar boundaries, including the 16:00 close
+    logger.info(f"🕯️ Bar closed at {closed_at:%H:%M} ET for {', '.join(symbols)}")
+    # Daily bars: at 16:00 the end date must reach past today, or the bar that just closed is never fetched
+    run_cycle(symbols, end_date=daily_end_date(closed_at))
+
+def run_cycle(symbols, end_date=None):
     load_ensemble_params()
 
-    symbols = config.get_symbols()
-
-    for symbol in symbols:
-        try:
-            logger.info(f"\n=== Executing trade cycle for {symbol} ===")
-            cfg = ensemble_params.get(symbol, {})
-            if not cfg:
-                logger.warning(f"⚠️ No tuned parameters found for {symbol}. Skipping.")
-                continue
-
-            strategy_list = cfg.get("strategies", [])
-            strategy_classes = []
-            strategy_params = []
-            strategy_weights = {}
-
-            df = get_price_data(symbol)
-            if df is None or df.empty:
-                logger.warning(f"No data returned for {symbol}. Skipping.")
-                continue
-
-            for strat_cfg in strategy_list:
-                name = strat_cfg["strategy"]
-                params = strat_cfg["params"]
-                weight = strat_cfg.get("weight", 1.0)
-
-                strategy = StrategyFactory.create(name, df.copy(), **params)
-                strategy_classes.append(strategy.__class__)
-                strategy_params.append(params)
-                strategy_weights[f"{name}_weight"] = weight
-
-            meta_params = {
-                "sl_multiplier": cfg.get("sl_multiplier", 2.0),
-                "tp_multiplier": cfg.get("tp_multiplier", 3.0),
-            }
-
-            allocation_pct = cfg.get("meta", {}).get("allocation_pct", 0.25)
-
-            run_trade_cycle(
-                symbol,
-                broker,
-                cfg,
-                allocation_pct,
-                strategy_classes,
-                strategy_params,
-                strategy_weights,
-                meta_params
-            )
-
-        except Exception as e:
-            logger.error(f"❌ Error running trade cycle for {symbol}: {e}")
-            send_telegram_alert(f"❌ Error with {symbol}: {e}")
+    # Account, positions, open orders and latest prices once for the whole cycle
+    broker.refresh_snapshot(symbols)
+
+    # One grouped fetch for the whole universe; each symbol gets its slice below
+    try:
+        price_data = get_price_data_batch(symbols, end_date=end_date)
+    except Exception as e:
+        logger.error(f"❌ Batched price fetch failed: {e}")
+        price_data = {}
+
+    max_workers = max(1, min(config.MAX_CONCURRENT_SYMBOLS, len(symbols)))
+    if max_workers == 1:
+        for symbol in symbols:
+            run_symbol_cycle(symbol, price_data.get(symbol))
+        return
+
+    # Symbols are network-bound, so overlap them on a bounded pool;
+    # run_symbol_cycle handles its own errors, keeping failures per-symbol
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cycle") as pool:
+        futures = [pool.submit(run_symbol_cycle, symbol, price_data.get(symbol)) for symbol in symbols]
+        for future in futures:
+            future.result()
+
+# === Per-Symbol Trade Cycle ===
+def run_symbol_cycle(symbol, df):
+    try:
+        logger.info(f"\n=== Executing trade cycle for {symbol} ===")
+        cfg = ensemble_params.get(symbol, {})
+        if not cfg:
+            logger.warning(f"⚠️ No tuned parameters found for {symbol}. Skipping.")
+            return
+
+        if df is None or df.empty:
+            logger.warning(f"No data returned for {symbol}. Skipping.")
+            return
+
+        # Strategies are bootstrapped once per symbol; later cycles only feed the new bars through update()
+        decision = run_streaming_cycle(symbol, df, cfg, broker, strategy_streams)
+        stream = strategy_streams[symbol]
+        logger.info(f"📊 {symbol} ensemble signal {stream.signal:+d} at {df.index[-1]:%Y-%m-%d %H:%M} → {decision}")
+
+    except Exception as e:
+        logger.error(f"❌ Error running trade cycle for {symbol}: {e}")
+        send_telegram_alert(f"❌ Error with {symbol}: {e}", symbol=symbol)
 
 # === Entry Point ===
 if __name__ == "__main__":
     logger.info("🚀 Starting multi-symbol trading bot...")
     start_prometheus_server()
-    schedule.every(1).minutes.do(trading_loop)
 
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    # One cycle per completed bar of each symbol's interval_minutes, not per wall-clock minute
+    scheduler = BarCloseScheduler(config.get_symbols, config.get_interval_minutes, on_bars_closed)
+    scheduler.run_forever()
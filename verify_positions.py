@@ -1,16 +1,15 @@
 # verify_positions.py
-import config, urllib.request, urllib.parse, json
+import config
+from core import http_client
 
 HEADERS = {
     "APCA-API-KEY-ID":     config.API_KEY,
     "APCA-API-SECRET-KEY": config.API_SECRET,
 }
 
-req = urllib.request.Request(
-    config.BASE_URL + "/v2/positions",
-    headers=HEADERS
-)
-data = json.load(urllib.request.urlopen(req))
+response = http_client.get(config.BASE_URL + "/v2/positions", headers=HEADERS)
+response.raise_for_status()
+data = response.json()
 
 # Print each position symbol and qty
 for p in data: